@@ -0,0 +1,203 @@
+# benchmarks/bench_api.py
+"""
+Measure the throughput and latency of the CRUD, list and search endpoints, driving the ASGI app in-process through
+httpx's ASGITransport with concurrent clients, over tables seeded to each of the given sizes.
+
+Runs against the database configured for the tasknote service, seeds the tasks and notes server-side and removes
+them again after each size. The app logs as the service does, to stderr:
+
+    uv run python -m benchmarks.bench_api --rows 1000 100000 1000000 --output api.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+
+from httpx import ASGITransport, AsyncClient, Response, codes
+from sqlalchemy import delete, select, text
+
+from benchmarks.results import Metric, write_results
+from src.tasknote.application.jobs import reconcile_analytics
+from src.tasknote.container import container
+from src.tasknote.logger import configure_logging
+from src.tasknote.main import app
+from src.tasknote.persistence.entities import NoteEntity, TaskEntity
+
+TITLE_PREFIX = 'bench-api'
+
+_SEED_TASKS = text(
+    """
+    INSERT INTO tasks (title, description, priority, created_at, due_date, status)
+    SELECT :prefix || ' ' || i, 'benchmark row ' || i, i % 5, now() - (i % 365) * interval '1 day',
+           now() + (i % 30) * interval '1 day', (ARRAY['NEW', 'PENDING', 'COMPLETED'])[1 + i % 3]::taskstatus
+      FROM generate_series(1, :rows) AS i
+    """
+)
+# 'kayak' is in one note in 100
+_SEED_NOTES = text(
+    """
+    INSERT INTO notes (title, content, created_at)
+    SELECT :prefix || ' ' || i,
+           'meeting agenda budget review ' || i || CASE WHEN i % 100 = 0 THEN ' kayak' ELSE '' END,
+           now()
+      FROM generate_series(1, :rows) AS i
+    """
+)
+
+# a request to make, from the number of the request within its scenario; None when there was none to make
+type Call = Callable[[AsyncClient, int], Awaitable[Response | None]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    call: Call
+    # statuses that count as success
+    ok: tuple[int, ...] = (200,)
+
+
+def _scenarios(task_ids: list[int], created: list[int]) -> list[Scenario]:
+    # create runs first and hands its ids to delete, which runs last, so the writes leave the tables as they were
+    async def create_task(client: AsyncClient, i: int) -> Response:
+        response = await client.post('/tasknote/tasks', json={'title': f'{TITLE_PREFIX} new {i}', 'priority': i % 5})
+        if response.status_code == codes.OK:
+            created.append(response.json()['id'])
+        return response
+
+    async def delete_task(client: AsyncClient, _: int) -> Response | None:
+        # a create that failed left no task behind for this delete, which counts as an error
+        return await client.delete(f'/tasknote/tasks/{created.pop()}') if created else None
+
+    return [
+        Scenario('create_task', create_task),
+        Scenario('get_task', lambda client, _: client.get(f'/tasknote/tasks/{random.choice(task_ids)}')),
+        Scenario('list_tasks', lambda client, _: client.get('/tasknote/tasks?limit=100')),
+        Scenario('list_tasks_by_status', lambda client, _: client.get('/tasknote/tasks?limit=100&status=PENDING')),
+        Scenario('search_notes', lambda client, _: client.get('/tasknote/notes/search?text=kayak&limit=20')),
+        Scenario(
+            'patch_task',
+            lambda client, i: client.patch(f'/tasknote/tasks/{random.choice(task_ids)}', json={'priority': i % 5}),
+        ),
+        Scenario('delete_task', delete_task, ok=(204,)),
+    ]
+
+
+def _warm_up(task_ids: list[int]) -> Scenario:
+    return Scenario('warm_up', lambda client, _: client.get(f'/tasknote/tasks/{random.choice(task_ids)}'))
+
+
+async def _drive(client: AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    numbers = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        # the iterator is shared, so the workers take the request numbers between them
+        for i in numbers:
+            start = perf_counter()
+            response = await scenario.call(client, i)
+            if response is None:
+                # no request was made, so there is no latency to record
+                errors += 1
+                continue
+            latencies.append((perf_counter() - start) * 1000)
+            if response.status_code not in scenario.ok:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _seed(rows: int) -> list[int]:
+    async with container.session_factory() as session:
+        await session.execute(_SEED_TASKS, {'prefix': TITLE_PREFIX, 'rows': rows})
+        await session.execute(_SEED_NOTES, {'prefix': TITLE_PREFIX, 'rows': rows})
+        await session.commit()
+        task_ids = list(
+            await session.scalars(select(TaskEntity.id).where(TaskEntity.title.startswith(f'{TITLE_PREFIX} ')))
+        )
+    # the inserts above bypass the writers' counting, so recount the analytics rollups, as seeding does
+    await reconcile_analytics()
+    async with container.engine.connect() as conn:
+        await conn.execute(text('ANALYZE tasks'))
+        await conn.execute(text('ANALYZE notes'))
+        await conn.commit()
+    return task_ids
+
+
+async def _clean() -> None:
+    async with container.session_factory() as session:
+        await session.execute(delete(TaskEntity).where(TaskEntity.title.startswith(f'{TITLE_PREFIX} ')))
+        await session.execute(delete(NoteEntity).where(NoteEntity.title.startswith(f'{TITLE_PREFIX} ')))
+        await session.commit()
+    await reconcile_analytics()
+
+
+async def run(sizes: list[int], requests: int, concurrency: int, seed: int) -> list[Metric]:
+    # what the lifespan would do, minus the background jobs, which would compete with the requests
+    configure_logging()
+    random.seed(seed)
+    metrics = []
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url='http://bench') as client:
+            for rows in sizes:
+                try:
+                    task_ids = await _seed(rows)
+                    # opens the pool's connections and fills the caches and statement caches before anything counts
+                    await _drive(client, _warm_up(task_ids), concurrency * 10, concurrency)
+                    created: list[int] = []
+                    for scenario in _scenarios(task_ids, created):
+                        start = perf_counter()
+                        latencies, errors = await _drive(client, scenario, requests, concurrency)
+                        elapsed = perf_counter() - start
+                        latencies.sort()
+                        prefix = f'{scenario.name}@{rows}'
+                        metrics += [
+                            Metric(f'{prefix}.rps', round(requests / elapsed, 1), 'req/s', higher_is_better=True),
+                            Metric(f'{prefix}.p50_ms', round(_percentile(latencies, 0.50), 3), 'ms'),
+                            Metric(f'{prefix}.p95_ms', round(_percentile(latencies, 0.95), 3), 'ms'),
+                            Metric(f'{prefix}.p99_ms', round(_percentile(latencies, 0.99), 3), 'ms'),
+                            Metric(f'{prefix}.errors', errors, 'count'),
+                        ]
+                finally:
+                    await _clean()
+    finally:
+        await container.dispose()
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--rows', type=int, nargs='+', default=[1000, 100_000, 1_000_000], help='table sizes to measure at'
+    )
+    parser.add_argument('--requests', type=int, default=2000, help='requests per scenario and size')
+    parser.add_argument('--concurrency', type=int, default=16, help='clients sending requests at once')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random ids the reads and updates pick')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    metrics = asyncio.run(run(args.rows, args.requests, args.concurrency, args.seed))
+    if args.output:
+        params = {'rows': args.rows, 'requests': args.requests, 'concurrency': args.concurrency, 'seed': args.seed}
+        write_results(args.output, 'api', params, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_create.py
+"""
+Compare the single-task create path before and after replacing the post-commit refresh with INSERT ... RETURNING.
+
+Runs against the database configured for the tasknote service and removes the rows it creates:
+
+    uv run python -m benchmarks.bench_create --rows 500 --output create.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.results import Metric, write_results
+from src.common.timeutils import now_ist
+from src.tasknote.application.jobs import reconcile_analytics
+from src.tasknote.container import container
+from src.tasknote.domain.models import Task
+from src.tasknote.persistence.entities import TaskEntity
+from src.tasknote.persistence.mappers import tasks
+from src.tasknote.persistence.tasks_repository import TasksRepository
+
+AddTask = Callable[[AsyncSession, Task], Awaitable[Task]]
+
+
+async def _refresh_add_task(session: AsyncSession, task: Task) -> Task:
+    # the create path as it was: flush + commit, then a SELECT to read the row back
+    task_orm = TaskEntity(**tasks.to_values(task))
+    session.add(task_orm)
+    await session.commit()
+    await session.refresh(task_orm)
+    return tasks.to_domain(task_orm)
+
+
+async def _returning_add_task(session: AsyncSession, task: Task) -> Task:
+    return await TasksRepository(session).add_task(task)
+
+
+def _new_task(i: int) -> Task:
+    return Task(
+        title=f'bench task {i}',
+        created_at=now_ist(),
+        description='benchmark row',
+        priority=i % 5,
+        due_date=None,
+        completed_at=None,
+    )
+
+
+async def _measure(name: str, add_task: AddTask, rows: int, created_ids: list[int]) -> list[Metric]:
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(container.engine.sync_engine, 'before_cursor_execute', count)
+    latencies = []
+    try:
+        for i in range(rows):
+            async with container.session_factory() as session:
+                start = perf_counter()
+                created = await add_task(session, _new_task(i))
+                latencies.append((perf_counter() - start) * 1000)
+            created_ids.append(created.id)
+    finally:
+        event.remove(container.engine.sync_engine, 'before_cursor_execute', count)
+
+    latencies.sort()
+    return [
+        Metric(f'{name}.statements_per_create', statements / rows, 'count'),
+        Metric(f'{name}.mean_ms', round(statistics.fmean(latencies), 3), 'ms'),
+        Metric(f'{name}.p50_ms', round(latencies[len(latencies) // 2], 3), 'ms'),
+        Metric(f'{name}.p95_ms', round(latencies[int(len(latencies) * 0.95)], 3), 'ms'),
+    ]
+
+
+async def run(rows: int) -> list[Metric]:
+    created_ids: list[int] = []
+    try:
+        # warm up the pool and the prepared-statement caches for both paths
+        await _measure('warmup', _refresh_add_task, 10, created_ids)
+        await _measure('warmup', _returning_add_task, 10, created_ids)
+        return [
+            *await _measure('refresh', _refresh_add_task, rows, created_ids),
+            *await _measure('returning', _returning_add_task, rows, created_ids),
+        ]
+    finally:
+        async with container.session_factory() as session:
+            await session.execute(delete(TaskEntity).where(TaskEntity.id.in_(created_ids)))
+            await session.commit()
+        # neither the refresh path nor the cleanup counts into the analytics rollups; recount them
+        await reconcile_analytics()
+        await container.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500, help='tasks to create per path')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    metrics = asyncio.run(run(args.rows))
+    if args.output:
+        write_results(args.output, 'create', {'rows': args.rows}, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
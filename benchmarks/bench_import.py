@@ -0,0 +1,82 @@
+# benchmarks/bench_import.py
+"""
+Measure the cost of importing the app with `python -X importtime`, and check that the import builds neither the
+settings nor the database engine.
+
+Runs each import in a fresh interpreter, no database needed:
+
+    uv run python -m benchmarks.bench_import --repeat 5 --output import.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.results import Metric, write_results
+
+MODULE = 'src.tasknote.main'
+
+# run after the import, in the same interpreter: what did importing leave built?
+_PROBE = f"""
+import {MODULE}
+from src.tasknote.container import container
+from src.tasknote.settings import get_settings
+print(get_settings.cache_info().currsize > 0, 'engine' in vars(container))
+"""
+
+
+def _import_once() -> tuple[int, Counter[str], list[str]]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE], capture_output=True, text=True, check=True
+    )
+    # lines look like `import time:       123 |       4567 |   package.module`, indented by nesting depth
+    cumulative_us = 0
+    self_us: Counter[str] = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        name = name.strip()
+        self_us[name.split('.')[0]] += int(own)
+        if name == MODULE:
+            cumulative_us = int(cumulative)
+    return cumulative_us, self_us, result.stdout.split()
+
+
+def run(repeat: int, top: int) -> list[Metric]:
+    timings = []
+    packages: Counter[str] = Counter()
+    for _ in range(repeat):
+        cumulative_us, self_us, built = _import_once()
+        timings.append(cumulative_us / 1000)
+        packages.update(self_us)
+    settings_loaded, engine_built = (flag == 'True' for flag in built)
+    return [
+        Metric('min_ms', round(min(timings), 1), 'ms'),
+        Metric('median_ms', round(statistics.median(timings), 1), 'ms'),
+        # 1 when the import built it, which it should not
+        Metric('settings_loaded_at_import', int(settings_loaded), 'bool'),
+        Metric('engine_built_at_import', int(engine_built), 'bool'),
+    ] + [Metric(f'packages.{name}_ms', round(us / repeat / 1000, 1), 'ms') for name, us in packages.most_common(top)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters to time the import in')
+    parser.add_argument('--top', type=int, default=10, help='top-level packages to break the time down by')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    metrics = run(args.repeat, args.top)
+    if args.output:
+        write_results(args.output, 'import', {'module': MODULE, 'repeat': args.repeat, 'top': args.top}, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_list_json.py
+"""
+Compare per-row CPU of rendering a task list through FastAPI's response_model against the rows serializer, with
+and without validation (the fast_list_responses setting).
+
+Runs in-process on generated tasks, no database needed:
+
+    uv run python -m benchmarks.bench_list_json --rows 1000 --output list_json.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from time import process_time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from benchmarks.results import Metric, write_results
+from src.common.timeutils import now_ist
+from src.tasknote.api.responses import RowsJSONResponse, RowsSerializer
+from src.tasknote.api.schemas import TaskRead
+from src.tasknote.domain.models import Task, TaskStatus
+
+
+async def _list_tasks() -> list[TaskRead]:
+    return []
+
+
+def _new_task(i: int) -> Task:
+    created_at = now_ist()
+    return Task(
+        id=i,
+        title=f'bench task {i}',
+        created_at=created_at,
+        description='benchmark row',
+        priority=i % 5,
+        due_date=created_at + timedelta(days=7),
+        completed_at=None,
+        status=TaskStatus.PENDING,
+    )
+
+
+def _response_model_path(tasks: list[Task]) -> Callable[[], bytes]:
+    # what GET /tasks did before: validate every item into TaskRead, dump to dicts, then json.dumps them
+    field = APIRoute('/tasks', _list_tasks, response_model=list[TaskRead]).response_field
+    loop = asyncio.new_event_loop()
+
+    def render() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=tasks))
+        return JSONResponse(content).body
+
+    return render
+
+
+def _rows_path(tasks: list[Task], validate: bool) -> Callable[[], bytes]:
+    serializer = RowsSerializer(TaskRead)
+    return lambda: RowsJSONResponse(tasks, serializer, validate=validate).body
+
+
+def _measure(name: str, render: Callable[[], bytes], rows: int, repeat: int) -> list[Metric]:
+    render()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = process_time()
+        render()
+        timings.append(process_time() - start)
+    best = min(timings)
+    return [
+        Metric(f'{name}.best_ms', round(best * 1000, 3), 'ms'),
+        Metric(f'{name}.cpu_us_per_row', round(best / rows * 1_000_000, 3), 'us'),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000, help='tasks per rendered list')
+    parser.add_argument('--repeat', type=int, default=20, help='renders per path; the fastest one is reported')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    tasks = [_new_task(i) for i in range(args.rows)]
+    before, validated, fast = _response_model_path(tasks), _rows_path(tasks, True), _rows_path(tasks, False)
+    if not json.loads(before()) == json.loads(validated()) == json.loads(fast()):
+        raise SystemExit('rows serializer output differs from the response_model output')
+
+    metrics = [
+        *_measure('response_model', before, args.rows, args.repeat),
+        *_measure('rows_serializer', validated, args.rows, args.repeat),
+        *_measure('rows_serializer_fast', fast, args.rows, args.repeat),
+    ]
+    if args.output:
+        write_results(args.output, 'list_json', {'rows': args.rows, 'repeat': args.repeat}, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
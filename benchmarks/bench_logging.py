@@ -0,0 +1,83 @@
+# benchmarks/bench_logging.py
+"""
+Measure what a log call costs the calling thread (the event loop, in the service) in the synchronous and
+queue-based logging modes and with each JSON renderer, writing to a sink that takes a while per line.
+
+Runs in-process, no database needed:
+
+    uv run python -m benchmarks.bench_logging --records 20000 --write-delay-us 50 --output logging.json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from contextlib import redirect_stderr
+from importlib.util import find_spec
+from pathlib import Path
+from time import perf_counter
+
+import structlog
+
+from benchmarks.results import Metric, write_results
+from src.common.logger import LogRenderer, logging_stats, setup_logging, shutdown_logging
+
+
+class _SlowSink:
+    # stands in for a congested pipe or disk: every write blocks for a while
+    def __init__(self, delay_seconds: float):
+        self.delay_seconds = delay_seconds
+
+    def write(self, text: str) -> int:
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _measure(name: str, records: int, delay_seconds: float, queue_size: int, renderer: LogRenderer) -> list[Metric]:
+    with redirect_stderr(_SlowSink(delay_seconds)):
+        setup_logging(service_name='bench', queue_size=queue_size, renderer=renderer)
+        log = structlog.get_logger()
+        start = perf_counter()
+        for i in range(records):
+            log.info('Fetching tasks page', limit=100, after=i, sort='id', filters={'status': 'NEW', 'tag': None})
+        elapsed = perf_counter() - start
+        stats = logging_stats()
+        shutdown_logging()
+    prefix = f'{name}.{renderer}'
+    return [
+        Metric(f'{prefix}.caller_us_per_record', round(elapsed / records * 1e6, 2), 'us'),
+        Metric(f'{prefix}.dropped', stats.dropped if stats else 0, 'count'),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=20_000, help='log calls per configuration')
+    parser.add_argument('--write-delay-us', type=float, default=50, help='time the sink takes per line')
+    parser.add_argument('--queue-size', type=int, default=10_000, help='buffer of the queue-based mode')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    renderers = [LogRenderer.JSON] + ([LogRenderer.ORJSON] if find_spec('orjson') else [])
+    delay = args.write_delay_us / 1e6
+    metrics = [
+        metric
+        for name, queue_size in (('sync', 0), ('queue', args.queue_size))
+        for renderer in renderers
+        for metric in _measure(name, args.records, delay, queue_size, renderer)
+    ]
+    # the renderer alone, with a sink that costs nothing
+    metrics += [metric for renderer in renderers for metric in _measure('free_sink', args.records, 0, 0, renderer)]
+    if args.output:
+        params = {'records': args.records, 'write_delay_us': args.write_delay_us, 'queue_size': args.queue_size}
+        write_results(args.output, 'logging', params, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
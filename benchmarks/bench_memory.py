@@ -0,0 +1,108 @@
+# benchmarks/bench_memory.py
+"""
+Measure the memory per Task built by mappers.tasks.to_domain, against the dict-backed class it replaced.
+
+Runs in-process, no database needed:
+
+    uv run python -m benchmarks.bench_memory --objects 1000000 --output memory.json
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from benchmarks.results import Metric, write_results
+from src.common.timeutils import now_ist
+from src.tasknote.domain.models import TaskStatus
+from src.tasknote.persistence.mappers import tasks
+
+
+class _DictTask:
+    # the pre-slots Task: one __dict__ per instance
+    def __init__(  # noqa: PLR0913
+        self,
+        title,
+        created_at,
+        description,
+        priority,
+        due_date,
+        completed_at,
+        status=TaskStatus.NEW,
+        id=None,
+    ):
+        self.id = id
+        self.title = title
+        self.created_at = created_at
+        self.status = status
+        self.description = description
+        self.priority = priority
+        self.due_date = due_date
+        self.completed_at = completed_at
+
+
+def _dict_to_domain(row: Any) -> _DictTask:
+    return _DictTask(
+        id=row.id,
+        title=row.title,
+        created_at=row.created_at,
+        description=row.description,
+        priority=row.priority,
+        due_date=row.due_date,
+        completed_at=row.completed_at,
+        status=row.status,
+    )
+
+
+def _measure(name: str, to_domain: Callable[[Any], Any], row: Any, objects: int) -> list[Metric]:
+    # every object shares the row's field values, so the growth is the objects themselves
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = [to_domain(row) for _ in range(objects)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list holding them is not part of the per-object cost
+    total = after - before - sys.getsizeof(items)
+    return [
+        Metric(f'{name}.total_mb', round(total / 1024 / 1024, 1), 'MB'),
+        Metric(f'{name}.bytes_per_object', round(total / objects, 1), 'B'),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1_000_000, help='tasks to build per model')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    created_at = now_ist()
+    row = SimpleNamespace(
+        id=1,
+        title='bench task',
+        created_at=created_at,
+        description='benchmark row',
+        priority=3,
+        due_date=created_at + timedelta(days=7),
+        completed_at=None,
+        status=TaskStatus.PENDING,
+        version=1,
+    )
+    metrics = [
+        *_measure('dict', _dict_to_domain, row, args.objects),
+        *_measure('slots', tasks.to_domain, row, args.objects),
+    ]
+    if args.output:
+        write_results(args.output, 'memory', {'objects': args.objects}, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
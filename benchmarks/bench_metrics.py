@@ -0,0 +1,103 @@
+# benchmarks/bench_metrics.py
+"""
+Measure the per-request overhead of the metrics middleware, calling a trivial route of a FastAPI app with and
+without it straight through ASGI, and the time to render the metrics for a scrape.
+
+Runs in-process, no database needed:
+
+    uv run python -m benchmarks.bench_metrics --requests 20000 --output metrics.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+
+from pathlib import Path
+from time import perf_counter
+
+from fastapi import FastAPI
+
+from benchmarks.results import Metric, write_results
+from src.tasknote.api.middleware import MetricsMiddleware
+from src.tasknote.metrics import registry
+
+
+def _app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/tasks/{task_id}')
+    async def get_task(task_id: int):
+        return {'id': task_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def _us_per_request(app: FastAPI, requests: int) -> float:
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        pass
+
+    start = perf_counter()
+    for i in range(requests):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': f'/tasks/{i}',
+            'raw_path': f'/tasks/{i}'.encode(),
+            'root_path': '',
+            'query_string': b'',
+            'headers': [],
+            'server': ('bench', 80),
+            'client': ('127.0.0.1', 1234),
+        }
+        await app(scope, receive, send)
+    return (perf_counter() - start) / requests * 1e6
+
+
+async def run(requests: int, rounds: int) -> list[Metric]:
+    plain, measured = _app(with_metrics=False), _app(with_metrics=True)
+    # warm up both apps (middleware stack, route compilation)
+    await _us_per_request(plain, 1000)
+    await _us_per_request(measured, 1000)
+    without, with_ = [], []
+    for _ in range(rounds):
+        without.append(await _us_per_request(plain, requests))
+        with_.append(await _us_per_request(measured, requests))
+
+    start = perf_counter()
+    body = registry.render()
+    render_ms = (perf_counter() - start) * 1000
+    baseline, instrumented = statistics.median(without), statistics.median(with_)
+    return [
+        Metric('without_metrics_us', round(baseline, 2), 'us'),
+        Metric('with_metrics_us', round(instrumented, 2), 'us'),
+        Metric('overhead_us', round(instrumented - baseline, 2), 'us'),
+        Metric('render_ms', round(render_ms, 3), 'ms'),
+        Metric('render_bytes', len(body), 'B'),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20_000, help='requests per round')
+    parser.add_argument('--rounds', type=int, default=5, help='alternating rounds with and without the middleware')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    metrics = asyncio.run(run(args.requests, args.rounds))
+    if args.output:
+        write_results(args.output, 'metrics', {'requests': args.requests, 'rounds': args.rounds}, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
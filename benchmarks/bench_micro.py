@@ -0,0 +1,104 @@
+# benchmarks/bench_micro.py
+"""
+Time the per-item CPU paths every request goes through: building domain models, mapping them from the Core rows
+reads and RETURNING hand back and to the values inserts bind, and validating and serializing them as TaskRead/NoteRead.
+
+Runs in-process on generated data, no database needed:
+
+    uv run python -m benchmarks.bench_micro --output micro.json
+"""
+
+import argparse
+import json
+import sys
+import timeit
+
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy.engine.result import result_tuple
+
+from benchmarks.results import Metric, write_results
+from src.common.timeutils import now_ist
+from src.tasknote.api.responses import RowsJSONResponse, RowsSerializer
+from src.tasknote.api.schemas import NoteRead, TaskRead
+from src.tasknote.domain.models import Note, Task, TaskStatus
+from src.tasknote.persistence.entities import TaskEntity
+from src.tasknote.persistence.mappers import notes, tasks
+
+LIST_ROWS = 100
+
+
+def _task_fields(i: int) -> dict:
+    created_at = now_ist()
+    return {
+        'id': i,
+        'title': f'bench task {i}',
+        'created_at': created_at,
+        'description': 'benchmark row',
+        'priority': i % 5,
+        'due_date': created_at + timedelta(days=7),
+        'completed_at': None,
+        'status': TaskStatus.PENDING,
+        'tags': ['work', 'urgent'],
+        'version': 3,
+    }
+
+
+def _cases() -> dict[str, Callable[[], object]]:
+    fields = _task_fields(1)
+    task = Task(**fields)
+    task_columns = [column.key for column in TaskEntity.__table__.c]
+    task_row = result_tuple(task_columns)([fields[column] for column in task_columns])
+    note = Note(id=1, title='bench note', content='benchmark row ' * 20, created_at=now_ist(), version=1)
+    note_columns = [column.key for column in notes.columns]
+    note_row = result_tuple(note_columns)([getattr(note, column) for column in note_columns])
+    task_read = TaskRead.model_validate(task, from_attributes=True)
+    task_list = [Task(**_task_fields(i)) for i in range(LIST_ROWS)]
+    task_list_rows = RowsSerializer(TaskRead)
+
+    return {
+        'task_construct': lambda: Task(**fields),
+        'task_to_domain': lambda: tasks.to_domain(task_row, ['work', 'urgent']),
+        'task_to_values': lambda: tasks.to_values(task),
+        'note_to_domain': lambda: notes.to_domain(note_row),
+        'task_read_validate': lambda: TaskRead.model_validate(task, from_attributes=True),
+        'task_read_dump_json': task_read.model_dump_json,
+        'task_read_roundtrip': lambda: TaskRead.model_validate(task, from_attributes=True).model_dump_json(),
+        'note_read_roundtrip': lambda: NoteRead.model_validate(note, from_attributes=True).model_dump_json(),
+        f'task_list_render_{LIST_ROWS}': lambda: RowsJSONResponse(task_list, task_list_rows).body,
+        f'task_list_render_fast_{LIST_ROWS}': lambda: RowsJSONResponse(task_list, task_list_rows, validate=False).body,
+    }
+
+
+def _us_per_call(case: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(case)
+    # enough calls per timing to take ~0.2 s, then the fastest of `repeat` timings: the least disturbed one
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(repeat: int, only: list[str] | None = None) -> list[Metric]:
+    return [
+        Metric(name=name, value=round(_us_per_call(case, repeat), 3), unit='us')
+        for name, case in _cases().items()
+        if not only or name in only
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='timings per case; the fastest one is reported')
+    parser.add_argument('--case', action='append', dest='cases', help='run only this case; may be repeated')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    metrics = run(args.repeat, args.cases)
+    if args.output:
+        write_results(args.output, 'micro', {'repeat': args.repeat, 'cases': args.cases}, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_search.py
+"""
+Compare note search through the tsvector GIN index against an ILIKE scan over a large generated dataset.
+
+Runs against the database configured for the tasknote service, seeds the notes server-side and removes them again:
+
+    uv run python -m benchmarks.bench_search --rows 1000000 --output search.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import delete, or_, select, text
+
+from benchmarks.results import Metric, write_results
+from src.tasknote.container import container
+from src.tasknote.persistence.entities import NoteEntity
+from src.tasknote.persistence.mappers import notes
+from src.tasknote.persistence.note_repository import NotesRepository
+
+TITLE_PREFIX = 'bench-search'
+
+# every note gets 12 words of this vocabulary; 'zeppelin' is added to one note in 50,000
+_SEED = text(
+    """
+    INSERT INTO notes (title, content, created_at)
+    SELECT :prefix || ' ' || i,
+           (SELECT string_agg(v.words[1 + (i * 31 + k * 17) % array_length(v.words, 1)], ' ')
+              FROM generate_series(1, 12) AS k)
+           || CASE WHEN i % 50000 = 0 THEN ' zeppelin' ELSE '' END,
+           now()
+      FROM generate_series(1, :rows) AS i,
+           (SELECT string_to_array(
+               'meeting agenda budget review deadline project client invoice design sprint release '
+               'roadmap hiring onboarding feedback retro planning travel kayak garden recipe grocery '
+               'doctor insurance taxes birthday gift concert movie book podcast workout running '
+               'yoga dentist plumber laptop backup password router printer', ' ') AS words) AS v
+    """
+)
+
+Search = Callable[[str, int], Awaitable[list]]
+
+
+async def _tsvector_search(term: str, limit: int) -> list:
+    async with container.session_factory() as session:
+        page = await NotesRepository(session).search(term, limit=limit)
+        return page.items
+
+
+async def _ilike_search(term: str, limit: int) -> list:
+    # what a naive implementation would do: unanchored pattern match, newest ids first
+    pattern = f'%{term}%'
+    stmt = (
+        select(*notes.columns)
+        .where(or_(NoteEntity.title.ilike(pattern), NoteEntity.content.ilike(pattern)))
+        .order_by(NoteEntity.id.desc())
+        .limit(limit)
+    )
+    async with container.session_factory() as session:
+        result = await session.execute(stmt)
+        return [notes.to_domain(row) for row in result.all()]
+
+
+async def _measure(name: str, search: Search, term: str, limit: int, queries: int) -> list[Metric]:
+    await search(term, limit)  # warm up
+    latencies = []
+    found = 0
+    for _ in range(queries):
+        start = perf_counter()
+        found = len(await search(term, limit))
+        latencies.append((perf_counter() - start) * 1000)
+    latencies.sort()
+    prefix = f'{name}.{term}'
+    return [
+        Metric(f'{prefix}.results', found, 'count', higher_is_better=True),
+        Metric(f'{prefix}.mean_ms', round(statistics.fmean(latencies), 3), 'ms'),
+        Metric(f'{prefix}.p50_ms', round(latencies[len(latencies) // 2], 3), 'ms'),
+        Metric(f'{prefix}.p95_ms', round(latencies[int(len(latencies) * 0.95)], 3), 'ms'),
+    ]
+
+
+async def run(rows: int, limit: int, queries: int) -> list[Metric]:
+    try:
+        async with container.session_factory() as session:
+            await session.execute(_SEED, {'prefix': TITLE_PREFIX, 'rows': rows})
+            await session.commit()
+        async with container.engine.connect() as conn:
+            await conn.execute(text('ANALYZE notes'))
+            await conn.commit()
+
+        metrics = []
+        # a rare term (one note in 50,000) and a common one found in a large share of the notes
+        for term in ('zeppelin', 'kayak'):
+            metrics += await _measure('tsvector', _tsvector_search, term, limit, queries)
+            metrics += await _measure('ilike', _ilike_search, term, limit, queries)
+        return metrics
+    finally:
+        async with container.session_factory() as session:
+            await session.execute(delete(NoteEntity).where(NoteEntity.title.startswith(f'{TITLE_PREFIX} ')))
+            await session.commit()
+        await container.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='notes to seed')
+    parser.add_argument('--limit', type=int, default=20, help='page size of each search')
+    parser.add_argument('--queries', type=int, default=20, help='searches per path and term')
+    parser.add_argument('--output', type=Path, help='write the results here, for benchmarks.compare')
+    args = parser.parse_args()
+
+    metrics = asyncio.run(run(args.rows, args.limit, args.queries))
+    if args.output:
+        write_results(args.output, 'search', {'rows': args.rows, 'limit': args.limit, 'queries': args.queries}, metrics)
+    sys.stdout.write(json.dumps({metric.name: metric.value for metric in metrics}, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/compare.py
+"""
+Compare two results files of the same benchmark, e.g. from the main branch and from a change, and fail on regressions.
+
+Prints each metric's change relative to the baseline, signed so that positive is worse whichever way the metric
+goes. A metric regresses when that exceeds the threshold; the command then exits with 1, so it can gate a CI job:
+
+    uv run python -m benchmarks.compare main.json change.json --threshold 0.10
+"""
+
+import argparse
+import sys
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from benchmarks.results import Metric, read_metrics
+
+
+@dataclass
+class Change:
+    name: str
+    unit: str
+    baseline: float
+    current: float
+    # relative change in the direction that is worse: above 0 is a slowdown, below 0 an improvement
+    worse_by: float
+
+    def regressed(self, threshold: float) -> bool:
+        return self.worse_by > threshold
+
+
+def compare(baseline: dict[str, Metric], current: dict[str, Metric]) -> list[Change]:
+    """
+    The change of every metric found in both runs, worst first.
+    """
+    changes = []
+    for name, before in baseline.items():
+        after = current.get(name)
+        if after is None:
+            continue
+        if before.value == 0:
+            relative = 0.0 if after.value == 0 else float('inf')
+        else:
+            relative = (after.value - before.value) / before.value
+        changes.append(
+            Change(
+                name=name,
+                unit=before.unit,
+                baseline=before.value,
+                current=after.value,
+                worse_by=-relative if before.higher_is_better else relative,
+            )
+        )
+    return sorted(changes, key=lambda change: change.worse_by, reverse=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline', type=Path, help='results file to compare against')
+    parser.add_argument('current', type=Path, help='results file of the run under test')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative change counted as a regression')
+    args = parser.parse_args()
+
+    baseline_run, baseline = read_metrics(args.baseline)
+    current_run, current = read_metrics(args.current)
+    if baseline_run['benchmark'] != current_run['benchmark']:
+        raise SystemExit(f'cannot compare {baseline_run["benchmark"]} results with {current_run["benchmark"]} results')
+    if baseline_run['params'] != current_run['params']:
+        sys.stderr.write(f'warning: parameters differ: {baseline_run["params"]} vs {current_run["params"]}\n')
+
+    changes = compare(baseline, current)
+    regressions = [change for change in changes if change.regressed(args.threshold)]
+    width = max((len(change.name) for change in changes), default=0)
+    for change in changes:
+        mark = 'REGRESSED' if change in regressions else ''
+        sys.stdout.write(
+            f'{change.name:<{width}}  {change.baseline:>12.3f} -> {change.current:>12.3f} {change.unit:<4}'
+            f'  {change.worse_by:>+8.1%}  {mark}\n'
+        )
+    for name in sorted(baseline.keys() ^ current.keys()):
+        sys.stdout.write(f'{name:<{width}}  only in {"baseline" if name in baseline else "current"}\n')
+    if regressions:
+        sys.stdout.write(f'{len(regressions)} of {len(changes)} metrics regressed by more than {args.threshold:.0%}\n')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
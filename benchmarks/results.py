@@ -0,0 +1,58 @@
+# benchmarks/results.py
+"""
+The JSON results file the suite's benchmarks write with --output, so that runs on different commits can be compared
+with benchmarks.compare.
+"""
+
+import json
+import platform
+import subprocess
+import sys
+
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+
+@dataclass
+class Metric:
+    # unique within its benchmark, e.g. 'get_task@100000.p95_ms'
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: Path, benchmark: str, params: dict, metrics: list[Metric]) -> dict:
+    """
+    Write `metrics` to `path` along with what they were measured on: the commit, whether the tree had uncommitted
+    changes, and the Python and machine. Returns what was written.
+    """
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    results = {
+        'benchmark': benchmark,
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+        'python': sys.version.split()[0],
+        'machine': platform.platform(),
+        'created_at': datetime.now(UTC).isoformat(timespec='seconds'),
+        'params': params,
+        'metrics': [asdict(metric) for metric in metrics],
+    }
+    path.write_text(json.dumps(results, indent=2) + '\n')
+    return results
+
+
+def read_metrics(path: Path) -> tuple[dict, dict[str, Metric]]:
+    """
+    The results in `path` and their metrics by name.
+    """
+    results = json.loads(path.read_text())
+    return results, {metric['name']: Metric(**metric) for metric in results['metrics']}
@@ -0,0 +1,116 @@
+# src/common/cache.py
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Protocol
+
+
+@dataclass
+class CacheStats:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class CacheBackend(Protocol):
+    """
+    Async key/value cache. Shared backends (e.g. Redis) implement the same interface so
+    they can replace the in-process default without touching the callers.
+    """
+
+    async def get(self, key: str) -> Any | None: ...
+
+    def stamp(self) -> float: ...
+
+    async def set(self, key: str, value: Any, since: float | None = None) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+class LRUCache:
+    """
+    In-process LRU cache with a per-entry TTL. Least recently used entries are evicted once
+    `max_size` is reached; expired entries are dropped when they are next read.
+
+    A value read from the source of truth is stored with the `stamp()` taken before the read, and is
+    dropped if its key was deleted since: the read may have seen the data from before that delete.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # key -> when it was last deleted, oldest first; kept for one TTL
+        self._deleted: OrderedDict[str, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def stamp(self) -> float:
+        return self._clock()
+
+    async def set(self, key: str, value: Any, since: float | None = None) -> None:
+        if since is not None and self._deleted_since(key, since):
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        now = self._clock()
+        for key in keys:
+            self._entries.pop(key, None)
+            self._deleted[key] = now
+            self._deleted.move_to_end(key)
+        self._forget_deletes(now)
+
+    def _deleted_since(self, key: str, since: float) -> bool:
+        now = self._clock()
+        self._forget_deletes(now)
+        # deletes older than the TTL are forgotten, so a read that started before them cannot be checked
+        if since <= now - self.ttl_seconds:
+            return True
+        deleted_at = self._deleted.get(key)
+        return deleted_at is not None and deleted_at >= since
+
+    def _forget_deletes(self, now: float) -> None:
+        while self._deleted:
+            key, deleted_at = next(iter(self._deleted.items()))
+            if deleted_at > now - self.ttl_seconds:
+                break
+            del self._deleted[key]
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            max_size=self.max_size,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+        )
@@ -1,16 +1,150 @@
 # src/common/logger.py
+import atexit
 import logging
+import queue
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import StrEnum
+from importlib.util import find_spec
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
 import structlog
 
 
-def setup_logging(service_name: str = 'unknown', log_level: str = 'INFO'):
+class LogRenderer(StrEnum):
+    JSON = 'json'
+    ORJSON = 'orjson'  # needs the optional orjson package, from the fast-json extra
+
+    def check_installed(self) -> None:
+        """
+        Raise ValueError if the renderer's optional package is missing, so a config asking for it fails up front.
+        """
+        if self == LogRenderer.ORJSON and find_spec('orjson') is None:
+            raise ValueError('the orjson log renderer needs the orjson package: install tasknote-py[fast-json]')
+
+
+@dataclass
+class LoggingStats:
+    queue_size: int
+    queued: int
+    dropped: int
+
+
+@dataclass(slots=True)
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# the SQL statements of the request being handled; greenlets running the database calls share the context
+_query_stats: ContextVar[QueryStats | None] = ContextVar('query_stats', default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count the SQL statements run, and the time spent in them, until the block exits, e.g. for one request.
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def record_query(seconds: float) -> None:
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without ever blocking the caller: when the queue is full the record is
+    dropped and counted instead.
+    """
+
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # handle() already holds the lock, which is reentrant; taking it here covers direct emit() calls too
+            with self.lock:
+                self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog hands over finished lines; formatting anything else is left to the writer thread
+        return record
+
+
+class _DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # the base class gives up on a full queue; stopping waits for the writer to make room instead
+        self.queue.put(self._sentinel)
+
+
+_queue_handler: DroppingQueueHandler | None = None
+_listener: QueueListener | None = None
+# the handler setup_logging added to the root logger; the others there belong to whoever added them
+_root_handler: logging.Handler | None = None
+
+
+def _renderer(renderer: LogRenderer) -> structlog.processors.JSONRenderer:
+    renderer.check_installed()
+    if renderer == LogRenderer.ORJSON:
+        import orjson
+
+        def dumps(event: dict[str, Any], default: Any) -> str:
+            return orjson.dumps(event, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        return structlog.processors.JSONRenderer(serializer=dumps)
+    return structlog.processors.JSONRenderer()
+
+
+def setup_logging(
+    service_name: str = 'unknown',
+    log_level: str = 'INFO',
+    queue_size: int = 0,
+    renderer: LogRenderer | str = LogRenderer.JSON,
+):
+    """
+    Configure structlog to render JSON lines through stdlib logging.
+
+    With `queue_size` above 0 the calling thread only puts each record on a queue of that size, and a background
+    thread writes them out, so slow log I/O cannot stall the event loop; records arriving while the queue is full
+    are dropped and counted. With 0, records are written synchronously.
+
+    Calling it again replaces the handler an earlier call added; other handlers on the root logger are kept.
+    """
+    global _queue_handler, _listener, _root_handler  # noqa: PLW0603
     level = getattr(logging, log_level.upper(), logging.INFO)
 
-    logging.basicConfig(
-        format='%(message)s',
-        level=level,
-    )
+    shutdown_logging()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter('%(message)s'))
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _root_handler is not None:
+        root.removeHandler(_root_handler)
+    if queue_size > 0:
+        records: queue.Queue = queue.Queue(maxsize=queue_size)
+        _queue_handler = DroppingQueueHandler(records)
+        _listener = _DrainingQueueListener(records, stream, respect_handler_level=True)
+        _listener.start()
+        _root_handler = _queue_handler
+    else:
+        _root_handler = stream
+    root.addHandler(_root_handler)
 
     structlog.configure(
         processors=[
@@ -19,7 +153,7 @@ def setup_logging(service_name: str = 'unknown', log_level: str = 'INFO'):
             structlog.processors.add_log_level,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
+            _renderer(LogRenderer(renderer)),
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -28,3 +162,26 @@ def setup_logging(service_name: str = 'unknown', log_level: str = 'INFO'):
     )
 
     structlog.contextvars.bind_contextvars(service=service_name)
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background writer, if any, after it has written out everything already queued.
+    """
+    global _listener  # noqa: PLW0603
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> LoggingStats | None:
+    """
+    Queue usage and dropped records of the queue-based mode; None when logging is synchronous.
+    """
+    if _queue_handler is None or _listener is None:
+        return None
+    records = _queue_handler.queue
+    return LoggingStats(queue_size=records.maxsize, queued=records.qsize(), dropped=_queue_handler.dropped)
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,193 @@
+# src/common/metrics.py
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from copy import copy
+from math import inf
+from typing import Any, Self
+
+# Prometheus' default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+type Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    type_name = ''
+    values: dict[Labels, Any]
+
+    def __init__(self, name: str, documentation: str, label_names: Labels = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]: ...
+
+    @abstractmethod
+    def dump(self) -> list:
+        """
+        The values as JSON-serializable data, for `load` in another process.
+        """
+
+    @abstractmethod
+    def load(self, dumped: list) -> None:
+        """
+        Add in values that `dump` returned.
+        """
+
+    def merged(self, dumps: Iterable[list]) -> Self:
+        """
+        A copy of the metric holding the sum of its own values and those of `dumps`.
+        """
+        merged = copy(self)
+        merged.values = {}
+        for dumped in (self.dump(), *dumps):
+            merged.load(dumped)
+        return merged
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.type_name}'
+        yield from self.samples()
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, label_names: Labels = ()):
+        super().__init__(name, documentation, label_names)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self.values.items()):
+            yield f'{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}'
+
+    def dump(self) -> list:
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+    def load(self, dumped: list) -> None:
+        for labels, value in dumped:
+            self.inc(*labels, amount=value)
+
+
+class Gauge(Counter):
+    type_name = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = value
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Labels = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: the count of each bucket on its own (cumulated when rendered), then the sum
+        self.values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def _entry(self, labels: Labels) -> tuple[list[int], list[float]]:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        return entry
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts, total = self._entry(labels)
+        # le buckets are inclusive: a value equal to a bound falls into that bound's bucket
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> Iterator[str]:
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, inf), counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f'{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}'
+            label_text = _format_labels(self.label_names, labels)
+            yield f'{self.name}_sum{label_text} {_format_value(total[0])}'
+            yield f'{self.name}_count{label_text} {cumulative}'
+
+    def dump(self) -> list:
+        return [[list(labels), counts, total[0]] for labels, (counts, total) in self.values.items()]
+
+    def load(self, dumped: list) -> None:
+        for labels, counts, total in dumped:
+            own_counts, own_total = self._entry(tuple(labels))
+            for i, count in enumerate(counts):
+                own_counts[i] += count
+            own_total[0] += total
+
+
+class Registry:
+    """
+    In-process metrics, rendered in the Prometheus text format. Updates take no lock: they all happen on the
+    event loop's thread. Each worker process keeps its own; `dump` and the `peers` of `render` let the worker that
+    answers a scrape add in the others' values.
+    """
+
+    def __init__(self):
+        self.metrics: list[_Metric] = []
+
+    def counter(self, name: str, documentation: str, label_names: Labels = ()) -> Counter:
+        return self._add(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Labels = ()) -> Gauge:
+        return self._add(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Labels = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, documentation, label_names, buckets))
+
+    def _add[M: _Metric](self, metric: M) -> M:
+        self.metrics.append(metric)
+        return metric
+
+    def dump(self, extra: Iterable[_Metric] = (), gauges: bool = True) -> dict[str, list]:
+        """
+        The values of all the metrics and of `extra` by name, as JSON-serializable data; without the gauges'
+        unless `gauges`.
+        """
+        return {
+            metric.name: metric.dump() for metric in (*self.metrics, *extra) if gauges or not isinstance(metric, Gauge)
+        }
+
+    def render(self, extra: Iterable[_Metric] = (), peers: Iterable[dict[str, list]] = ()) -> str:
+        """
+        All the metrics in the text format, followed by `extra`: values read at scrape time, such as pool stats.
+        Values in `peers`, the dumps of other processes, are added to those of the metrics of the same name.
+        """
+        peers = list(peers)
+        lines = []
+        for metric in (*self.metrics, *extra):
+            total = metric.merged(peer.get(metric.name, []) for peer in peers) if peers else metric
+            lines.extend(total.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,80 @@
+# src/common/profiler.py
+import cProfile
+import io
+import pstats
+import sys
+import threading
+
+from collections import Counter
+from types import FrameType, TracebackType
+from typing import Self
+
+
+def profile_report(profiler: cProfile.Profile, limit: int = 50) -> str:
+    """
+    The `limit` functions `profiler` spent the most cumulative time in, as pstats prints them.
+    """
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return out.getvalue()
+
+
+def _frame_name(frame: FrameType) -> str:
+    return f'{frame.f_globals.get("__name__", "?")}:{frame.f_code.co_qualname}'
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread every `interval_seconds` from a background thread and counts identical stacks.
+    Unlike a tracing profiler it costs the sampled thread nothing between samples, so it can run on a busy event
+    loop; a sample costs it one pause to hand over the GIL.
+
+    Used as a context manager, it samples for the duration of the block.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float = 0.005):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:  # the thread has exited
+                return
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(names))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        The sampled stacks in the collapsed format flamegraph.pl, speedscope and inferno read: one line per
+        distinct stack, outermost frame first, frames joined by `;`, then the number of samples.
+        """
+        return ''.join(f'{";".join(stack)} {count}\n' for stack, count in self.stacks.most_common())
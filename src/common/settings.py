@@ -1,15 +1,33 @@
 # src/common/settings.py
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.common.logger import LogRenderer
+
 
 class BaseServiceSettings(BaseSettings):
     log_level: str
+    # records buffered for the background log writer, 0 to write synchronously; a full buffer drops records
+    log_queue_size: int = 10_000
+    log_renderer: LogRenderer = LogRenderer.JSON
     db_username: str
     db_password: str
     db_host: str
     db_port: int
     db_name: str
 
+    # connection pool
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    # statements taking at least this long are logged; 0 logs none
+    db_slow_query_ms: float = 200.0
+    # across all worker processes; each one's pool is cut down to its share
+    db_max_connections: int = 90
+
     model_config = SettingsConfigDict(
         env_file='.env',  # optional: each service can have its own .env
         env_prefix='',
@@ -17,6 +35,12 @@ class BaseServiceSettings(BaseSettings):
         extra='ignore',
     )
 
+    @field_validator('log_renderer')
+    @classmethod
+    def _renderer_installed(cls, renderer: LogRenderer) -> LogRenderer:
+        renderer.check_installed()
+        return renderer
+
     @property
     def db_url_async(self) -> str:
         return (
@@ -0,0 +1,39 @@
+# src/tasknote/api/conditional.py
+from hashlib import blake2b
+
+from fastapi import Request
+
+from ..domain.models import Page, Versioned
+
+
+def row_validators(tag: str, row: Versioned) -> dict[str, str]:
+    """
+    ETag header for a representation of `row`: every write to the row, tagging included, bumps its version.
+    """
+    return {'ETag': f'W/"{tag}-{row.id}-{row.version}"'}
+
+
+def page_validators(tag: str, page: Page[Versioned]) -> dict[str, str]:
+    """
+    ETag header for a representation of `page`: a digest of its rows' ids and versions, in order, and of its next
+    cursor. It changes with any write to one of those rows, with any row joining or leaving the page, and with a
+    next page appearing or going, and with nothing else.
+    """
+    digest = blake2b(digest_size=12)
+    for row in page.items:
+        digest.update(f'{row.id}:{row.version},'.encode())
+    digest.update((page.next_cursor or '').encode())
+    return {'ETag': f'W/"{tag}-{digest.hexdigest()}"'}
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison) against the ETag in `headers`. Only call it for a representation that
+    exists, since `*` matches any.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is None:
+        return False
+    etag = headers['ETag'].removeprefix('W/')
+    candidates = {candidate.strip().removeprefix('W/') for candidate in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
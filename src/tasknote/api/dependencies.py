@@ -1,15 +1,38 @@
-from fastapi import Depends
+import hmac
+
+from collections.abc import AsyncGenerator
+
+from fastapi import Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.common.cache import CacheStats
+from src.common.logger import LoggingStats, logging_stats
+
+from ..application.analytics_service import AnalyticsService
 from ..application.note_service import NoteService
+from ..application.tags_service import TagsService
 from ..application.tasks_service import TasksService
-from ..persistence.db import get_db_session
+from ..constants import profile_token_header
+from ..container import container
+from ..persistence.analytics_repository import AnalyticsRepository
 from ..persistence.note_repository import NotesRepository
+from ..persistence.pool import PoolStats
+from ..persistence.tags_repository import TagsRepository
 from ..persistence.tasks_repository import TasksRepository
+from ..settings import TaskNoteSettings
+
+
+def get_settings() -> TaskNoteSettings:
+    return container.settings
+
+
+async def get_db_session() -> AsyncGenerator[AsyncSession]:
+    async with container.session_factory() as session:
+        yield session
 
 
 def get_notes_repository(session: AsyncSession = Depends(get_db_session)) -> NotesRepository:
-    return NotesRepository(session)
+    return NotesRepository(session, cache=container.note_cache)
 
 
 def get_note_service(repository: NotesRepository = Depends(get_notes_repository)) -> NoteService:
@@ -17,8 +40,56 @@ def get_note_service(repository: NotesRepository = Depends(get_notes_repository)
 
 
 def get_tasks_repository(session: AsyncSession = Depends(get_db_session)) -> TasksRepository:
-    return TasksRepository(session)
+    return TasksRepository(session, cache=container.task_cache)
 
 
 def get_tasks_service(repository: TasksRepository = Depends(get_tasks_repository)) -> TasksService:
     return TasksService(repository)
+
+
+def get_tags_repository(session: AsyncSession = Depends(get_db_session)) -> TagsRepository:
+    return TagsRepository(session)
+
+
+def get_tags_service(repository: TagsRepository = Depends(get_tags_repository)) -> TagsService:
+    return TagsService(repository)
+
+
+def get_analytics_repository(session: AsyncSession = Depends(get_db_session)) -> AnalyticsRepository:
+    return AnalyticsRepository(session)
+
+
+def get_analytics_service(repository: AnalyticsRepository = Depends(get_analytics_repository)) -> AnalyticsService:
+    return AnalyticsService(repository)
+
+
+def get_pool_stats() -> PoolStats:
+    return container.engine.pool.stats()
+
+
+def get_cache_stats() -> dict[str, CacheStats]:
+    caches = {'tasks': container.task_cache, 'notes': container.note_cache}
+    return {name: cache.stats() for name, cache in caches.items() if cache is not None}
+
+
+def get_logging_stats() -> LoggingStats | None:
+    return logging_stats()
+
+
+def profiling_denied(token: str | None) -> int | None:
+    """
+    The status to refuse a profiling request carrying `token` with, None to let it through: 404 while profiling
+    is off, so that it does not show, and 403 for a missing or wrong token.
+    """
+    expected = container.settings.profiling_token
+    if expected is None:
+        return 404
+    if token is None or not hmac.compare_digest(token.encode(), expected.get_secret_value().encode()):
+        return 403
+    return None
+
+
+def require_profiling_token(token: str | None = Header(None, alias=profile_token_header)) -> None:
+    status = profiling_denied(token)
+    if status is not None:
+        raise HTTPException(status_code=status)
@@ -0,0 +1,150 @@
+# src/tasknote/api/middleware.py
+import cProfile
+
+from http import HTTPStatus
+from time import perf_counter
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.common.logger import track_queries
+from src.common.profiler import profile_report
+
+from ..constants import profile_report_limit, profile_token_header
+from ..container import container
+from ..metrics import http_request_duration, http_requests, http_requests_in_flight
+from .dependencies import profiling_denied
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, status and concurrency of every HTTP request. Plain ASGI rather than BaseHTTPMiddleware,
+    which would add a task and a response copy to each request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # unless the app gets as far as starting a response
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - start
+            http_requests_in_flight.dec()
+            # the route template, not the path, so that ids do not each make a series of their own
+            route = scope.get('route')
+            path = route.path if route is not None else 'unmatched'
+            http_request_duration.observe(elapsed, scope['method'], path)
+            http_requests.inc(scope['method'], path, str(status))
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the SQL statements each request runs, and the time spent in them, and with `headers` on reports them in
+    X-DB-Queries and X-DB-Time (ms) response headers. Those are written as the response starts, so statements a
+    streaming response runs afterwards are left out. `headers` defaults to the db_stats_headers setting.
+    """
+
+    def __init__(self, app: ASGIApp, headers: bool | None = None):
+        self.app = app
+        self._headers = headers
+
+    @property
+    def headers(self) -> bool:
+        # read on the first request rather than when the app is built, which happens at import
+        if self._headers is None:
+            self._headers = container.settings.db_stats_headers
+        return self._headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            if not self.headers:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_stats(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    headers = MutableHeaders(scope=message)
+                    headers['X-DB-Queries'] = str(stats.statements)
+                    headers['X-DB-Time'] = f'{stats.seconds * 1000:.3f}'
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+
+def _profile_requested(query_string: bytes) -> bool:
+    # the byte check keeps the parsing off every other request's path
+    return b'profile=' in query_string and parse_qs(query_string.decode('latin-1')).get('profile') == ['1']
+
+
+class ProfilingMiddleware:
+    """
+    Runs a request carrying `profile=1` in its query string under cProfile and answers with the profile, as text,
+    instead of the response, whose status is reported in X-Profiled-Status. Needs the profiling token in
+    X-Profile-Token (see profiling_denied).
+
+    cProfile traces the whole thread, so other requests the event loop serves meanwhile show up in the profile too;
+    profile on an idle worker. Only one request is profiled at a time, others get 409.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not _profile_requested(scope['query_string']):
+            await self.app(scope, receive, send)
+            return
+
+        status = profiling_denied(Headers(scope=scope).get(profile_token_header))
+        if status is not None:
+            # the body FastAPI gives an HTTPException, as require_profiling_token raises
+            await JSONResponse({'detail': HTTPStatus(status).phrase}, status_code=status)(scope, receive, send)
+            return
+        if self._busy:
+            response = JSONResponse({'detail': 'Another request is being profiled'}, status_code=409)
+            await response(scope, receive, send)
+            return
+
+        profiled_status = 500  # unless the app gets as far as starting a response
+
+        async def discard(message: Message) -> None:
+            nonlocal profiled_status
+            if message['type'] == 'http.response.start':
+                profiled_status = message['status']
+
+        profiler = cProfile.Profile()
+        self._busy = True
+        start = perf_counter()
+        try:
+            profiler.enable()
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.disable()
+            self._busy = False
+        elapsed_ms = (perf_counter() - start) * 1000
+
+        report = f'{scope["method"]} {scope["path"]} -> {profiled_status} in {elapsed_ms:.3f} ms\n\n'
+        report += profile_report(profiler, profile_report_limit)
+        response = PlainTextResponse(report, headers={'X-Profiled-Status': str(profiled_status)})
+        await response(scope, receive, send)
@@ -0,0 +1,44 @@
+from collections.abc import Iterable
+from typing import Any, TypedDict
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class RowsSerializer:
+    """
+    Serialises domain objects as a JSON array shaped like `schema` in a single pydantic-core pass.
+
+    By default the objects go through `schema` as `response_model` would put them. Without `validate`, objects that
+    come from our own repositories are not validated again: the schema's fields are read off each object into a
+    TypedDict built from the schema, which keeps the field set, order and JSON encoding of `schema`.
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        fields = {name: field.annotation for name, field in schema.model_fields.items()}
+        row = TypedDict(f'{schema.__name__}Row', fields)  # type: ignore[misc]
+        self._fields = tuple(fields)
+        self._adapter = TypeAdapter(list[row])
+        self._validator = TypeAdapter(list[schema])
+
+    def dump_json(self, items: Iterable[Any], validate: bool = True) -> bytes:
+        if validate:
+            return self._validator.dump_json(self._validator.validate_python(list(items), from_attributes=True))
+        fields = self._fields
+        return self._adapter.dump_json([{name: getattr(item, name) for name in fields} for item in items])
+
+
+class RowsJSONResponse(Response):
+    """A JSON list response that, without `validate`, skips FastAPI's per-item `response_model` validation."""
+
+    media_type = 'application/json'
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        serializer: RowsSerializer,
+        status_code: int = 200,
+        headers: dict | None = None,
+        validate: bool = True,
+    ):
+        super().__init__(serializer.dump_json(items, validate), status_code=status_code, headers=headers)
@@ -1,14 +1,124 @@
 # src/tasknote/api/router.py
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import threading
 
-from ..api.schemas import NoteCreate, NoteRead, TaskCreate, TaskRead
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import date, datetime
+from functools import partial
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from src.common.profiler import StackSampler
+
+from ..api.schemas import (
+    AnalyticsSummaryRead,
+    BulkCompleteRead,
+    BulkDeleteRead,
+    CacheStatsRead,
+    LoggingStatsRead,
+    NoteCreate,
+    NoteDayRead,
+    NotePatch,
+    NoteRead,
+    NoteUpdate,
+    PoolStatsRead,
+    SnapshotRead,
+    TagCreate,
+    TagRead,
+    TaskCompletionRead,
+    TaskCreate,
+    TaskDayRead,
+    TaskPatch,
+    TaskRead,
+    TasksComplete,
+    TaskUpdate,
+)
+from ..application.analytics_service import AnalyticsService
 from ..application.note_service import NoteService
+from ..application.tags_service import TagsService
 from ..application.tasks_service import TasksService
-from ..domain.exceptions import NoteNotFoundError, TaskNotFoundError
-from .dependencies import get_note_service, get_tasks_service
+from ..constants import (
+    default_page_size,
+    max_due_soon_hours,
+    max_page_size,
+    metrics_media_type,
+    ndjson_media_type,
+    next_cursor_header,
+)
+from ..domain.exceptions import (
+    BatchTooLargeError,
+    InvalidCursorError,
+    InvalidDateRangeError,
+    NoteNotFoundError,
+    TagAlreadyExistsError,
+    TagNotFoundError,
+    TaskNotFoundError,
+    VersionConflictError,
+)
+from ..domain.models import Page, TaskFilter, TaskSort, TaskStatus, Versioned
+from ..metrics import render_metrics
+from ..settings import TaskNoteSettings
+from .conditional import is_not_modified, page_validators, row_validators
+from .dependencies import (
+    get_analytics_service,
+    get_cache_stats,
+    get_logging_stats,
+    get_note_service,
+    get_pool_stats,
+    get_settings,
+    get_tags_service,
+    get_tasks_service,
+    require_profiling_token,
+)
+from .responses import RowsJSONResponse, RowsSerializer
 
 router = APIRouter()
 
+note_rows = RowsSerializer(NoteRead)
+task_rows = RowsSerializer(TaskRead)
+
+# one /debug/stacks sampler per process at a time, each one being a thread pausing the loop every interval
+_stack_sampling = asyncio.Lock()
+
+
+def _wants_ndjson(accept: str | None) -> bool:
+    return accept is not None and ndjson_media_type in accept
+
+
+async def _page_response(  # noqa: PLR0913
+    request: Request,
+    tag: str,
+    serializer: RowsSerializer,
+    read_page: Callable[[], Awaitable[Page]],
+    read_versions: Callable[[], Awaitable[Page[Versioned]]],
+    validate: bool,
+) -> Response:
+    # a conditional request is checked against the ids and versions of the page first, a query that reads neither
+    # the rows' contents nor their tags; only a miss reads the page itself
+    try:
+        if request.headers.get('if-none-match') is not None:
+            headers = _page_headers(tag, await read_versions())
+            if is_not_modified(request, headers):
+                return Response(status_code=304, headers=headers)
+        page = await read_page()
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+    return RowsJSONResponse(page.items, serializer, headers=_page_headers(tag, page), validate=validate)
+
+
+def _page_headers(tag: str, page: Page[Versioned]) -> dict[str, str]:
+    headers = page_validators(tag, page)
+    if page.next_cursor is not None:
+        headers[next_cursor_header] = page.next_cursor
+    return headers
+
+
+async def _ndjson(items: AsyncIterator, schema: type[BaseModel]) -> AsyncIterator[bytes]:
+    async for item in items:
+        yield schema.model_validate(item, from_attributes=True).model_dump_json().encode() + b'\n'
+
 
 @router.get('/welcome')
 async def root():
@@ -20,22 +130,148 @@ async def health():
     return {'status': 'OK'}
 
 
+@router.get('/health/pool', response_model=PoolStatsRead)
+async def pool_health(stats=Depends(get_pool_stats)):
+    return stats
+
+
+@router.get('/health/cache', response_model=dict[str, CacheStatsRead])
+async def cache_health(stats=Depends(get_cache_stats)):
+    return stats
+
+
+@router.get('/health/logging', response_model=LoggingStatsRead | None)
+async def logging_health(stats=Depends(get_logging_stats)):
+    # null while logging is synchronous
+    return stats
+
+
+@router.get('/metrics', response_class=PlainTextResponse)
+async def metrics(pool_stats=Depends(get_pool_stats), settings: TaskNoteSettings = Depends(get_settings)):
+    body = await render_metrics(pool_stats, settings.metrics_share_seconds)
+    return PlainTextResponse(body, media_type=metrics_media_type)
+
+
+@router.get('/debug/stacks', response_class=PlainTextResponse, dependencies=[Depends(require_profiling_token)])
+async def sample_stacks(seconds: float = Query(10.0, gt=0), settings: TaskNoteSettings = Depends(get_settings)):
+    """
+    Sample the event loop's stack for `seconds` and return the stacks in the collapsed format flamegraph tools
+    read. Time spent waiting for I/O shows up under the loop's select call. 409 while another call is sampling.
+    """
+    if seconds > settings.profiling_max_seconds:
+        raise HTTPException(status_code=400, detail=f'seconds must be at most {settings.profiling_max_seconds}')
+    if _stack_sampling.locked():
+        raise HTTPException(status_code=409, detail='stacks are already being sampled')
+    async with _stack_sampling:
+        with StackSampler(threading.get_ident(), settings.profiling_sample_interval_ms / 1000) as sampler:
+            await asyncio.sleep(seconds)
+    return PlainTextResponse(sampler.collapsed())
+
+
 @router.post('/notes', response_model=NoteRead)
 async def create_note(note_create: NoteCreate, service: NoteService = Depends(get_note_service)):
     return await service.create_note(note_create)
 
 
+@router.post('/notes:bulk', response_model=list[NoteRead])
+async def create_notes(note_creates: list[NoteCreate], service: NoteService = Depends(get_note_service)):
+    try:
+        return await service.create_notes(note_creates)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=e.message) from e
+
+
 @router.get('/notes', response_model=list[NoteRead])
-async def get_notes(service: NoteService = Depends(get_note_service)):
-    return await service.get_all_notes()
+async def get_notes(  # noqa: PLR0913
+    *,
+    request: Request,
+    limit: int = Query(default_page_size, ge=1, le=max_page_size),
+    after: str | None = None,
+    accept: str | None = Header(None),
+    service: NoteService = Depends(get_note_service),
+    settings: TaskNoteSettings = Depends(get_settings),
+):
+    # no ETag on a stream: it would take reading every row before sending the first
+    if _wants_ndjson(accept):
+        try:
+            return StreamingResponse(_ndjson(service.stream_notes(after), NoteRead), media_type=ndjson_media_type)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=e.message) from e
+    return await _page_response(
+        request,
+        'notes',
+        note_rows,
+        partial(service.get_notes_page, limit=limit, after=after),
+        partial(service.get_notes_page_versions, limit=limit, after=after),
+        validate=not settings.fast_list_responses,
+    )
+
+
+@router.get('/notes/search', response_model=list[NoteRead])
+async def search_notes(  # noqa: PLR0913
+    *,
+    request: Request,
+    text: str | None = Query(None, min_length=1),
+    tag: str | None = None,
+    limit: int = Query(default_page_size, ge=1, le=max_page_size),
+    after: str | None = None,
+    service: NoteService = Depends(get_note_service),
+    settings: TaskNoteSettings = Depends(get_settings),
+):
+    if text is None and tag is None:
+        raise HTTPException(status_code=400, detail='text or tag is required')
+    return await _page_response(
+        request,
+        'notes',
+        note_rows,
+        partial(service.search_notes, text, limit=limit, after=after, tag=tag),
+        partial(service.search_notes_versions, text, limit=limit, after=after, tag=tag),
+        validate=not settings.fast_list_responses,
+    )
 
 
 @router.get('/notes/{note_id}', response_model=NoteRead)
-async def get_note(note_id: int, service: NoteService = Depends(get_note_service)):
+async def get_note(
+    note_id: int, request: Request, response: Response, service: NoteService = Depends(get_note_service)
+):
     try:
-        return await service.get_note(note_id)
+        note = await service.get_note(note_id)
     except NoteNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message) from e
+    # the note's own version, which the cached row carries too: a cache hit needs no database round trip. And only
+    # once the note is known to exist, so that If-None-Match: * does not turn a 404 into a 304
+    headers = row_validators('note', note)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return note
+
+
+@router.put('/notes/{note_id}', response_model=NoteRead)
+async def update_note(note_id: int, note_update: NoteUpdate, service: NoteService = Depends(get_note_service)):
+    return await _update_note(service, note_id, note_update)
+
+
+@router.patch('/notes/{note_id}', response_model=NoteRead)
+async def patch_note(note_id: int, note_patch: NotePatch, service: NoteService = Depends(get_note_service)):
+    return await _update_note(service, note_id, note_patch)
+
+
+async def _update_note(service: NoteService, note_id: int, note_update: NoteUpdate | NotePatch):
+    try:
+        return await service.update_note(note_id, note_update)
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.message) from e
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=e.message) from e
+
+
+@router.put('/notes/{note_id}/tag/{tag_id}', response_model=NoteRead)
+async def tag_note(note_id: int, tag_id: int, service: NoteService = Depends(get_note_service)):
+    try:
+        return await service.tag_note(note_id, tag_id)
+    except (NoteNotFoundError, TagNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=e.message) from e
 
 
 @router.delete('/notes/{note_id}', status_code=204)
@@ -51,17 +287,131 @@ async def create_task(task_create: TaskCreate, service: TasksService = Depends(g
     return await service.create_task(task_create)
 
 
+@router.post('/tasks:bulk', response_model=list[TaskRead])
+async def create_tasks(task_creates: list[TaskCreate], service: TasksService = Depends(get_tasks_service)):
+    try:
+        return await service.create_tasks(task_creates)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=e.message) from e
+
+
 @router.get('/tasks', response_model=list[TaskRead])
-async def get_tasks(service: TasksService = Depends(get_tasks_service)):
-    return await service.get_all_tasks()
+async def get_tasks(  # noqa: PLR0913
+    *,
+    request: Request,
+    limit: int = Query(default_page_size, ge=1, le=max_page_size),
+    after: str | None = None,
+    status: TaskStatus | None = None,
+    priority_min: int | None = None,
+    priority_max: int | None = None,
+    due_after: datetime | None = None,
+    due_before: datetime | None = None,
+    tag: str | None = None,
+    sort: TaskSort = TaskSort.ID,
+    accept: str | None = Header(None),
+    service: TasksService = Depends(get_tasks_service),
+    settings: TaskNoteSettings = Depends(get_settings),
+):
+    # filtering and ordering happen in SQL; a cursor is only valid for the sort it was issued under
+    filters = TaskFilter(
+        status=status,
+        priority_min=priority_min,
+        priority_max=priority_max,
+        due_after=due_after,
+        due_before=due_before,
+        tag=tag,
+    )
+    # no ETag on a stream: it would take reading every row before sending the first
+    if _wants_ndjson(accept):
+        try:
+            return StreamingResponse(
+                _ndjson(service.stream_tasks(after, filters, sort), TaskRead), media_type=ndjson_media_type
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=e.message) from e
+    return await _page_response(
+        request,
+        'tasks',
+        task_rows,
+        partial(service.get_tasks_page, limit=limit, after=after, filters=filters, sort=sort),
+        partial(service.get_tasks_page_versions, limit=limit, after=after, filters=filters, sort=sort),
+        validate=not settings.fast_list_responses,
+    )
+
+
+@router.get('/tasks/due-soon', response_model=list[TaskRead])
+async def get_tasks_due_soon(
+    hours: int | None = Query(None, ge=1, le=max_due_soon_hours),
+    limit: int = Query(default_page_size, ge=1, le=max_page_size),
+    service: TasksService = Depends(get_tasks_service),
+    settings: TaskNoteSettings = Depends(get_settings),
+):
+    # no ETag here: the window moves with the clock, not only with writes
+    tasks = await service.get_tasks_due_soon(limit=limit, hours=hours)
+    return RowsJSONResponse(tasks, task_rows, validate=not settings.fast_list_responses)
 
 
 @router.get('/tasks/{task_id}', response_model=TaskRead)
-async def get_task(task_id: int, service: TasksService = Depends(get_tasks_service)):
+async def get_task(
+    task_id: int, request: Request, response: Response, service: TasksService = Depends(get_tasks_service)
+):
     try:
-        return await service.get_task(task_id)
+        task = await service.get_task(task_id)
     except TaskNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message) from e
+    # the task's own version, which the cached row carries too: a cache hit needs no database round trip. And only
+    # once the task is known to exist, so that If-None-Match: * does not turn a 404 into a 304
+    headers = row_validators('task', task)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return task
+
+
+@router.put('/tasks/{task_id}', response_model=TaskRead)
+async def update_task(task_id: int, task_update: TaskUpdate, service: TasksService = Depends(get_tasks_service)):
+    return await _update_task(service, task_id, task_update)
+
+
+@router.patch('/tasks/{task_id}', response_model=TaskRead)
+async def patch_task(task_id: int, task_patch: TaskPatch, service: TasksService = Depends(get_tasks_service)):
+    return await _update_task(service, task_id, task_patch)
+
+
+async def _update_task(service: TasksService, task_id: int, task_update: TaskUpdate | TaskPatch):
+    try:
+        return await service.update_task(task_id, task_update)
+    except TaskNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.message) from e
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=e.message) from e
+
+
+@router.post('/tasks/complete', response_model=BulkCompleteRead)
+async def complete_tasks(tasks_complete: TasksComplete, service: TasksService = Depends(get_tasks_service)):
+    try:
+        completed = await service.complete_tasks(tasks_complete.ids)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=e.message) from e
+    return BulkCompleteRead(completed=completed)
+
+
+@router.post('/tasks/complete/{task_id}', response_model=TaskRead)
+async def complete_task(task_id: int, version: int | None = None, service: TasksService = Depends(get_tasks_service)):
+    try:
+        return await service.complete_task(task_id, version)
+    except TaskNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.message) from e
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=e.message) from e
+
+
+@router.put('/tasks/{task_id}/tag/{tag_id}', response_model=TaskRead)
+async def tag_task(task_id: int, tag_id: int, service: TasksService = Depends(get_tasks_service)):
+    try:
+        return await service.tag_task(task_id, tag_id)
+    except (TaskNotFoundError, TagNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=e.message) from e
 
 
 @router.delete('/tasks/{task_id}', status_code=204)
@@ -70,3 +420,81 @@ async def delete_task(task_id: int, service: TasksService = Depends(get_tasks_se
         await service.delete_task(task_id)
     except TaskNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message) from e
+
+
+@router.delete('/tasks', response_model=BulkDeleteRead)
+async def delete_tasks(
+    ids: list[int] = Query(..., min_length=1),
+    service: TasksService = Depends(get_tasks_service),
+):
+    try:
+        deleted = await service.delete_tasks(ids)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=e.message) from e
+    return BulkDeleteRead(deleted=deleted)
+
+
+@router.post('/tags', response_model=TagRead)
+async def create_tag(tag_create: TagCreate, service: TagsService = Depends(get_tags_service)):
+    try:
+        return await service.create_tag(tag_create)
+    except TagAlreadyExistsError as e:
+        raise HTTPException(status_code=409, detail=e.message) from e
+
+
+@router.get('/tags', response_model=list[TagRead])
+async def get_tags(service: TagsService = Depends(get_tags_service)):
+    return await service.get_tags()
+
+
+@router.get('/analytics/summary', response_model=AnalyticsSummaryRead)
+async def get_analytics_summary(service: AnalyticsService = Depends(get_analytics_service)):
+    return await service.get_summary()
+
+
+@router.get('/analytics/tasks/daily', response_model=list[TaskDayRead])
+async def get_task_days(
+    start: date | None = None, end: date | None = None, service: AnalyticsService = Depends(get_analytics_service)
+):
+    try:
+        return await service.get_task_days(start, end)
+    except InvalidDateRangeError as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+
+
+@router.get('/analytics/notes/daily', response_model=list[NoteDayRead])
+async def get_note_days(
+    start: date | None = None, end: date | None = None, service: AnalyticsService = Depends(get_analytics_service)
+):
+    try:
+        return await service.get_note_days(start, end)
+    except InvalidDateRangeError as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+
+
+# the same analytics from materialized views: free for writes, as stale as the last refresh says
+
+
+@router.get('/analytics/views/completion', response_model=SnapshotRead[TaskCompletionRead])
+async def get_view_completion(service: AnalyticsService = Depends(get_analytics_service)):
+    return await service.get_view_completion()
+
+
+@router.get('/analytics/views/tasks/daily', response_model=SnapshotRead[list[TaskDayRead]])
+async def get_view_task_days(
+    start: date | None = None, end: date | None = None, service: AnalyticsService = Depends(get_analytics_service)
+):
+    try:
+        return await service.get_view_task_days(start, end)
+    except InvalidDateRangeError as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+
+
+@router.get('/analytics/views/notes/daily', response_model=SnapshotRead[list[NoteDayRead]])
+async def get_view_note_days(
+    start: date | None = None, end: date | None = None, service: AnalyticsService = Depends(get_analytics_service)
+):
+    try:
+        return await service.get_view_note_days(start, end)
+    except InvalidDateRangeError as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
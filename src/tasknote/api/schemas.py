@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 
 from ..domain.models import TaskStatus
 
@@ -10,11 +10,32 @@ class NoteCreate(BaseModel):
     content: str | None = None
 
 
+class NoteUpdate(NoteCreate):
+    # the version the client read; the update fails with 409 once the note has moved past it
+    version: int | None = None
+
+
+class NotePatch(BaseModel):
+    title: str | None = None
+    content: str | None = None
+    version: int | None = None
+
+    @field_validator('title')
+    @classmethod
+    def _not_null(cls, value):
+        # only fields that are sent get written, and these cannot be cleared
+        if value is None:
+            raise ValueError('may not be null')
+        return value
+
+
 class NoteRead(BaseModel):
     id: int
     title: str
     content: str | None = None
     created_at: datetime
+    tags: list[str] = []
+    version: int
 
 
 class TaskCreate(BaseModel):
@@ -24,6 +45,33 @@ class TaskCreate(BaseModel):
     due_date: datetime | None = None
 
 
+class TaskUpdate(TaskCreate):
+    status: TaskStatus = TaskStatus.NEW
+    # the version the client read; the update fails with 409 once the task has moved past it
+    version: int | None = None
+
+
+class TaskPatch(BaseModel):
+    title: str | None = None
+    description: str | None = None
+    priority: int | None = None
+    due_date: datetime | None = None
+    status: TaskStatus | None = None
+    version: int | None = None
+
+    @field_validator('title', 'status')
+    @classmethod
+    def _not_null(cls, value):
+        # only fields that are sent get written, and these cannot be cleared
+        if value is None:
+            raise ValueError('may not be null')
+        return value
+
+
+class TasksComplete(BaseModel):
+    ids: list[int] = Field(min_length=1)
+
+
 class TaskRead(BaseModel):
     id: int
     title: str
@@ -33,3 +81,85 @@ class TaskRead(BaseModel):
     priority: int | None = None
     due_date: datetime | None = None
     completed_at: datetime | None = None
+    tags: list[str] = []
+    version: int
+
+
+class TagCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=63)
+
+
+class TagRead(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+
+
+class BulkDeleteRead(BaseModel):
+    deleted: list[int]
+
+
+class BulkCompleteRead(BaseModel):
+    completed: list[int]
+
+
+class PoolStatsRead(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    checkout_time_total_ms: float
+    checkout_time_max_ms: float
+
+
+class CacheStatsRead(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class LoggingStatsRead(BaseModel):
+    queue_size: int
+    queued: int
+    dropped: int
+
+
+class AnalyticsSummaryRead(BaseModel):
+    total_tasks: int
+    total_notes: int
+    completed_tasks: int
+    completion_rate: float
+    tasks_per_day: float
+    notes_per_day: float
+    tasks_by_status: dict[TaskStatus, int]
+    since: date | None = None
+
+
+class TaskDayRead(BaseModel):
+    day: date
+    created: int
+    completed: int
+
+
+class NoteDayRead(BaseModel):
+    day: date
+    created: int
+
+
+class TaskCompletionRead(BaseModel):
+    total_tasks: int
+    completed_tasks: int
+    completion_rate: float
+
+
+class SnapshotRead[T](BaseModel):
+    # as of the materialized view's last refresh
+    refreshed_at: datetime | None = None
+    staleness_seconds: float | None = None
+    data: T
@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+
+from src.common.timeutils import now_ist
+
+from ..constants import default_analytics_days, max_analytics_days
+from ..domain.exceptions import InvalidDateRangeError
+from ..domain.models import AnalyticsSummary, NoteDay, Snapshot, TaskCompletion, TaskDay, TaskStatus
+from ..logger import log
+from ..persistence.analytics_repository import AnalyticsRepository
+
+
+class AnalyticsService:
+    def __init__(self, repository: AnalyticsRepository):
+        self.repository = repository
+
+    async def get_summary(self) -> AnalyticsSummary:
+        log.info('Fetching analytics summary')
+        totals = await self.repository.get_totals()
+        total_tasks = sum(totals.tasks_by_status.values())
+        completed_tasks = totals.tasks_by_status.get(TaskStatus.COMPLETED, 0)
+        # averages run over every day since the first activity, idle days included
+        days = (now_ist().date() - totals.first_day).days + 1 if totals.first_day is not None else 0
+        return AnalyticsSummary(
+            total_tasks=total_tasks,
+            total_notes=totals.notes,
+            completed_tasks=completed_tasks,
+            completion_rate=round(completed_tasks / total_tasks, 4) if total_tasks else 0.0,
+            tasks_per_day=round(total_tasks / days, 2) if days else 0.0,
+            notes_per_day=round(totals.notes / days, 2) if days else 0.0,
+            tasks_by_status=totals.tasks_by_status,
+            since=totals.first_day,
+        )
+
+    async def get_task_days(self, start: date | None = None, end: date | None = None) -> list[TaskDay]:
+        start, end = _day_range(start, end)
+        log.info('Fetching daily task counts', start=start.isoformat(), end=end.isoformat())
+        found = {task_day.day: task_day for task_day in await self.repository.get_task_days(start, end)}
+        return [found.get(day) or TaskDay(day) for day in _days(start, end)]
+
+    async def get_note_days(self, start: date | None = None, end: date | None = None) -> list[NoteDay]:
+        start, end = _day_range(start, end)
+        log.info('Fetching daily note counts', start=start.isoformat(), end=end.isoformat())
+        found = {note_day.day: note_day for note_day in await self.repository.get_note_days(start, end)}
+        return [found.get(day) or NoteDay(day) for day in _days(start, end)]
+
+    async def get_view_task_days(self, start: date | None = None, end: date | None = None) -> Snapshot[list[TaskDay]]:
+        start, end = _day_range(start, end)
+        log.info('Fetching daily task counts from view', start=start.isoformat(), end=end.isoformat())
+        snapshot = await self.repository.get_view_task_days(start, end)
+        found = {task_day.day: task_day for task_day in snapshot.data}
+        return _aged(Snapshot([found.get(day) or TaskDay(day) for day in _days(start, end)], snapshot.refreshed_at))
+
+    async def get_view_note_days(self, start: date | None = None, end: date | None = None) -> Snapshot[list[NoteDay]]:
+        start, end = _day_range(start, end)
+        log.info('Fetching daily note counts from view', start=start.isoformat(), end=end.isoformat())
+        snapshot = await self.repository.get_view_note_days(start, end)
+        found = {note_day.day: note_day for note_day in snapshot.data}
+        return _aged(Snapshot([found.get(day) or NoteDay(day) for day in _days(start, end)], snapshot.refreshed_at))
+
+    async def get_view_completion(self) -> Snapshot[TaskCompletion]:
+        log.info('Fetching task completion from view')
+        return _aged(await self.repository.get_view_completion())
+
+    async def refresh_view(self, name: str) -> None:
+        refreshed = await self.repository.refresh_view(name)
+        log.info('Refreshed materialized view' if refreshed else 'Materialized view refresh already running', view=name)
+
+    async def fold(self) -> None:
+        if not await self.repository.fold():
+            log.info('Analytics fold skipped, rollups busy')
+
+    async def reconcile(self) -> None:
+        reconciled = await self.repository.reconcile()
+        log.info('Reconciled analytics rollups' if reconciled else 'Analytics reconcile already running')
+
+
+def _day_range(start: date | None, end: date | None) -> tuple[date, date]:
+    # both ends inclusive; by default the last default_analytics_days days up to today
+    end = end if end is not None else now_ist().date()
+    start = start if start is not None else end - timedelta(days=default_analytics_days - 1)
+    if start > end or (end - start).days >= max_analytics_days:
+        raise InvalidDateRangeError(start, end, max_analytics_days)
+    return start, end
+
+
+def _days(start: date, end: date) -> list[date]:
+    # every day of the range, so the series charts without gaps
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def _aged[T](snapshot: Snapshot[T]) -> Snapshot[T]:
+    # staleness is measured here rather than stored, so it keeps growing between refreshes
+    if snapshot.refreshed_at is not None:
+        snapshot.staleness_seconds = round((now_ist() - snapshot.refreshed_at).total_seconds(), 3)
+    return snapshot
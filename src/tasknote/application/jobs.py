@@ -0,0 +1,42 @@
+import asyncio
+
+from collections.abc import Awaitable, Callable
+
+from ..application.analytics_service import AnalyticsService
+from ..container import container
+from ..logger import log
+from ..metrics import metrics_dir, share_metrics
+from ..persistence.analytics_repository import AnalyticsRepository
+
+
+async def run_every(interval_seconds: float, job: Callable[[], Awaitable[None]], name: str) -> None:
+    """
+    Run `job` every `interval_seconds` until cancelled. A failing run is logged and the schedule carries on.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await job()
+        except Exception:
+            log.exception('Scheduled job failed', job=name)
+
+
+async def reconcile_analytics() -> None:
+    async with container.session_factory() as session:
+        await AnalyticsService(AnalyticsRepository(session)).reconcile()
+
+
+async def fold_analytics() -> None:
+    async with container.session_factory() as session:
+        await AnalyticsService(AnalyticsRepository(session)).fold()
+
+
+async def refresh_view(name: str) -> None:
+    async with container.session_factory() as session:
+        await AnalyticsService(AnalyticsRepository(session)).refresh_view(name)
+
+
+async def publish_metrics(final: bool = False) -> None:
+    directory = metrics_dir()
+    if directory is not None:
+        share_metrics(directory, container.engine.pool.stats(), final=final)
@@ -1,9 +1,13 @@
+from collections.abc import AsyncIterator
+
 from src.common.timeutils import now_ist
 
-from ..api.schemas import NoteCreate
-from ..domain.models import Note
+from ..api.schemas import NoteCreate, NotePatch, NoteUpdate
+from ..domain.exceptions import BatchTooLargeError, VersionConflictError
+from ..domain.models import Note, Page, Versioned
 from ..logger import log
 from ..persistence.note_repository import NotesRepository
+from ..settings import get_settings
 
 
 class NoteService:
@@ -16,13 +20,62 @@ class NoteService:
         log.info('Creating note', title=note.title, created_at=created_at.isoformat())
         return await self.repository.add_note(note)
 
+    async def create_notes(self, note_creates: list[NoteCreate]) -> list[Note]:
+        max_batch_size = get_settings().bulk_max_batch_size
+        if len(note_creates) > max_batch_size:
+            raise BatchTooLargeError(len(note_creates), max_batch_size)
+        created_at = now_ist()
+        new_notes = [
+            Note(title=note_create.title, content=note_create.content, created_at=created_at)
+            for note_create in note_creates
+        ]
+        log.info('Creating notes', count=len(new_notes), created_at=created_at.isoformat())
+        return await self.repository.add_notes(new_notes)
+
     async def get_note(self, note_id: int) -> Note:
         log.info('Fetching note', note_id=note_id)
         return await self.repository.get_note(note_id)
 
-    async def get_all_notes(self) -> list[Note]:
-        log.info('Fetching all notes')
-        return await self.repository.get_all()
+    async def update_note(self, note_id: int, note_update: NoteUpdate | NotePatch) -> Note:
+        # PUT carries the whole note, PATCH only what changes; only those columns are written
+        changes = note_update.model_dump(exclude={'version'}, exclude_unset=isinstance(note_update, NotePatch))
+        log.info('Updating note', note_id=note_id, fields=sorted(changes), version=note_update.version)
+        if not changes:
+            # nothing to write, but a stale version is still a conflict
+            note = await self.repository.get_note(note_id)
+            if note_update.version is not None and note.version != note_update.version:
+                raise VersionConflictError(note_id, note_update.version, note.version)
+            return note
+        return await self.repository.update_note(note_id, changes, note_update.version)
+
+    async def get_notes_page(self, limit: int, after: str | None = None) -> Page[Note]:
+        log.info('Fetching notes page', limit=limit, after=after)
+        return await self.repository.get_page(limit=limit, after=after)
+
+    async def get_notes_page_versions(self, limit: int, after: str | None = None) -> Page[Versioned]:
+        log.info('Checking notes page', limit=limit, after=after)
+        return await self.repository.get_page_versions(limit=limit, after=after)
+
+    async def search_notes(
+        self, text: str | None, limit: int, after: str | None = None, tag: str | None = None
+    ) -> Page[Note]:
+        log.info('Searching notes', text=text, tag=tag, limit=limit, after=after)
+        return await self.repository.search(text, limit=limit, after=after, tag=tag)
+
+    async def search_notes_versions(
+        self, text: str | None, limit: int, after: str | None = None, tag: str | None = None
+    ) -> Page[Versioned]:
+        log.info('Checking notes search', text=text, tag=tag, limit=limit, after=after)
+        return await self.repository.search_versions(text, limit=limit, after=after, tag=tag)
+
+    def stream_notes(self, after: str | None = None) -> AsyncIterator[Note]:
+        log.info('Streaming notes', after=after)
+        return self.repository.stream(after=after)
+
+    async def tag_note(self, note_id: int, tag_id: int) -> Note:
+        log.info('Tagging note', note_id=note_id, tag_id=tag_id)
+        await self.repository.add_tag(note_id, tag_id)
+        return await self.repository.get_note(note_id)
 
     async def delete_note(self, note_id: int) -> None:
         log.info('Deleting note', note_id=note_id)
@@ -0,0 +1,21 @@
+from src.common.timeutils import now_ist
+
+from ..api.schemas import TagCreate
+from ..domain.models import Tag
+from ..logger import log
+from ..persistence.tags_repository import TagsRepository
+
+
+class TagsService:
+    def __init__(self, repository: TagsRepository):
+        self.repository = repository
+
+    async def create_tag(self, tag_create: TagCreate) -> Tag:
+        created_at = now_ist()
+        tag = Tag(name=tag_create.name, created_at=created_at)
+        log.info('Creating tag', name=tag.name, created_at=created_at.isoformat())
+        return await self.repository.add_tag(tag)
+
+    async def get_tags(self) -> list[Tag]:
+        log.info('Fetching tags')
+        return await self.repository.get_tags()
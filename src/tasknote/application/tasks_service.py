@@ -1,19 +1,24 @@
 # src/tasknote/application/tasks_service.py
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+
 from src.common.timeutils import now_ist
 
-from ..api.schemas import TaskCreate
-from ..domain.models import Task
+from ..api.schemas import TaskCreate, TaskPatch, TaskUpdate
+from ..domain.exceptions import BatchTooLargeError, VersionConflictError
+from ..domain.models import Page, Task, TaskFilter, TaskSort, TaskStatus, Versioned
 from ..logger import log
 from ..persistence.tasks_repository import TasksRepository
+from ..settings import get_settings
 
 
 class TasksService:
     def __init__(self, repository: TasksRepository):
         self.repository = repository
 
-    async def create_task(self, task_create: TaskCreate) -> Task:
-        created_at = now_ist()
-        task = Task(
+    @staticmethod
+    def _new_task(task_create: TaskCreate, created_at: datetime) -> Task:
+        return Task(
             title=task_create.title,
             created_at=created_at,
             description=task_create.description,
@@ -21,17 +26,88 @@ class TasksService:
             due_date=task_create.due_date,
             completed_at=None,
         )
+
+    async def create_task(self, task_create: TaskCreate) -> Task:
+        created_at = now_ist()
+        task = self._new_task(task_create, created_at)
         log.info('Creating task', title=task.title, created_at=created_at.isoformat())
         return await self.repository.add_task(task)
 
+    async def create_tasks(self, task_creates: list[TaskCreate]) -> list[Task]:
+        max_batch_size = get_settings().bulk_max_batch_size
+        if len(task_creates) > max_batch_size:
+            raise BatchTooLargeError(len(task_creates), max_batch_size)
+        created_at = now_ist()
+        new_tasks = [self._new_task(task_create, created_at) for task_create in task_creates]
+        log.info('Creating tasks', count=len(new_tasks), created_at=created_at.isoformat())
+        return await self.repository.add_tasks(new_tasks)
+
     async def get_task(self, task_id: int) -> Task:
         log.info('Fetching task', task_id=task_id)
         return await self.repository.get_task(task_id)
 
-    async def get_all_tasks(self) -> list[Task]:
-        log.info('Fetching all tasks')
-        return await self.repository.get_all()
+    async def update_task(self, task_id: int, task_update: TaskUpdate | TaskPatch) -> Task:
+        # PUT carries the whole task, PATCH only what changes; only those columns are written
+        changes = task_update.model_dump(exclude={'version'}, exclude_unset=isinstance(task_update, TaskPatch))
+        if 'status' in changes:
+            changes['completed_at'] = now_ist() if changes['status'] == TaskStatus.COMPLETED else None
+        log.info('Updating task', task_id=task_id, fields=sorted(changes), version=task_update.version)
+        if not changes:
+            # nothing to write, but a stale version is still a conflict
+            task = await self.repository.get_task(task_id)
+            if task_update.version is not None and task.version != task_update.version:
+                raise VersionConflictError(task_id, task_update.version, task.version)
+            return task
+        return await self.repository.update_task(task_id, changes, task_update.version)
+
+    async def complete_task(self, task_id: int, version: int | None = None) -> Task:
+        log.info('Completing task', task_id=task_id, version=version)
+        changes = {'status': TaskStatus.COMPLETED, 'completed_at': now_ist()}
+        return await self.repository.update_task(task_id, changes, version)
+
+    async def complete_tasks(self, task_ids: list[int]) -> list[int]:
+        max_batch_size = get_settings().bulk_max_batch_size
+        if len(task_ids) > max_batch_size:
+            raise BatchTooLargeError(len(task_ids), max_batch_size)
+        log.info('Completing tasks', count=len(task_ids))
+        return await self.repository.complete_tasks(task_ids, now_ist())
+
+    async def get_tasks_page(
+        self, limit: int, after: str | None = None, filters: TaskFilter | None = None, sort: TaskSort = TaskSort.ID
+    ) -> Page[Task]:
+        log.info('Fetching tasks page', limit=limit, after=after, filters=filters, sort=sort)
+        return await self.repository.get_page(limit=limit, after=after, filters=filters, sort=sort)
+
+    async def get_tasks_page_versions(
+        self, limit: int, after: str | None = None, filters: TaskFilter | None = None, sort: TaskSort = TaskSort.ID
+    ) -> Page[Versioned]:
+        log.info('Checking tasks page', limit=limit, after=after, filters=filters, sort=sort)
+        return await self.repository.get_page_versions(limit=limit, after=after, filters=filters, sort=sort)
+
+    async def get_tasks_due_soon(self, limit: int, hours: int | None = None) -> list[Task]:
+        start = now_ist()
+        hours = hours if hours is not None else get_settings().due_soon_window_hours
+        log.info('Fetching tasks due soon', hours=hours, limit=limit)
+        return await self.repository.get_due_between(start, start + timedelta(hours=hours), limit=limit)
+
+    def stream_tasks(
+        self, after: str | None = None, filters: TaskFilter | None = None, sort: TaskSort = TaskSort.ID
+    ) -> AsyncIterator[Task]:
+        log.info('Streaming tasks', after=after, filters=filters, sort=sort)
+        return self.repository.stream(after=after, filters=filters, sort=sort)
+
+    async def tag_task(self, task_id: int, tag_id: int) -> Task:
+        log.info('Tagging task', task_id=task_id, tag_id=tag_id)
+        await self.repository.add_tag(task_id, tag_id)
+        return await self.repository.get_task(task_id)
 
     async def delete_task(self, task_id: int) -> None:
         log.info('Deleting task', task_id=task_id)
         await self.repository.delete_task(task_id)
+
+    async def delete_tasks(self, task_ids: list[int]) -> list[int]:
+        max_batch_size = get_settings().bulk_max_batch_size
+        if len(task_ids) > max_batch_size:
+            raise BatchTooLargeError(len(task_ids), max_batch_size)
+        log.info('Deleting tasks', count=len(task_ids))
+        return await self.repository.delete_tasks(task_ids)
@@ -1 +1,39 @@
 service_name = 'tasknote'
+
+# worker processes the server runs, exported by serve to the workers it starts (the name uvicorn reads too)
+workers_env = 'WEB_CONCURRENCY'
+# directory where each of several workers shares its metrics with the others, also exported by serve
+metrics_dir_env = 'TASKNOTE_METRICS_DIR'
+
+# bulk writes: a multi-row INSERT binds every column of every row, and one statement carries at most 32767 bind
+# parameters (PostgreSQL's wire protocol); a task binds the most columns per row, and its rollup deltas bind 3 more
+# per statement (the day's timezone twice and the sign)
+max_bind_parameters = 32767
+max_insert_columns = 7
+insert_fixed_parameters = 3
+
+# pagination
+default_page_size = 100
+max_page_size = 1000
+next_cursor_header = 'X-Next-Cursor'
+
+# due-soon look-ahead cap, one week
+max_due_soon_hours = 168
+
+# Prometheus text exposition format
+metrics_media_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+# profiling
+profile_token_header = 'X-Profile-Token'
+profile_report_limit = 50
+
+# streaming
+ndjson_media_type = 'application/x-ndjson'
+stream_batch_size = 500
+
+# full-text search
+search_config = 'english'
+
+# analytics day ranges, both ends inclusive
+default_analytics_days = 30
+max_analytics_days = 366
@@ -0,0 +1,58 @@
+# src/tasknote/container.py
+import os
+
+from functools import cached_property
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.common.cache import CacheBackend
+
+from .constants import workers_env
+from .persistence.cache import build_cache
+from .persistence.db import create_engine
+from .settings import TaskNoteSettings, get_settings
+
+
+class Container:
+    """
+    The process's shared resources. Each is built on first use rather than at import, so importing the app parses
+    no config and opens no pool, and a server can fork its workers before any of them exist.
+    """
+
+    @cached_property
+    def settings(self) -> TaskNoteSettings:
+        return get_settings()
+
+    @cached_property
+    def workers(self) -> int:
+        # the number of workers of the server this process is one of
+        return int(os.environ.get(workers_env, '1'))
+
+    @cached_property
+    def engine(self) -> AsyncEngine:
+        # each worker of a multi-worker server gets its share of the connection budget
+        return create_engine(self.settings, workers=self.workers)
+
+    @cached_property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(self.engine, expire_on_commit=False)
+
+    @cached_property
+    def task_cache(self) -> CacheBackend | None:
+        return build_cache(self.settings, self.workers)
+
+    @cached_property
+    def note_cache(self) -> CacheBackend | None:
+        return build_cache(self.settings, self.workers)
+
+    async def dispose(self) -> None:
+        """
+        Close the engine's pooled connections, if it was ever built. The next use builds a fresh engine.
+        """
+        self.__dict__.pop('session_factory', None)
+        engine = self.__dict__.pop('engine', None)
+        if engine is not None:
+            await engine.dispose()
+
+
+container = Container()
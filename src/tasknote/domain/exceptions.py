@@ -1,3 +1,6 @@
+from datetime import date
+
+
 class NoteNotFoundError(Exception):
     """Exception raised when a note is not found."""
 
@@ -14,3 +17,62 @@ class TaskNotFoundError(Exception):
         self.task_id = task_id
         self.message = f'{message}: {task_id}'
         super().__init__(self.message)
+
+
+class TagNotFoundError(Exception):
+    """Exception raised when a tag is not found."""
+
+    def __init__(self, tag_id: int, message: str = 'Tag not found'):
+        self.tag_id = tag_id
+        self.message = f'{message}: {tag_id}'
+        super().__init__(self.message)
+
+
+class TagAlreadyExistsError(Exception):
+    """Exception raised when a tag with the same name already exists."""
+
+    def __init__(self, name: str, message: str = 'Tag already exists'):
+        self.name = name
+        self.message = f'{message}: {name}'
+        super().__init__(self.message)
+
+
+class VersionConflictError(Exception):
+    """Exception raised when an update expected another version of the row than the stored one."""
+
+    def __init__(self, resource_id: int, expected: int, actual: int, message: str = 'Version conflict'):
+        self.resource_id = resource_id
+        self.expected = expected
+        self.actual = actual
+        self.message = f'{message}: {resource_id} is at version {actual}, not {expected}'
+        super().__init__(self.message)
+
+
+class InvalidCursorError(Exception):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str, message: str = 'Invalid cursor'):
+        self.cursor = cursor
+        self.message = f'{message}: {cursor}'
+        super().__init__(self.message)
+
+
+class BatchTooLargeError(Exception):
+    """Exception raised when a bulk request carries more items than allowed."""
+
+    def __init__(self, size: int, max_size: int, message: str = 'Batch too large'):
+        self.size = size
+        self.max_size = max_size
+        self.message = f'{message}: {size} > {max_size}'
+        super().__init__(self.message)
+
+
+class InvalidDateRangeError(Exception):
+    """Exception raised when a day range is reversed or spans more days than allowed."""
+
+    def __init__(self, start: date, end: date, max_days: int, message: str = 'Invalid date range'):
+        self.start = start
+        self.end = end
+        self.max_days = max_days
+        self.message = f'{message}: {start} to {end}, at most {max_days} days'
+        super().__init__(self.message)
@@ -1,14 +1,19 @@
 # src/tasknote/domain/model.py
-from datetime import datetime
-from enum import Enum
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum, StrEnum
+from typing import Protocol
 
 
+@dataclass(slots=True)
 class Note:
-    def __init__(self, title: str, content: str | None, created_at: datetime, id: int | None = None):
-        self.id = id
-        self.title = title
-        self.content = content
-        self.created_at = created_at
+    title: str
+    content: str | None
+    created_at: datetime
+    id: int | None = None
+    tags: list[str] = field(default_factory=list)
+    # bumped by every update, for optimistic concurrency
+    version: int = 1
 
 
 class TaskStatus(str, Enum):
@@ -18,24 +23,114 @@ class TaskStatus(str, Enum):
     CANCELLED = 'CANCELLED'
 
 
+@dataclass(slots=True)
 class Task:
-    def __init__(  # noqa: PLR0913
-        self,
-        title: str,
-        created_at: datetime,
-        description: str | None,
-        priority: int | None,
-        due_date: datetime | None,
-        completed_at: datetime | None,
-        status: TaskStatus = TaskStatus.NEW,
-        id: int | None = None,
-    ):
-        self.id = id
-        self.title = title
-        self.created_at = created_at
-        self.status = status
-
-        self.description = description
-        self.priority = priority
-        self.due_date = due_date
-        self.completed_at = completed_at
+    title: str
+    created_at: datetime
+    description: str | None
+    priority: int | None
+    due_date: datetime | None
+    completed_at: datetime | None
+    status: TaskStatus = TaskStatus.NEW
+    id: int | None = None
+    tags: list[str] = field(default_factory=list)
+    # bumped by every update, for optimistic concurrency
+    version: int = 1
+
+
+class TaskSort(StrEnum):
+    """Orders of the task listing; a leading '-' sorts descending. Every order ends on the id."""
+
+    ID = 'id'
+    ID_DESC = '-id'
+    DUE_DATE = 'due_date'
+    DUE_DATE_DESC = '-due_date'
+    PRIORITY = 'priority'
+    PRIORITY_DESC = '-priority'
+
+
+@dataclass(slots=True)
+class TaskFilter:
+    """Criteria of the task listing; None leaves a criterion out, due dates are [due_after, due_before)."""
+
+    status: TaskStatus | None = None
+    priority_min: int | None = None
+    priority_max: int | None = None
+    due_after: datetime | None = None
+    due_before: datetime | None = None
+    tag: str | None = None
+
+
+@dataclass(slots=True)
+class Tag:
+    name: str
+    created_at: datetime
+    id: int | None = None
+
+
+class Versioned(Protocol):
+    """Anything that names a row and the version of it: a Task or Note, or just its id and version."""
+
+    id: int | None
+    version: int
+
+
+class Page[T]:
+    """A slice of a keyset-paginated listing; `next_cursor` is None on the last page."""
+
+    def __init__(self, items: list[T], next_cursor: str | None = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+@dataclass(slots=True)
+class TaskDay:
+    day: date
+    created: int = 0
+    completed: int = 0
+
+
+@dataclass(slots=True)
+class NoteDay:
+    day: date
+    created: int = 0
+
+
+@dataclass(slots=True)
+class AnalyticsTotals:
+    """Running totals of the rollups; `first_day` is the earliest day with any activity, None when there is none."""
+
+    tasks_by_status: dict[TaskStatus, int]
+    notes: int
+    first_day: date | None = None
+
+
+@dataclass(slots=True)
+class AnalyticsSummary:
+    total_tasks: int
+    total_notes: int
+    completed_tasks: int
+    completion_rate: float
+    tasks_per_day: float
+    notes_per_day: float
+    tasks_by_status: dict[TaskStatus, int]
+    since: date | None = None
+
+
+@dataclass(slots=True)
+class TaskCompletion:
+    total_tasks: int
+    completed_tasks: int
+    completion_rate: float
+
+
+class Snapshot[T]:
+    """
+    Data read from a materialized view, as of its last refresh; `refreshed_at` and `staleness_seconds`
+    are None until the first refresh is recorded.
+    """
+
+    def __init__(self, data: T, refreshed_at: datetime | None = None, staleness_seconds: float | None = None):
+        self.data = data
+        self.refreshed_at = refreshed_at
+        self.staleness_seconds = staleness_seconds
@@ -3,7 +3,17 @@ import structlog
 
 from src.common.logger import setup_logging
 from src.tasknote.constants import service_name
-from src.tasknote.settings import settings
+from src.tasknote.settings import get_settings
 
-setup_logging(service_name=service_name, log_level=settings.log_level)
 log = structlog.get_logger()
+
+
+def configure_logging() -> None:
+    # called on startup rather than at import, since the log level comes from the settings
+    settings = get_settings()
+    setup_logging(
+        service_name=service_name,
+        log_level=settings.log_level,
+        queue_size=settings.log_queue_size,
+        renderer=settings.log_renderer,
+    )
@@ -1,16 +1,67 @@
+import asyncio
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from functools import partial
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.middleware import MetricsMiddleware, ProfilingMiddleware, QueryStatsMiddleware
 from .api.router import router
+from .application.jobs import fold_analytics, publish_metrics, reconcile_analytics, refresh_view, run_every
+from .container import container
+from .logger import configure_logging, log
+from .metrics import metrics_dir
+from .persistence.views import materialized_views
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # the settings, engine and caches are built here or on first use, never at import
+    configure_logging()
+    settings = container.settings
+    app.state.container = container
+    jobs = []
+    if settings.analytics_reconcile_interval_seconds > 0:
+        jobs.append(
+            asyncio.create_task(
+                run_every(settings.analytics_reconcile_interval_seconds, reconcile_analytics, 'reconcile_analytics')
+            )
+        )
+    if settings.analytics_fold_interval_seconds > 0:
+        jobs.append(
+            asyncio.create_task(run_every(settings.analytics_fold_interval_seconds, fold_analytics, 'fold_analytics'))
+        )
+    for name, interval in settings.view_refresh_seconds.items():
+        if name not in materialized_views:
+            log.warning('Skipping refresh of unknown materialized view', view=name)
+        elif interval > 0:
+            jobs.append(asyncio.create_task(run_every(interval, partial(refresh_view, name), f'refresh_{name}')))
+    if metrics_dir() is not None:
+        jobs.append(asyncio.create_task(run_every(settings.metrics_share_seconds, publish_metrics, 'publish_metrics')))
+    yield
+    for job in jobs:
+        job.cancel()
+        with suppress(asyncio.CancelledError):
+            await job
+    await publish_metrics(final=True)
+    await container.dispose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(router, prefix='/tasknote')
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=['*'],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=['*'],
+    allow_headers=['*'],
 )
+app.add_middleware(QueryStatsMiddleware)
+# inside the metrics, so that a profiled request is still counted
+app.add_middleware(ProfilingMiddleware)
+# outermost, so that the latency covers the other middleware too
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,132 @@
+# src/tasknote/metrics.py
+import asyncio
+import json
+import os
+import time
+
+from contextlib import suppress
+from pathlib import Path
+
+from src.common.metrics import Counter, Gauge, Registry
+
+from .constants import metrics_dir_env
+from .persistence.pool import PoolStats
+
+# statements are mostly index lookups, so the buckets start well below the HTTP ones
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# a worker's shared gauges are dropped once its file is this many share intervals old, in case its pid was reused
+STALE_SHARES = 3
+
+registry = Registry()
+
+http_requests = registry.counter(
+    'tasknote_http_requests_total', 'HTTP requests handled, by method, route and status.', ('method', 'route', 'status')
+)
+http_request_duration = registry.histogram(
+    'tasknote_http_request_duration_seconds',
+    'Time to handle an HTTP request, by method and route.',
+    ('method', 'route'),
+)
+http_requests_in_flight = registry.gauge('tasknote_http_requests_in_flight', 'HTTP requests being handled.')
+db_query_duration = registry.histogram(
+    'tasknote_db_query_duration_seconds',
+    'Time to execute a SQL statement, by statement type.',
+    ('statement',),
+    DB_BUCKETS,
+)
+
+
+def pool_metrics(stats: PoolStats) -> list[Counter | Gauge]:
+    """
+    The connection pool's stats, read at scrape time.
+    """
+    gauges = {
+        'size': ('Connections the pool keeps open.', stats.size),
+        'checked_out': ('Connections in use.', stats.checked_out),
+        'overflow': ('Connections open beyond the pool size.', stats.overflow),
+    }
+    counters = {
+        'checkouts_total': ('Connections handed out.', stats.checkouts),
+        'timeouts_total': ('Checkouts that timed out waiting for a connection.', stats.timeouts),
+        'checkout_seconds_total': (
+            'Time spent checking out connections: waiting for or opening one, and the pre-ping.',
+            stats.checkout_time_total_ms / 1000,
+        ),
+    }
+    metrics: list[Counter | Gauge] = []
+    for kind, values in ((Gauge, gauges), (Counter, counters)):
+        for name, (documentation, value) in values.items():
+            metric = kind(f'tasknote_db_pool_{name}', documentation)
+            metric.inc(amount=value)
+            metrics.append(metric)
+    return metrics
+
+
+def metrics_dir() -> Path | None:
+    """
+    Where the workers share their metrics; None when the app runs in a single process.
+    """
+    directory = os.environ.get(metrics_dir_env)
+    return Path(directory) if directory else None
+
+
+def share_metrics(directory: Path, pool_stats: PoolStats, final: bool = False) -> None:
+    """
+    Write this worker's metrics to `directory`, for the scrapes other workers answer to add in. A `final` write,
+    as the worker stops, leaves out the gauges: what is in use stops being in use with the worker.
+    """
+    path = directory / f'{os.getpid()}.json'
+    dumped = registry.dump(pool_metrics(pool_stats), gauges=not final)
+    # renamed into place, so that a reader never sees half a file
+    staging = path.with_suffix('.tmp')
+    staging.write_text(json.dumps(dumped))
+    staging.replace(path)
+
+
+async def render_metrics(pool_stats: PoolStats, share_seconds: float) -> str:
+    """
+    The metrics in the text format. With several workers, this worker's own values plus the others' as they last
+    shared them, every `share_seconds`, counters of stopped workers included, so that no total ever goes down.
+    """
+    directory = metrics_dir()
+    extra = pool_metrics(pool_stats)
+    peers = []
+    if directory is not None:
+        gauges = {metric.name for metric in (*registry.metrics, *extra) if isinstance(metric, Gauge)}
+        # file reads, kept off the event loop
+        peers = await asyncio.to_thread(read_peers, directory, gauges, STALE_SHARES * share_seconds)
+    return registry.render(extra, peers)
+
+
+def read_peers(directory: Path, gauges: set[str], stale_after: float) -> list[dict[str, list]]:
+    """
+    The metrics the other workers last shared to `directory`. Those of a worker that is gone keep their counters
+    but lose the `gauges`: a worker that crashed never made the final share that leaves them out. A worker counts
+    as gone when its pid is, or when it has not shared for `stale_after` seconds, as its pid may be another
+    process's by now.
+    """
+    own = f'{os.getpid()}.json'
+    now = time.time()
+    peers = []
+    for path in directory.glob('*.json'):
+        if path.name != own:
+            # a worker that stopped mid-write or a stray file costs its values, not the scrape
+            with suppress(OSError, ValueError):
+                shared_at = path.stat().st_mtime
+                dumped = json.loads(path.read_text())
+                if now - shared_at > stale_after or not _alive(int(path.stem)):
+                    dumped = {name: values for name, values in dumped.items() if name not in gauges}
+                peers.append(dumped)
+    return peers
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # it exists, as another user's
+        return True
+    return True
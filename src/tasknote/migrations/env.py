@@ -4,7 +4,7 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool
 
 from src.tasknote.persistence.entities import Base
-from src.tasknote.settings import settings
+from src.tasknote.settings import get_settings
 
 # this is the Alembic Config object
 config = context.config
@@ -15,7 +15,7 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Override the sqlalchemy.url from settings
-config.set_main_option('sqlalchemy.url', settings.db_url_sync)
+config.set_main_option('sqlalchemy.url', get_settings().db_url_sync)
 
 target_metadata = Base.metadata
 
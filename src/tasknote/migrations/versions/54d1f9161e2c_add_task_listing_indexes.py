@@ -0,0 +1,34 @@
+"""Add task listing indexes
+
+Revision ID: 54d1f9161e2c
+Revises: a2abe38fdd3d
+Create Date: 2026-10-18 12:47:57.388462
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '54d1f9161e2c'
+down_revision: str | None = 'a2abe38fdd3d'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; built that way, the indexes leave writes to tasks running
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_due_date_id', 'tasks', ['due_date', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tasks_priority_id', 'tasks', ['priority', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tasks_status_id', 'tasks', ['status', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_status_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_priority_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_due_date_id', table_name='tasks', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""Add row versions
+
+Revision ID: 56eac009ac84
+Revises: 8e9080ecfca9
+Create Date: 2026-10-18 12:30:41.512904
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '56eac009ac84'
+down_revision: str | None = '8e9080ecfca9'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notes', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'version')
+    op.drop_column('notes', 'version')
@@ -0,0 +1,44 @@
+"""Add open tasks due date index
+
+Revision ID: a2abe38fdd3d
+Revises: dba17f909d1d
+Create Date: 2026-10-18 12:45:27.731774
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2abe38fdd3d'
+down_revision: str | None = 'dba17f909d1d'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; built that way, the index leaves writes to tasks running
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_due_date_open',
+            'tasks',
+            ['due_date', 'id'],
+            unique=False,
+            postgresql_where=sa.text("status NOT IN ('COMPLETED', 'CANCELLED')"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_due_date_open',
+            table_name='tasks',
+            postgresql_where=sa.text("status NOT IN ('COMPLETED', 'CANCELLED')"),
+            postgresql_concurrently=True,
+        )
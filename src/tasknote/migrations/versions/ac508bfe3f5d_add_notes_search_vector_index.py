@@ -0,0 +1,39 @@
+"""Add notes search vector index
+
+Revision ID: ac508bfe3f5d
+Revises: fef62e0b56ed
+Create Date: 2026-10-18 18:47:12.518304
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'ac508bfe3f5d'
+down_revision: str | None = 'fef62e0b56ed'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; built that way, the index leaves writes to notes running
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notes_search_vector',
+            'notes',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notes_search_vector', table_name='notes', postgresql_using='gin', postgresql_concurrently=True
+        )
@@ -0,0 +1,209 @@
+# src/tasknote/persistence/analytics_repository.py
+from datetime import date
+
+from sqlalchemy import Select, Subquery, Table, delete, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..domain.models import AnalyticsTotals, NoteDay, Snapshot, TaskCompletion, TaskDay
+from ..persistence.entities import (
+    NoteCountDeltaEntity,
+    NoteDailyCountEntity,
+    NoteEntity,
+    TaskCountDeltaEntity,
+    TaskDailyCountEntity,
+    TaskEntity,
+    TaskStatusCountEntity,
+)
+from ..persistence.rollups import day_column, note_days, task_days, task_statuses
+from ..persistence.views import get_refreshed_at, note_daily_stats, refresh_view, task_completion, task_daily_stats
+
+# held by the fold and the reconcile, the only two that change the rollup rows
+_rollups_lock = 'reconcile_analytics'
+
+
+class AnalyticsRepository:
+    """
+    Reads of the analytics rollups and materialized views, which cost one row per day or per status rather than
+    one per task or note.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_task_days(self, start: date, end: date) -> list[TaskDay]:
+        # days without activity have no row; callers fill them in
+        days = task_days()
+        stmt = select(days).where(days.c.day.between(start, end)).order_by(days.c.day)
+        result = await self.session.execute(stmt)
+        return [TaskDay(row.day, row.created, row.completed) for row in result.all()]
+
+    async def get_note_days(self, start: date, end: date) -> list[NoteDay]:
+        days = note_days()
+        stmt = select(days).where(days.c.day.between(start, end)).order_by(days.c.day)
+        result = await self.session.execute(stmt)
+        return [NoteDay(row.day, row.created) for row in result.all()]
+
+    async def get_totals(self) -> AnalyticsTotals:
+        statuses = await self.session.execute(select(task_statuses()))
+        by_task_day, by_note_day = task_days(), note_days()
+        totals = await self.session.execute(
+            select(
+                select(func.coalesce(func.sum(by_note_day.c.created), 0)).scalar_subquery(),
+                func.least(
+                    select(func.min(by_task_day.c.day)).scalar_subquery(),
+                    select(func.min(by_note_day.c.day)).scalar_subquery(),
+                ),
+            )
+        )
+        notes, first_day = totals.one()
+        return AnalyticsTotals(dict(statuses.all()), notes, first_day)
+
+    async def fold(self) -> bool:
+        """
+        Move the deltas the writers have appended into the rollup rows. Returns False, having done nothing, when
+        another process is already folding or reconciling.
+        """
+        if not await self._lock():
+            return False
+        await self._fold()
+        await self.session.commit()
+        return True
+
+    async def _fold(self) -> None:
+        # each delete takes the deltas committed by the time it starts and adds them up into the rollups in the
+        # same statement; deltas committed meanwhile wait for the next fold. In key order, so that the upserts
+        # cannot deadlock with a reconcile
+        folded = (
+            delete(TaskCountDeltaEntity)
+            .returning(
+                TaskCountDeltaEntity.created_day,
+                TaskCountDeltaEntity.completed_day,
+                TaskCountDeltaEntity.status,
+                TaskCountDeltaEntity.sign,
+            )
+            .cte('folded')
+        )
+        events = union_all(
+            select(folded.c.created_day.label('day'), folded.c.sign.label('created'), literal(0).label('completed')),
+            select(folded.c.completed_day, literal(0), folded.c.sign).where(folded.c.completed_day.is_not(None)),
+        ).subquery()
+        daily = select(events.c.day, func.sum(events.c.created), func.sum(events.c.completed)).group_by(events.c.day)
+        statuses = select(folded.c.status, func.sum(folded.c.sign)).group_by(folded.c.status)
+        await self.session.execute(
+            select(func.count())
+            .select_from(folded)
+            .add_cte(
+                _add_to(TaskDailyCountEntity.__table__, daily).cte('fold_task_days'),
+                _add_to(TaskStatusCountEntity.__table__, statuses).cte('fold_task_statuses'),
+            )
+        )
+        folded = (
+            delete(NoteCountDeltaEntity).returning(NoteCountDeltaEntity.day, NoteCountDeltaEntity.sign).cte('folded')
+        )
+        daily = select(folded.c.day, func.sum(folded.c.sign)).group_by(folded.c.day)
+        await self.session.execute(
+            select(func.count())
+            .select_from(folded)
+            .add_cte(_add_to(NoteDailyCountEntity.__table__, daily).cte('fold_note_days'))
+        )
+
+    async def reconcile(self) -> bool:
+        """
+        Fold the deltas, then recount the rollups from the tasks and notes tables and correct any drift.
+        Returns False, having done nothing, when another process is already folding or reconciling.
+        """
+        if not await self._lock():
+            return False
+        await self._fold()
+
+        created_day = day_column(TaskEntity.created_at)
+        completed_day = day_column(TaskEntity.completed_at)
+        events = union_all(
+            select(created_day.label('day'), literal(1).label('created'), literal(0).label('completed')),
+            select(completed_day, literal(0), literal(1)).where(TaskEntity.completed_at.is_not(None)),
+        ).subquery()
+        await self._correct(
+            TaskDailyCountEntity.__table__,
+            task_days(),
+            select(events.c.day, func.sum(events.c.created), func.sum(events.c.completed)).group_by(events.c.day),
+        )
+        await self._correct(
+            TaskStatusCountEntity.__table__,
+            task_statuses(),
+            select(TaskEntity.status, func.count()).group_by(TaskEntity.status),
+        )
+        note_day = day_column(NoteEntity.created_at)
+        await self._correct(
+            NoteDailyCountEntity.__table__, note_days(), select(note_day, func.count()).group_by(note_day)
+        )
+        await self.session.commit()
+        return True
+
+    async def _lock(self) -> bool:
+        # with several workers each running the scheduler, one fold or reconcile at a time: two would both apply
+        # the same correction
+        locked = await self.session.scalar(select(func.pg_try_advisory_xact_lock(func.hashtext(_rollups_lock))))
+        if not locked:
+            await self.session.rollback()
+        return locked
+
+    async def _correct(self, rollup: Table, current: Subquery, recount: Select) -> None:
+        # the recount and the current counts, the rollup plus the deltas not yet folded, are read in one statement,
+        # so from one snapshot: a write appends its deltas in its own transaction, so any difference between them
+        # is drift. Only the fold and the reconcile change the rollup rows, under the lock, so the drift can be
+        # added to them as they are; the deltas committed meanwhile stay to be folded
+        recount = recount.subquery()
+        found_key, *found = recount.columns
+        current_key, *counted = current.columns
+        drift = [func.coalesce(total, 0) - func.coalesce(count, 0) for total, count in zip(found, counted, strict=True)]
+        corrections = (
+            select(func.coalesce(found_key, current_key), *drift)
+            .select_from(recount.join(current, found_key == current_key, full=True))
+            .where(or_(*(change != 0 for change in drift)))
+        )
+        await self.session.execute(_add_to(rollup, corrections))
+        # rows counted down to zero are of no use any more
+        (key,) = rollup.primary_key.columns
+        await self.session.execute(
+            delete(rollup).where(*(column == 0 for column in rollup.columns if column is not key))
+        )
+
+    async def get_view_task_days(self, start: date, end: date) -> Snapshot[list[TaskDay]]:
+        view = task_daily_stats
+        stmt = select(view.c.day, view.c.created, view.c.completed).where(view.c.day.between(start, end))
+        result = await self.session.execute(stmt.order_by(view.c.day))
+        days = [TaskDay(row.day, row.created, row.completed) for row in result.all()]
+        return Snapshot(days, await get_refreshed_at(self.session, view))
+
+    async def get_view_note_days(self, start: date, end: date) -> Snapshot[list[NoteDay]]:
+        view = note_daily_stats
+        stmt = select(view.c.day, view.c.created).where(view.c.day.between(start, end))
+        result = await self.session.execute(stmt.order_by(view.c.day))
+        days = [NoteDay(row.day, row.created) for row in result.all()]
+        return Snapshot(days, await get_refreshed_at(self.session, view))
+
+    async def get_view_completion(self) -> Snapshot[TaskCompletion]:
+        view = task_completion
+        result = await self.session.execute(select(view.c.total_tasks, view.c.completed_tasks, view.c.completion_rate))
+        row = result.one()
+        completion = TaskCompletion(row.total_tasks, row.completed_tasks, row.completion_rate)
+        return Snapshot(completion, await get_refreshed_at(self.session, view))
+
+    async def refresh_view(self, name: str) -> bool:
+        return await refresh_view(self.session, name)
+
+
+def _add_to(rollup: Table, counts: Select) -> Insert:
+    """
+    An upsert adding `counts`, rows of the rollup's key and then its other columns, to the rollup rows, in key order.
+    """
+    (key,) = rollup.primary_key.columns
+    values = [column for column in rollup.columns if column is not key]
+    counts = counts.subquery()
+    stmt = insert(rollup).from_select(
+        [key.name, *(column.name for column in values)], select(counts).order_by(counts.columns[0])
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[key], set_={column.name: column + stmt.excluded[column.name] for column in values}
+    )
@@ -0,0 +1,11 @@
+# src/tasknote/persistence/cache.py
+from src.common.cache import CacheBackend, LRUCache
+from src.tasknote.settings import TaskNoteSettings
+
+
+def build_cache(settings: TaskNoteSettings, workers: int = 1) -> CacheBackend | None:
+    # the cache is per process and a write only evicts from its own: with several workers, the others would serve
+    # the old row, and answer 304 to its old ETag, until their entry's TTL ran out
+    if not settings.cache_enabled or workers > 1:
+        return None
+    return LRUCache(max_size=settings.cache_max_size, ttl_seconds=settings.cache_ttl_seconds)
@@ -1,14 +1,98 @@
 # src/tasknote/persistence/db.py
-from collections.abc import AsyncGenerator
+import re
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from time import perf_counter
 
-from src.tasknote.settings import settings
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
-engine = create_async_engine(settings.db_url_async, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+from src.common.logger import record_query
+from src.common.settings import BaseServiceSettings
+from src.tasknote.logger import log
+from src.tasknote.metrics import db_query_duration
+from src.tasknote.persistence.pool import InstrumentedAsyncQueuePool
 
+_first_keyword = re.compile(r'\s*(\w+)')
+_statement_types = frozenset({'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'LOCK', 'REFRESH'})
 
-async def get_db_session() -> AsyncGenerator[AsyncSession]:
-    async with AsyncSessionLocal() as session:
-        yield session
+# what normalize_sql replaces, in order: literals and parameters, lists of them (cast or not), then whitespace
+_literals = re.compile(r"'(?:[^']|'')*'|\$\d+|\b\d+(?:\.\d+)?\b")
+_value_lists = re.compile(r'\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)+')
+_whitespace = re.compile(r'\s+')
+
+
+def pool_limits(settings: BaseServiceSettings, workers: int) -> tuple[int, int]:
+    """
+    Pool size and overflow for each of `workers` processes, cut down from the configured ones when needed so that
+    all of them together hold at most `db_max_connections`.
+    """
+    budget = max(settings.db_max_connections // max(workers, 1), 1)
+    pool_size = min(settings.db_pool_size, budget)
+    return pool_size, min(settings.db_max_overflow, budget - pool_size)
+
+
+def create_engine(settings: BaseServiceSettings, workers: int = 1) -> AsyncEngine:
+    pool_size, max_overflow = pool_limits(settings, workers)
+    engine = create_async_engine(
+        settings.db_url_async,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            # asyncpg's own cache and SQLAlchemy's prepared-statement cache; both must be 0 behind PgBouncer
+            'statement_cache_size': settings.db_statement_cache_size,
+            'prepared_statement_cache_size': settings.db_statement_cache_size,
+        },
+    )
+    instrument(engine, slow_query_seconds=settings.db_slow_query_ms / 1000)
+    return engine
+
+
+def instrument(engine: AsyncEngine, slow_query_seconds: float = 0) -> None:
+    """
+    Time every statement `engine` executes into the query duration histogram, labelled by its first keyword, and
+    into the statement count of the current request. Statements that take `slow_query_seconds` or longer are
+    logged, normalized; 0 logs none.
+    """
+
+    # start times on a stack per connection, as in SQLAlchemy's own query profiling recipe
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def _started(conn, *_):
+        conn.info.setdefault('query_started', []).append(perf_counter())
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def _finished(conn, _cursor, statement, *_):
+        _record(statement, perf_counter() - conn.info['query_started'].pop())
+
+    @event.listens_for(engine.sync_engine, 'handle_error')
+    def _failed(context):
+        started = context.connection.info.get('query_started') if context.connection is not None else None
+        if started:
+            _record(context.statement or '', perf_counter() - started.pop())
+
+    def _record(statement: str, elapsed: float) -> None:
+        db_query_duration.observe(elapsed, _statement_type(statement))
+        record_query(elapsed)
+        if slow_query_seconds and elapsed >= slow_query_seconds:
+            log.warning('Slow query', statement=normalize_sql(statement), duration_ms=round(elapsed * 1000, 3))
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    `statement` with its literals and parameters replaced by `?` and each list of them by one, on a single line,
+    so that every execution of the same query logs the same text.
+    """
+    statement = _literals.sub('?', statement)
+    statement = _value_lists.sub('?', statement)
+    return _whitespace.sub(' ', statement).strip()
+
+
+def _statement_type(statement: str) -> str:
+    # a fixed set of label values, whatever the statement
+    match = _first_keyword.match(statement)
+    keyword = match.group(1).upper() if match else ''
+    return keyword if keyword in _statement_types else 'OTHER'
@@ -1,9 +1,24 @@
 # src/tasknote/persistence/entities.py
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import DateTime, Enum, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from ..constants import search_config
 from ..domain.models import TaskStatus
 
 
@@ -18,6 +33,23 @@ class NoteEntity(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('1'))
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{search_config}', title), 'A') || "
+            f"setweight(to_tsvector('{search_config}', coalesce(content, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    )
+
+    __table_args__ = (Index('ix_notes_search_vector', 'search_vector', postgresql_using='gin'),)
+
+
+# tasks still to be done; kept as literal SQL so queries repeat the partial index's predicate
+# word for word, which is what lets the planner use that index even for prepared statements
+open_task_condition = text("status NOT IN ('COMPLETED', 'CANCELLED')")
 
 
 class TaskEntity(Base):
@@ -31,3 +63,99 @@ class TaskEntity(Base):
     due_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), nullable=False, default=TaskStatus.NEW)
+    # bumped by every update; an update naming the version it read fails rather than overwrite a newer one
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('1'))
+
+    # one (key, id) index per filterable or sortable column: each serves both the filter and the
+    # keyset order that ends on the id, scanned backwards for the descending sorts
+    __table_args__ = (
+        Index('ix_tasks_due_date_open', 'due_date', 'id', postgresql_where=open_task_condition),
+        Index('ix_tasks_status_id', 'status', 'id'),
+        Index('ix_tasks_due_date_id', 'due_date', 'id'),
+        Index('ix_tasks_priority_id', 'priority', 'id'),
+    )
+
+
+class TagEntity(Base):
+    __tablename__ = 'tags'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(63), nullable=False, unique=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+# the composite primary keys serve owner -> tags lookups, the reverse indexes serve tag -> owners filters
+
+
+class NoteTagEntity(Base):
+    __tablename__ = 'note_tags'
+
+    note_id: Mapped[int] = mapped_column(ForeignKey('notes.id', ondelete='CASCADE'), primary_key=True)
+    tag_id: Mapped[int] = mapped_column(ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+
+    __table_args__ = (Index('ix_note_tags_tag_id_note_id', 'tag_id', 'note_id'),)
+
+
+class TaskTagEntity(Base):
+    __tablename__ = 'task_tags'
+
+    task_id: Mapped[int] = mapped_column(ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True)
+    tag_id: Mapped[int] = mapped_column(ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+
+    __table_args__ = (Index('ix_task_tags_tag_id_task_id', 'tag_id', 'task_id'),)
+
+
+# analytics rollups, folded from the deltas below and rebuilt by the reconciliation job; days are calendar days
+# in IST, the zone the service stamps its timestamps in
+
+
+class TaskDailyCountEntity(Base):
+    __tablename__ = 'task_daily_counts'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class TaskStatusCountEntity(Base):
+    __tablename__ = 'task_status_counts'
+
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class NoteDailyCountEntity(Base):
+    __tablename__ = 'note_daily_counts'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+# what each task/note write adds to or takes from the rollups, one row per row written: writers only append, so
+# they never wait on each other for a shared counter row, and the fold job moves the deltas into the rollups
+
+
+class TaskCountDeltaEntity(Base):
+    __tablename__ = 'task_count_deltas'
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    created_day: Mapped[date] = mapped_column(Date, nullable=False)
+    completed_day: Mapped[date] = mapped_column(Date, nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), nullable=False)
+    # 1 for a task counted in, -1 for one counted out
+    sign: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+
+class NoteCountDeltaEntity(Base):
+    __tablename__ = 'note_count_deltas'
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    sign: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+
+class ViewRefreshEntity(Base):
+    __tablename__ = 'view_refreshes'
+
+    name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,20 +1,28 @@
 # src/tasknote/persistence/mappers.py
+from sqlalchemy import Row
+
 from src.tasknote.domain.models import Note
 from src.tasknote.persistence.entities import NoteEntity
 
+# the columns to_domain reads; reads and RETURNING select these so the search vector stays in the database
+columns = (NoteEntity.id, NoteEntity.title, NoteEntity.content, NoteEntity.created_at, NoteEntity.version)
+
 
-def to_domain(entity: NoteEntity) -> Note:
+def to_domain(entity: NoteEntity | Row, tags: list[str] | None = None) -> Note:
+    # reads hand in Core rows of the table's columns; both expose the columns as attributes
     return Note(
         id=entity.id,
         title=entity.title,
         content=entity.content,
         created_at=entity.created_at,
+        tags=tags or [],
+        version=entity.version,
     )
 
 
-def to_entity(model: Note) -> NoteEntity:
-    return NoteEntity(
-        title=model.title,
-        content=model.content,
-        created_at=model.created_at,
-    )
+def to_values(model: Note) -> dict:
+    return {
+        'title': model.title,
+        'content': model.content,
+        'created_at': model.created_at,
+    }
@@ -0,0 +1,20 @@
+# src/tasknote/persistence/mappers/tags.py
+from sqlalchemy import Row
+
+from src.tasknote.domain.models import Tag
+from src.tasknote.persistence.entities import TagEntity
+
+
+def to_domain(entity: TagEntity | Row) -> Tag:
+    return Tag(
+        id=entity.id,
+        name=entity.name,
+        created_at=entity.created_at,
+    )
+
+
+def to_values(model: Tag) -> dict:
+    return {
+        'name': model.name,
+        'created_at': model.created_at,
+    }
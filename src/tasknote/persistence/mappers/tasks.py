@@ -1,9 +1,12 @@
 # src/tasknote/persistence/mappers/tasks.py
+from sqlalchemy import Row
+
 from src.tasknote.domain.models import Task
 from src.tasknote.persistence.entities import TaskEntity
 
 
-def to_domain(entity: TaskEntity) -> Task:
+def to_domain(entity: TaskEntity | Row, tags: list[str] | None = None) -> Task:
+    # reads hand in Core rows of the table's columns; both expose the columns as attributes
     return Task(
         id=entity.id,
         title=entity.title,
@@ -13,16 +16,18 @@ def to_domain(entity: TaskEntity) -> Task:
         due_date=entity.due_date,
         completed_at=entity.completed_at,
         status=entity.status,
+        tags=tags or [],
+        version=entity.version,
     )
 
 
-def to_entity(model: Task) -> TaskEntity:
-    return TaskEntity(
-        title=model.title,
-        created_at=model.created_at,
-        description=model.description,
-        priority=model.priority,
-        due_date=model.due_date,
-        completed_at=model.completed_at,
-        status=model.status,
-    )
+def to_values(model: Task) -> dict:
+    return {
+        'title': model.title,
+        'created_at': model.created_at,
+        'description': model.description,
+        'priority': model.priority,
+        'due_date': model.due_date,
+        'completed_at': model.completed_at,
+        'status': model.status,
+    }
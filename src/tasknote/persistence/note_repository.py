@@ -1,40 +1,204 @@
 # src/tasknote/persistence/repository.py
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncIterator
+from typing import Any
 
+from sqlalchemy import ColumnElement, Float, Row, Select, delete, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.common.cache import CacheBackend
 from src.tasknote.persistence.mappers import notes
 
-from ..domain.exceptions import NoteNotFoundError
-from ..domain.models import Note
-from ..persistence.entities import NoteEntity
+from ..constants import search_config, stream_batch_size
+from ..domain.exceptions import NoteNotFoundError, TagNotFoundError, VersionConflictError
+from ..domain.models import Note, Page
+from ..persistence.entities import NoteEntity, NoteTagEntity
+from ..persistence.pagination import decode_cursor, encode_cursor
+from ..persistence.rollups import count_notes
+from ..persistence.tagging import add_tag, load_tags, tagged
 
 
 class NotesRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: CacheBackend | None = None):
         self.session = session
+        self.cache = cache
 
     async def add_note(self, note: Note) -> Note:
-        note_orm = notes.to_entity(note)
-        self.session.add(note_orm)
+        # RETURNING hands back the generated id with the insert itself, no refresh needed, and the rollup
+        # deltas go in with it
+        result = await self.session.execute(_counted_insert([notes.to_values(note)]))
+        created = notes.to_domain(result.one())
+        await self.session.commit()
+        return created
+
+    async def add_notes(self, new_notes: list[Note]) -> list[Note]:
+        if not new_notes:
+            return []
+        # the whole batch in one multi-row INSERT ... RETURNING, together with its rollup deltas
+        result = await self.session.execute(_counted_insert([notes.to_values(note) for note in new_notes]))
+        created = [notes.to_domain(row) for row in result.all()]
         await self.session.commit()
-        await self.session.refresh(note_orm)
-        return notes.to_domain(note_orm)
+        return created
+
+    async def get_page(self, limit: int, after: str | None = None) -> Page[Note]:
+        # selecting the table's columns yields plain rows, so no tracked NoteEntity is built per row
+        result = await self.session.execute(_page_query(select(*notes.columns), limit, after))
+        rows = result.all()
+        items = await self._to_domain(self.session, rows[:limit])
+        next_cursor = encode_cursor(items[-1].id) if len(rows) > limit else None
+        return Page(items, next_cursor)
+
+    async def get_page_versions(self, limit: int, after: str | None = None) -> Page[Row]:
+        """
+        The ids and versions of the page `get_page` would return, and its next cursor, without the notes' contents
+        or their tags.
+        """
+        result = await self.session.execute(_page_query(select(NoteEntity.id, NoteEntity.version), limit, after))
+        rows = result.all()
+        return Page(rows[:limit], encode_cursor(rows[limit - 1].id) if len(rows) > limit else None)
+
+    async def search(
+        self, text: str | None, limit: int, after: str | None = None, tag: str | None = None
+    ) -> Page[Note]:
+        result = await self.session.execute(_search_query(select(*notes.columns), text, limit, after, tag))
+        rows = result.all()
+        items = await self._to_domain(self.session, rows[:limit])
+        next_cursor = encode_cursor(rows[limit - 1].rank, rows[limit - 1].id) if len(rows) > limit else None
+        return Page(items, next_cursor)
 
-    async def get_all(self) -> list[Note]:
-        result = await self.session.execute(select(NoteEntity))
-        return [notes.to_domain(row) for row in result.scalars().all()]
+    async def search_versions(
+        self, text: str | None, limit: int, after: str | None = None, tag: str | None = None
+    ) -> Page[Row]:
+        """
+        The ids and versions of the page `search` would return, and its next cursor, without the notes' contents or
+        their tags.
+        """
+        stmt = _search_query(select(NoteEntity.id, NoteEntity.version), text, limit, after, tag)
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        next_cursor = encode_cursor(rows[limit - 1].rank, rows[limit - 1].id) if len(rows) > limit else None
+        return Page(rows[:limit], next_cursor)
+
+    def stream(self, after: str | None = None) -> AsyncIterator[Note]:
+        # the cursor is decoded here, so a bad one fails before any row is streamed
+        stmt = select(*notes.columns).order_by(NoteEntity.id).execution_options(yield_per=stream_batch_size)
+        if after is not None:
+            (last_id,) = decode_cursor(after, int)
+            stmt = stmt.where(NoteEntity.id > last_id)
+        return self._stream(stmt)
+
+    async def _stream(self, stmt) -> AsyncIterator[Note]:
+        # a dedicated connection keeps the server-side cursor open for as long as the
+        # consumer iterates, independent of the request-scoped session
+        async with self.session.bind.connect() as conn:
+            result = await conn.stream(stmt)
+            async for rows in result.partitions():
+                for note in await self._to_domain(conn, rows):
+                    yield note
 
     async def get_note(self, note_id) -> Note:
-        result = await self.session.execute(select(NoteEntity).where(NoteEntity.id == note_id))
-        note_orm = result.scalars().first()
-        if note_orm is None:
+        since = None
+        if self.cache is not None:
+            cached = await self.cache.get(_cache_key(note_id))
+            if cached is not None:
+                return cached
+            # an update or delete that commits while this reads is not undone by caching what was read
+            since = self.cache.stamp()
+        result = await self.session.execute(select(*notes.columns).where(NoteEntity.id == note_id))
+        row = result.first()
+        if row is None:
             raise NoteNotFoundError(note_id)
-        return notes.to_domain(note_orm)
+        (note,) = await self._to_domain(self.session, [row])
+        if self.cache is not None:
+            await self.cache.set(_cache_key(note_id), note, since)
+        return note
+
+    async def update_note(self, note_id: int, changes: dict[str, Any], expected_version: int | None = None) -> Note:
+        # one UPDATE ... RETURNING writing only the given columns, no read-modify-write
+        table = NoteEntity.__table__
+        stmt = update(table).where(table.c.id == note_id).values(**changes, version=table.c.version + 1)
+        if expected_version is not None:
+            stmt = stmt.where(table.c.version == expected_version)
+        result = await self.session.execute(stmt.returning(*notes.columns))
+        row = result.first()
+        if row is None:
+            # nothing matched: tell a missing note from one that moved past the expected version
+            version = await self.session.scalar(select(NoteEntity.version).where(NoteEntity.id == note_id))
+            await self.session.rollback()
+            if version is None:
+                raise NoteNotFoundError(note_id)
+            raise VersionConflictError(note_id, expected_version, version)
+        await self.session.commit()
+        await self._invalidate(note_id)
+        (note,) = await self._to_domain(self.session, [row])
+        return note
 
     async def delete_note(self, note_id) -> None:
-        result = await self.session.execute(select(NoteEntity).where(NoteEntity.id == note_id))
-        note_orm = result.scalars().first()
-        if note_orm is None:
+        result = await self.session.execute(_counted_delete(NoteEntity.id == note_id))
+        deleted = result.all()
+        await self.session.commit()
+        await self._invalidate(note_id)
+        if not deleted:
             raise NoteNotFoundError(note_id)
-        await self.session.delete(note_orm)
+
+    async def add_tag(self, note_id: int, tag_id: int) -> None:
+        note_found, tag_found = await add_tag(self.session, NoteEntity.id, NoteTagEntity.note_id, note_id, tag_id)
+        if not (note_found and tag_found):
+            await self.session.rollback()
+            raise NoteNotFoundError(note_id) if not note_found else TagNotFoundError(tag_id)
         await self.session.commit()
+        await self._invalidate(note_id)
+
+    @staticmethod
+    async def _to_domain(executor: AsyncSession | AsyncConnection, rows: list[Row]) -> list[Note]:
+        # the tags of all the rows come in one IN query
+        note_tags = await load_tags(executor, NoteTagEntity.note_id, (row.id for row in rows))
+        return [notes.to_domain(row, note_tags.get(row.id)) for row in rows]
+
+    async def _invalidate(self, *note_ids) -> None:
+        if self.cache is not None:
+            await self.cache.delete(*(_cache_key(note_id) for note_id in note_ids))
+
+
+def _cache_key(note_id) -> str:
+    return f'note:{note_id}'
+
+
+def _page_query(stmt: Select, limit: int, after: str | None) -> Select:
+    # one extra row tells whether another page follows
+    stmt = stmt.order_by(NoteEntity.id).limit(limit + 1)
+    if after is not None:
+        (last_id,) = decode_cursor(after, int)
+        stmt = stmt.where(NoteEntity.id > last_id)
+    return stmt
+
+
+def _search_query(stmt: Select, text: str | None, limit: int, after: str | None, tag: str | None) -> Select:
+    # @@ is answered from the GIN index on search_vector; matches come best-ranked first,
+    # the id breaks ties so (rank, id) orders them totally and serves as the keyset
+    if text is not None:
+        query = func.websearch_to_tsquery(search_config, text)
+        rank = func.ts_rank_cd(NoteEntity.search_vector, query).label('rank')
+        stmt = stmt.where(NoteEntity.search_vector.op('@@')(query))
+    else:
+        # filtering by tag alone ranks every match the same, which leaves the id to order them
+        rank = literal(0.0, Float).label('rank')
+    if tag is not None:
+        stmt = stmt.where(tagged(NoteEntity.id, NoteTagEntity.note_id, tag))
+    stmt = stmt.add_columns(rank).order_by(rank.desc(), NoteEntity.id.desc()).limit(limit + 1)
+    if after is not None:
+        last_rank, last_id = decode_cursor(after, float, int)
+        stmt = stmt.where(tuple_(rank, NoteEntity.id) < tuple_(last_rank, last_id))
+    return stmt
+
+
+def _counted_insert(values: list[dict]) -> Select:
+    # one multi-row INSERT ... RETURNING; the ids are drawn in the order the rows are given, so ordering by them
+    # hands the rows back in that order
+    inserted = insert(NoteEntity.__table__).values(values).returning(*notes.columns).cte('inserted')
+    return select(inserted).add_cte(count_notes(1, inserted.c.created_at)).order_by(inserted.c.id)
+
+
+def _counted_delete(condition: ColumnElement[bool]) -> Select:
+    deleted = delete(NoteEntity).where(condition).returning(NoteEntity.id, NoteEntity.created_at).cte('deleted')
+    return select(deleted.c.id).add_cte(count_notes(-1, deleted.c.created_at))
@@ -0,0 +1,33 @@
+# src/tasknote/persistence/pagination.py
+import base64
+import binascii
+import json
+
+from typing import Any
+
+from ..domain.exceptions import InvalidCursorError
+
+
+def encode_cursor(*keys: Any) -> str:
+    """
+    Encode the keyset values of the last row of a page into an opaque, URL-safe cursor.
+    """
+    raw = json.dumps(list(keys), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, *types: type | tuple[type, ...]) -> list[Any]:
+    """
+    Decode a cursor produced by `encode_cursor`, checking it carries one value of each of `types`;
+    a tuple of types accepts any of them, e.g. `(int, NoneType)` for a nullable key.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        keys = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(keys, list) or len(keys) != len(types):
+        raise InvalidCursorError(cursor)
+    if not all(isinstance(key, type_) for key, type_ in zip(keys, types, strict=True)):
+        raise InvalidCursorError(cursor)
+    return keys
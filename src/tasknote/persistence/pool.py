@@ -0,0 +1,60 @@
+# src/tasknote/persistence/pool.py
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    checkout_time_total_ms: float
+    checkout_time_max_ms: float
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts take: waiting for a free connection, or opening one, plus the
+    pre-ping. Only checkouts that hand out a connection are counted and timed; timeouts are counted on their own.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_time_total = 0.0
+        self.checkout_time_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        took = perf_counter() - start
+        self.checkouts += 1
+        self.checkout_time_total += took
+        self.checkout_time_max = max(self.checkout_time_max, took)
+        return connection
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            # overflow() counts up from -size, so it is negative until the pool is full
+            overflow=max(self.overflow(), 0),
+            max_overflow=self._max_overflow,
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            checkout_time_total_ms=round(self.checkout_time_total * 1000, 3),
+            checkout_time_max_ms=round(self.checkout_time_max * 1000, 3),
+        )
@@ -0,0 +1,96 @@
+# src/tasknote/persistence/rollups.py
+from typing import Any
+
+from sqlalchemy import CTE, Date, Select, Subquery, cast, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+
+from src.common.timeutils import IST
+
+from ..persistence.entities import (
+    NoteCountDeltaEntity,
+    NoteDailyCountEntity,
+    TaskCountDeltaEntity,
+    TaskDailyCountEntity,
+    TaskStatusCountEntity,
+)
+
+
+def day_column(column: Any) -> Any:
+    """
+    The rollup day of a timestamp column: its calendar day in IST.
+    """
+    return cast(func.timezone(IST.key, column), Date)
+
+
+def task_delta(sign: int, created_at: Any, completed_at: Any, status: Any) -> Select:
+    """
+    The rollup deltas of the task rows the columns come from: `sign` 1 counts them in, -1 counts them out.
+    """
+    return select(
+        day_column(created_at).label('created_day'),
+        day_column(completed_at).label('completed_day'),
+        status.label('status'),
+        literal(sign).label('sign'),
+    )
+
+
+def count_tasks(*deltas: Select) -> CTE:
+    """
+    An INSERT of the `task_delta`s, as a CTE for the write statement they select from, so the counting costs no
+    round trip of its own and commits or rolls back with the write.
+    """
+    rows = deltas[0] if len(deltas) == 1 else union_all(*deltas)
+    columns = ['created_day', 'completed_day', 'status', 'sign']
+    return insert(TaskCountDeltaEntity).from_select(columns, rows).cte('count_tasks')
+
+
+def count_notes(sign: int, created_at: Any) -> CTE:
+    """
+    An INSERT of the rollup deltas of the note rows `created_at` comes from, as a CTE for the write statement.
+    """
+    rows = select(day_column(created_at), literal(sign))
+    return insert(NoteCountDeltaEntity).from_select(['day', 'sign'], rows).cte('count_notes')
+
+
+# the rollups as of now: the folded counts plus the deltas not yet folded, which the fold job keeps few
+
+
+def task_days() -> Subquery:
+    deltas = TaskCountDeltaEntity
+    counts = union_all(
+        select(TaskDailyCountEntity.day, TaskDailyCountEntity.created, TaskDailyCountEntity.completed),
+        select(deltas.created_day, deltas.sign, literal(0)),
+        select(deltas.completed_day, literal(0), deltas.sign).where(deltas.completed_day.is_not(None)),
+    ).subquery()
+    created, completed = func.sum(counts.c.created), func.sum(counts.c.completed)
+    return (
+        select(counts.c.day, created.label('created'), completed.label('completed'))
+        .group_by(counts.c.day)
+        .having(or_(created != 0, completed != 0))
+        .subquery('task_days')
+    )
+
+
+def task_statuses() -> Subquery:
+    counts = union_all(
+        select(TaskStatusCountEntity.status, TaskStatusCountEntity.count),
+        select(TaskCountDeltaEntity.status, TaskCountDeltaEntity.sign),
+    ).subquery()
+    count = func.sum(counts.c.count)
+    return (
+        select(counts.c.status, count.label('count'))
+        .group_by(counts.c.status)
+        .having(count != 0)
+        .subquery('task_statuses')
+    )
+
+
+def note_days() -> Subquery:
+    counts = union_all(
+        select(NoteDailyCountEntity.day, NoteDailyCountEntity.created),
+        select(NoteCountDeltaEntity.day, NoteCountDeltaEntity.sign),
+    ).subquery()
+    created = func.sum(counts.c.created)
+    return (
+        select(counts.c.day, created.label('created')).group_by(counts.c.day).having(created != 0).subquery('note_days')
+    )
@@ -0,0 +1,76 @@
+# src/tasknote/persistence/tagging.py
+from collections.abc import Iterable
+
+from sqlalchemy import ColumnElement, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from ..persistence.entities import TagEntity
+
+
+def tagged(
+    owner_id: InstrumentedAttribute[int], owner_key: InstrumentedAttribute[int], tag: str
+) -> ColumnElement[bool]:
+    """
+    Filter on `owner_id` for owners carrying the tag named `tag`, where `owner_key` is the owner column of the
+    association table. It resolves through the unique tag name and the association's (tag_id, owner) index.
+    """
+    link = owner_key.class_
+    return owner_id.in_(select(owner_key).join(TagEntity, TagEntity.id == link.tag_id).where(TagEntity.name == tag))
+
+
+async def load_tags(
+    executor: AsyncSession | AsyncConnection, owner_key: InstrumentedAttribute[int], owner_ids: Iterable[int]
+) -> dict[int, list[str]]:
+    """
+    Tag names, sorted, of each of `owner_ids`: one IN query for a whole page of owners rather than one per owner.
+    """
+    owner_ids = list(owner_ids)
+    if not owner_ids:
+        return {}
+    link = owner_key.class_
+    stmt = (
+        select(owner_key, TagEntity.name)
+        .join(TagEntity, TagEntity.id == link.tag_id)
+        .where(owner_key.in_(owner_ids))
+        .order_by(owner_key, TagEntity.name)
+    )
+    tags: dict[int, list[str]] = {}
+    for owner_id, name in (await executor.execute(stmt)).all():
+        tags.setdefault(owner_id, []).append(name)
+    return tags
+
+
+async def add_tag(
+    session: AsyncSession,
+    owner_id: InstrumentedAttribute[int],
+    owner_key: InstrumentedAttribute[int],
+    owner: int,
+    tag_id: int,
+) -> tuple[bool, bool]:
+    """
+    Tag `owner` with `tag_id`, where `owner_key` is the owner column of the association table, and bump the owner's
+    version: tags are part of its representation. Tagging twice is a no-op, bar the version. Returns whether the
+    owner and the tag were found; the link is only written when both were.
+    """
+    # one statement: the UPDATE locks the owner row, so a concurrent delete either waits for the link to commit or
+    # has already taken the owner away, and no link ever points at a missing row
+    owners = owner_id.class_
+    touch = (
+        update(owners)
+        .where(owner_id == owner)
+        .values(version=owners.version + 1)
+        .returning(owner_id.label('owner'))
+        .cte('touch_owner')
+    )
+    tag = select(TagEntity.id).where(TagEntity.id == tag_id).cte('found_tag')
+    link = (
+        insert(owner_key.class_)
+        .from_select([owner_key.key, 'tag_id'], select(touch.c.owner, tag.c.id).join_from(touch, tag, true()))
+        .on_conflict_do_nothing()
+        .cte('link')
+    )
+    stmt = select(select(touch.c.owner).exists(), select(tag.c.id).exists()).add_cte(link)
+    owner_found, tag_found = (await session.execute(stmt)).one()
+    return owner_found, tag_found
@@ -0,0 +1,30 @@
+# src/tasknote/persistence/tags_repository.py
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.tasknote.persistence.mappers import tags
+
+from ..domain.exceptions import TagAlreadyExistsError
+from ..domain.models import Tag
+from ..persistence.entities import TagEntity
+
+
+class TagsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_tag(self, tag: Tag) -> Tag:
+        # a taken name inserts nothing, so RETURNING comes back empty instead of raising mid-transaction
+        table = TagEntity.__table__
+        stmt = insert(table).on_conflict_do_nothing(index_elements=[table.c.name]).returning(*table.c)
+        result = await self.session.execute(stmt, tags.to_values(tag))
+        row = result.first()
+        await self.session.commit()
+        if row is None:
+            raise TagAlreadyExistsError(tag.name)
+        return tags.to_domain(row)
+
+    async def get_tags(self) -> list[Tag]:
+        result = await self.session.execute(select(TagEntity.__table__).order_by(TagEntity.name))
+        return [tags.to_domain(row) for row in result.all()]
@@ -1,40 +1,319 @@
 # src/tasknote/persistence/tasks_repository.py
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncIterator
+from datetime import datetime
+from types import NoneType
+from typing import Any
 
+from sqlalchemy import ColumnElement, Row, Select, and_, case, delete, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.common.cache import CacheBackend
 from src.tasknote.persistence.mappers import tasks
 
-from ..domain.exceptions import TaskNotFoundError
-from ..domain.models import Task
-from ..persistence.entities import TaskEntity
+from ..constants import stream_batch_size
+from ..domain.exceptions import InvalidCursorError, TagNotFoundError, TaskNotFoundError, VersionConflictError
+from ..domain.models import Page, Task, TaskFilter, TaskSort, TaskStatus
+from ..persistence.entities import TaskEntity, TaskTagEntity, open_task_condition
+from ..persistence.pagination import decode_cursor, encode_cursor
+from ..persistence.rollups import count_tasks, task_delta
+from ..persistence.tagging import add_tag, load_tags, tagged
 
 
 class TasksRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: CacheBackend | None = None):
         self.session = session
+        self.cache = cache
 
     async def add_task(self, task: Task) -> Task:
-        task_orm = tasks.to_entity(task)
-        self.session.add(task_orm)
+        # RETURNING hands back the generated id with the insert itself, no refresh needed, and the rollup
+        # deltas go in with it
+        result = await self.session.execute(_counted_insert([tasks.to_values(task)]))
+        created = tasks.to_domain(result.one())
+        await self.session.commit()
+        return created
+
+    async def add_tasks(self, new_tasks: list[Task]) -> list[Task]:
+        if not new_tasks:
+            return []
+        # the whole batch in one multi-row INSERT ... RETURNING, together with its rollup deltas
+        result = await self.session.execute(_counted_insert([tasks.to_values(task) for task in new_tasks]))
+        created = [tasks.to_domain(row) for row in result.all()]
         await self.session.commit()
-        await self.session.refresh(task_orm)
-        return tasks.to_domain(task_orm)
+        return created
+
+    async def get_page(
+        self, limit: int, after: str | None = None, filters: TaskFilter | None = None, sort: TaskSort = TaskSort.ID
+    ) -> Page[Task]:
+        # selecting the table's columns yields plain rows, so no tracked TaskEntity is built per row
+        result = await self.session.execute(_page_query(select(TaskEntity.__table__), limit, after, filters, sort))
+        rows = result.all()
+        items = await self._to_domain(self.session, rows[:limit])
+        next_cursor = _encode_sort_cursor(items[-1], sort) if len(rows) > limit else None
+        return Page(items, next_cursor)
+
+    async def get_page_versions(
+        self, limit: int, after: str | None = None, filters: TaskFilter | None = None, sort: TaskSort = TaskSort.ID
+    ) -> Page[Row]:
+        """
+        The ids and versions of the page `get_page` would return, and its next cursor: enough to tell whether a
+        client's copy of the page is current, without reading the tasks' contents or their tags.
+        """
+        key, _ = _sort_keys[sort]
+        columns = [TaskEntity.id, TaskEntity.version] + ([key] if key is not None else [])
+        result = await self.session.execute(_page_query(select(*columns), limit, after, filters, sort))
+        rows = result.all()
+        next_cursor = _encode_sort_cursor(rows[limit - 1], sort) if len(rows) > limit else None
+        return Page(rows[:limit], next_cursor)
 
-    async def get_all(self) -> list[Task]:
-        result = await self.session.execute(select(TaskEntity))
-        return [tasks.to_domain(row) for row in result.scalars().all()]
+    async def get_due_between(self, start: datetime, end: datetime, limit: int) -> list[Task]:
+        # open tasks due in [start, end), soonest first: a range scan of the partial (due_date, id) index
+        stmt = (
+            select(TaskEntity.__table__)
+            .where(open_task_condition, TaskEntity.due_date >= start, TaskEntity.due_date < end)
+            .order_by(TaskEntity.due_date, TaskEntity.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return await self._to_domain(self.session, result.all())
+
+    def stream(
+        self, after: str | None = None, filters: TaskFilter | None = None, sort: TaskSort = TaskSort.ID
+    ) -> AsyncIterator[Task]:
+        # the cursor is decoded here, so a bad one fails before any row is streamed
+        stmt = _filtered(select(TaskEntity.__table__), filters)
+        key, descending = _sort_keys[sort]
+        if after is not None:
+            stmt = stmt.where(_seek(key, descending, *_decode_sort_cursor(after, sort)))
+        stmt = stmt.order_by(*_ordering(key, descending)).execution_options(yield_per=stream_batch_size)
+        return self._stream(stmt)
+
+    async def _stream(self, stmt) -> AsyncIterator[Task]:
+        # a dedicated connection keeps the server-side cursor open for as long as the
+        # consumer iterates, independent of the request-scoped session
+        async with self.session.bind.connect() as conn:
+            result = await conn.stream(stmt)
+            async for rows in result.partitions():
+                for task in await self._to_domain(conn, rows):
+                    yield task
 
     async def get_task(self, task_id) -> Task:
-        result = await self.session.execute(select(TaskEntity).where(TaskEntity.id == task_id))
-        task_orm = result.scalars().first()
-        if task_orm is None:
+        since = None
+        if self.cache is not None:
+            cached = await self.cache.get(_cache_key(task_id))
+            if cached is not None:
+                return cached
+            # an update or delete that commits while this reads is not undone by caching what was read
+            since = self.cache.stamp()
+        result = await self.session.execute(select(TaskEntity.__table__).where(TaskEntity.id == task_id))
+        row = result.first()
+        if row is None:
             raise TaskNotFoundError(task_id)
-        return tasks.to_domain(task_orm)
+        (task,) = await self._to_domain(self.session, [row])
+        if self.cache is not None:
+            await self.cache.set(_cache_key(task_id), task, since)
+        return task
+
+    async def update_task(self, task_id: int, changes: dict[str, Any], expected_version: int | None = None) -> Task:
+        # one UPDATE ... RETURNING writing only the given columns, no read-modify-write
+        rows = await self._update(TaskEntity.id == task_id, changes, expected_version)
+        if not rows:
+            raise await self._update_failure(task_id, expected_version)
+        await self.session.commit()
+        await self._invalidate(task_id)
+        (task,) = await self._to_domain(self.session, rows)
+        return task
+
+    async def complete_tasks(self, task_ids: list[int], completed_at: datetime) -> list[int]:
+        # the whole batch in one statement; missing and already completed tasks are left as they are
+        condition = and_(TaskEntity.id.in_(task_ids), TaskEntity.status != TaskStatus.COMPLETED)
+        rows = await self._update(condition, {'status': TaskStatus.COMPLETED, 'completed_at': completed_at})
+        await self.session.commit()
+        completed = [row.id for row in rows]
+        await self._invalidate(*completed)
+        return completed
+
+    async def _update(
+        self, condition: ColumnElement[bool], changes: dict[str, Any], expected_version: int | None = None
+    ) -> list[Row]:
+        table = TaskEntity.__table__
+        # the rows as they were, for the analytics rollups; FOR UPDATE makes a concurrent update wait and
+        # then read this one's result, so neither counts from a stale status
+        before = select(table.c.id, table.c.status, table.c.completed_at).where(condition).with_for_update().subquery()
+        values = dict(changes)
+        if values.get('status') == TaskStatus.COMPLETED:
+            # completing a completed task again keeps the time it was first completed
+            completed = table.c.status == TaskStatus.COMPLETED
+            values['completed_at'] = case((completed, table.c.completed_at), else_=values.get('completed_at'))
+        stmt = update(table).where(table.c.id == before.c.id).values(**values, version=table.c.version + 1)
+        if expected_version is not None:
+            stmt = stmt.where(table.c.version == expected_version)
+        stmt = stmt.returning(
+            *table.c, before.c.status.label('status_before'), before.c.completed_at.label('completed_at_before')
+        )
+        updated = stmt.cte('updated')
+        # an update counts the row out as it was and back in as it is, when that moves it in the rollups
+        moved = or_(
+            updated.c.status != updated.c.status_before,
+            updated.c.completed_at.is_distinct_from(updated.c.completed_at_before),
+        )
+        counts = count_tasks(
+            task_delta(-1, updated.c.created_at, updated.c.completed_at_before, updated.c.status_before).where(moved),
+            task_delta(1, updated.c.created_at, updated.c.completed_at, updated.c.status).where(moved),
+        )
+        result = await self.session.execute(select(*(updated.c[column.name] for column in table.c)).add_cte(counts))
+        return result.all()
+
+    async def _update_failure(self, task_id: int, expected_version: int | None) -> Exception:
+        # nothing matched: tell a missing task from one that moved past the expected version
+        version = await self.session.scalar(select(TaskEntity.version).where(TaskEntity.id == task_id))
+        await self.session.rollback()
+        if version is None:
+            return TaskNotFoundError(task_id)
+        return VersionConflictError(task_id, expected_version, version)
 
     async def delete_task(self, task_id) -> None:
-        result = await self.session.execute(select(TaskEntity).where(TaskEntity.id == task_id))
-        task_orm = result.scalars().first()
-        if task_orm is None:
+        result = await self.session.execute(_counted_delete(TaskEntity.id == task_id))
+        deleted = result.all()
+        await self.session.commit()
+        await self._invalidate(task_id)
+        if not deleted:
             raise TaskNotFoundError(task_id)
-        await self.session.delete(task_orm)
+
+    async def delete_tasks(self, task_ids: list[int]) -> list[int]:
+        result = await self.session.execute(_counted_delete(TaskEntity.id.in_(task_ids)))
+        deleted = result.all()
         await self.session.commit()
+        await self._invalidate(*task_ids)
+        return [row.id for row in deleted]
+
+    async def add_tag(self, task_id: int, tag_id: int) -> None:
+        task_found, tag_found = await add_tag(self.session, TaskEntity.id, TaskTagEntity.task_id, task_id, tag_id)
+        if not (task_found and tag_found):
+            await self.session.rollback()
+            raise TaskNotFoundError(task_id) if not task_found else TagNotFoundError(tag_id)
+        await self.session.commit()
+        await self._invalidate(task_id)
+
+    @staticmethod
+    async def _to_domain(executor: AsyncSession | AsyncConnection, rows: list[Row]) -> list[Task]:
+        # the tags of all the rows come in one IN query
+        task_tags = await load_tags(executor, TaskTagEntity.task_id, (row.id for row in rows))
+        return [tasks.to_domain(row, task_tags.get(row.id)) for row in rows]
+
+    async def _invalidate(self, *task_ids) -> None:
+        if self.cache is not None:
+            await self.cache.delete(*(_cache_key(task_id) for task_id in task_ids))
+
+
+def _cache_key(task_id) -> str:
+    return f'task:{task_id}'
+
+
+def _counted_insert(values: list[dict]) -> Select:
+    # one multi-row INSERT ... RETURNING; the ids are drawn in the order the rows are given, so ordering by them
+    # hands the rows back in that order
+    table = TaskEntity.__table__
+    inserted = insert(table).values(values).returning(*table.c).cte('inserted')
+    counts = count_tasks(task_delta(1, inserted.c.created_at, inserted.c.completed_at, inserted.c.status))
+    return select(inserted).add_cte(counts).order_by(inserted.c.id)
+
+
+def _counted_delete(condition: ColumnElement[bool]) -> Select:
+    table = TaskEntity.__table__
+    deleted = (
+        delete(table).where(condition).returning(table.c.id, table.c.created_at, table.c.completed_at, table.c.status)
+    ).cte('deleted')
+    counts = count_tasks(task_delta(-1, deleted.c.created_at, deleted.c.completed_at, deleted.c.status))
+    return select(deleted.c.id).add_cte(counts)
+
+
+# sort -> (leading key, descending); None leads with the id itself. Each key has a (key, id) btree
+# index, and the orderings keep PostgreSQL's default NULL placement (last ascending, first descending)
+# so that a page is a plain forward or backward scan of it.
+_sort_keys = {
+    TaskSort.ID: (None, False),
+    TaskSort.ID_DESC: (None, True),
+    TaskSort.DUE_DATE: (TaskEntity.due_date, False),
+    TaskSort.DUE_DATE_DESC: (TaskEntity.due_date, True),
+    TaskSort.PRIORITY: (TaskEntity.priority, False),
+    TaskSort.PRIORITY_DESC: (TaskEntity.priority, True),
+}
+
+
+def _page_query(stmt: Select, limit: int, after: str | None, filters: TaskFilter | None, sort: TaskSort) -> Select:
+    # one extra row tells whether another page follows
+    stmt = _filtered(stmt, filters)
+    key, descending = _sort_keys[sort]
+    if after is not None:
+        stmt = stmt.where(_seek(key, descending, *_decode_sort_cursor(after, sort)))
+    return stmt.order_by(*_ordering(key, descending)).limit(limit + 1)
+
+
+def _filtered(stmt: Select, filters: TaskFilter | None) -> Select:
+    if filters is None:
+        return stmt
+    if filters.status is not None:
+        stmt = stmt.where(TaskEntity.status == filters.status)
+    if filters.priority_min is not None:
+        stmt = stmt.where(TaskEntity.priority >= filters.priority_min)
+    if filters.priority_max is not None:
+        stmt = stmt.where(TaskEntity.priority <= filters.priority_max)
+    if filters.due_after is not None:
+        stmt = stmt.where(TaskEntity.due_date >= filters.due_after)
+    if filters.due_before is not None:
+        stmt = stmt.where(TaskEntity.due_date < filters.due_before)
+    if filters.tag is not None:
+        stmt = stmt.where(tagged(TaskEntity.id, TaskTagEntity.task_id, filters.tag))
+    return stmt
+
+
+def _ordering(key, descending: bool) -> list:
+    columns = [TaskEntity.id] if key is None else [key, TaskEntity.id]
+    return [column.desc() if descending else column.asc() for column in columns]
+
+
+def _seek(key, descending: bool, value, last_id: int) -> ColumnElement[bool]:
+    # rows strictly after (value, last_id) in the page order, NULL keys included where they sort
+    if key is None:
+        return TaskEntity.id < last_id if descending else TaskEntity.id > last_id
+    if value is None:
+        if descending:
+            return or_(and_(key.is_(None), TaskEntity.id < last_id), key.is_not(None))
+        return and_(key.is_(None), TaskEntity.id > last_id)
+    if descending:
+        return tuple_(key, TaskEntity.id) < tuple_(value, last_id)
+    return or_(tuple_(key, TaskEntity.id) > tuple_(value, last_id), key.is_(None))
+
+
+def _encode_sort_cursor(task: Task | Row, sort: TaskSort) -> str:
+    # the plain id cursor stays as it was; every other order names itself, so a cursor is never
+    # replayed against an order it was not made for
+    key, _ = _sort_keys[sort]
+    if key is None:
+        return encode_cursor(task.id) if sort is TaskSort.ID else encode_cursor(sort.value, task.id)
+    value = getattr(task, key.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return encode_cursor(sort.value, value, task.id)
+
+
+def _decode_sort_cursor(cursor: str, sort: TaskSort) -> tuple:
+    key, _ = _sort_keys[sort]
+    if sort is TaskSort.ID:
+        (last_id,) = decode_cursor(cursor, int)
+        return None, last_id
+    if key is None:
+        name, last_id = decode_cursor(cursor, str, int)
+        value = None
+    else:
+        value_type = str if key is TaskEntity.due_date else int
+        name, value, last_id = decode_cursor(cursor, str, (value_type, NoneType), int)
+    if name != sort.value:
+        raise InvalidCursorError(cursor)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError as e:
+            raise InvalidCursorError(cursor) from e
+    return value, last_id
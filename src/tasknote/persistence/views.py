@@ -0,0 +1,98 @@
+# src/tasknote/persistence/views.py
+from datetime import datetime
+
+from sqlalchemy import DDL, Date, Float, Integer, TableClause, column, event, func, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..persistence.entities import Base, ViewRefreshEntity
+
+# Materialized views over the tasks and notes tables, the alternative to the incrementally kept rollups:
+# they cost nothing on writes and lag by up to their refresh interval. Alembic owns them in production;
+# the DDL below is what the migration ran, hooked to the metadata so create_all builds them for tests.
+# REFRESH ... CONCURRENTLY needs a unique index on each of them.
+
+task_daily_stats = table(
+    'mv_task_daily_stats',
+    column('day', Date),
+    column('created', Integer),
+    column('completed', Integer),
+)
+
+note_daily_stats = table(
+    'mv_note_daily_stats',
+    column('day', Date),
+    column('created', Integer),
+)
+
+task_completion = table(
+    'mv_task_completion',
+    column('total_tasks', Integer),
+    column('completed_tasks', Integer),
+    column('completion_rate', Float),
+)
+
+_definitions = {
+    task_daily_stats.name: (
+        """
+        SELECT day, sum(created)::int AS created, sum(completed)::int AS completed
+          FROM (SELECT (created_at AT TIME ZONE 'Asia/Kolkata')::date AS day, 1 AS created, 0 AS completed
+                  FROM tasks
+                UNION ALL
+                SELECT (completed_at AT TIME ZONE 'Asia/Kolkata')::date, 0, 1
+                  FROM tasks WHERE completed_at IS NOT NULL) AS events
+         GROUP BY day
+        """,
+        'day',
+    ),
+    note_daily_stats.name: (
+        """
+        SELECT (created_at AT TIME ZONE 'Asia/Kolkata')::date AS day, count(*)::int AS created
+          FROM notes
+         GROUP BY 1
+        """,
+        'day',
+    ),
+    task_completion.name: (
+        """
+        SELECT 1 AS id,
+               count(*)::int AS total_tasks,
+               count(*) FILTER (WHERE status = 'COMPLETED')::int AS completed_tasks,
+               coalesce(round(avg((status = 'COMPLETED')::int), 4), 0)::float8 AS completion_rate
+          FROM tasks
+        """,
+        'id',
+    ),
+}
+
+materialized_views = tuple(_definitions)
+
+for _name, (_query, _key) in _definitions.items():
+    event.listen(Base.metadata, 'after_create', DDL(f'CREATE MATERIALIZED VIEW {_name} AS {_query}'))
+    event.listen(Base.metadata, 'after_create', DDL(f'CREATE UNIQUE INDEX ux_{_name} ON {_name} ({_key})'))
+    event.listen(Base.metadata, 'before_drop', DDL(f'DROP MATERIALIZED VIEW IF EXISTS {_name}'))
+
+
+async def refresh_view(session: AsyncSession, name: str) -> bool:
+    """
+    Refresh the materialized view `name` without blocking its readers and record when. Returns False, having done
+    nothing, when another process is already refreshing it.
+    """
+    if name not in _definitions:
+        raise ValueError(f'Unknown materialized view: {name}')
+    # with several workers each running the scheduler, one refresh per view at a time is enough
+    locked = await session.scalar(select(func.pg_try_advisory_xact_lock(func.hashtext(name))))
+    if not locked:
+        await session.rollback()
+        return False
+    await session.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {name}'))
+    stmt = insert(ViewRefreshEntity).values(name=name, refreshed_at=func.now())
+    stmt = stmt.on_conflict_do_update(index_elements=[ViewRefreshEntity.name], set_={'refreshed_at': func.now()})
+    await session.execute(stmt)
+    await session.commit()
+    return True
+
+
+async def get_refreshed_at(session: AsyncSession, view: TableClause) -> datetime | None:
+    stmt = select(ViewRefreshEntity.refreshed_at).where(ViewRefreshEntity.name == view.name)
+    return await session.scalar(stmt)
@@ -0,0 +1,262 @@
+# src/tasknote/seed.py
+"""
+Generates large synthetic task and note datasets for benchmarks and capacity planning, and bulk-loads them with
+COPY, batch by batch, into the configured database:
+
+    python -m src.tasknote.seed --tasks 10000000 --notes 10000000
+
+Afterwards it rebuilds the analytics rollups and views, which COPY bypasses.
+"""
+
+import argparse
+import asyncio
+import random
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate, batched
+from time import perf_counter
+
+import asyncpg
+
+from src.common.timeutils import now_ist
+
+from .application.jobs import reconcile_analytics, refresh_view
+from .container import container
+from .domain.models import TaskStatus
+from .logger import configure_logging, log
+from .persistence.entities import NoteEntity, TaskEntity
+from .persistence.views import materialized_views
+
+TASK_COLUMNS = ('title', 'description', 'priority', 'created_at', 'due_date', 'completed_at', 'status')
+NOTE_COLUMNS = ('title', 'content', 'created_at')
+
+# word frequencies in real text fall off roughly as 1/rank (Zipf), which is what makes some search terms match
+# many rows and others a handful; the words are drawn with those weights
+_VOCABULARY = (
+    'the meeting project review team client update plan budget report call email draft design release sprint '
+    'deadline follow notes agenda feedback invoice order doc fix bug test deploy backup server data migration '
+    'hiring onboarding training roadmap quarter goals metrics dashboard customer support ticket renewal contract '
+    'vendor payment tax insurance doctor dentist grocery recipe garden travel flight hotel passport visa birthday '
+    'gift concert movie book podcast workout running yoga cycling kayak hiking plumber electrician laptop printer '
+    'router password license subscription refund warranty appointment school homework parents weekend holiday'
+).split()
+_WORD_WEIGHTS = tuple(accumulate(1 / rank for rank in range(1, len(_VOCABULARY) + 1)))
+
+
+@dataclass
+class SeedProfile:
+    """
+    What the generated rows look like. Mixes are relative weights; day and word ranges include both ends.
+    """
+
+    tasks: int = 0
+    notes: int = 0
+    batch_size: int = 50_000
+    status_mix: dict[TaskStatus, float] = field(
+        default_factory=lambda: {
+            TaskStatus.NEW: 40,
+            TaskStatus.PENDING: 35,
+            TaskStatus.COMPLETED: 20,
+            TaskStatus.CANCELLED: 5,
+        }
+    )
+    # None stands for tasks without a priority
+    priority_mix: dict[int | None, float] = field(default_factory=lambda: {0: 10, 1: 25, 2: 35, 3: 20, 4: 10})
+    # how far back created_at goes, and where due_date falls relative to it
+    created_days: int = 365
+    due_days: tuple[int, int] = (-7, 60)
+    no_due_date: float = 0.2
+    title_words: tuple[int, int] = (2, 8)
+    description_words: tuple[int, int] = (0, 60)
+    content_words: tuple[int, int] = (20, 400)
+    seed: int = 0
+
+
+def parse_mix[K](text: str, key: type[K]) -> dict[K, float]:
+    """
+    `NAME=WEIGHT,...` as weights by key, e.g. `NEW=40,COMPLETED=60`; a `none` name stands for None.
+    """
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[None if name.strip().lower() == 'none' else key(name.strip())] = float(weight)
+    if not mix or any(weight < 0 for weight in mix.values()) or sum(mix.values()) <= 0:
+        raise ValueError(f'weights must be non-negative and not all 0: {text}')
+    return mix
+
+
+def parse_range(text: str) -> tuple[int, int]:
+    """
+    `LOW:HIGH` as a pair, e.g. `-7:60`.
+    """
+    low, _, high = text.partition(':')
+    bounds = int(low), int(high or low)
+    if bounds[0] > bounds[1]:
+        raise ValueError(f'range is empty: {text}')
+    return bounds
+
+
+def parse_share(text: str) -> float:
+    """
+    A fraction between 0 and 1 inclusive, e.g. `0.2`.
+    """
+    share = float(text)
+    if not 0 <= share <= 1:
+        raise ValueError(f'share must be between 0 and 1: {text}')
+    return share
+
+
+def _words(rng: random.Random, bounds: tuple[int, int]) -> str | None:
+    count = rng.randint(*bounds)
+    return ' '.join(rng.choices(_VOCABULARY, cum_weights=_WORD_WEIGHTS, k=count)) if count else None
+
+
+def _picker[K](rng: random.Random, mix: dict[K, float]) -> Iterator[K]:
+    # draws in blocks: one choices() call per 1024 rows instead of one per row
+    keys, cum_weights = list(mix), list(accumulate(mix.values()))
+    while True:
+        yield from rng.choices(keys, cum_weights=cum_weights, k=1024)
+
+
+def task_rows(profile: SeedProfile, now: datetime) -> Iterator[tuple]:
+    """
+    `profile.tasks` tasks as tuples of TASK_COLUMNS. The same profile, seed included, gives the same rows.
+    """
+    rng = random.Random(profile.seed)
+    statuses, priorities = _picker(rng, profile.status_mix), _picker(rng, profile.priority_mix)
+    created_span = profile.created_days * 86400
+    due_low, due_high = (days * 86400 for days in profile.due_days)
+    for i in range(profile.tasks):
+        created_at = now - timedelta(seconds=rng.uniform(0, created_span))
+        status = next(statuses)
+        due_date = None
+        if rng.random() >= profile.no_due_date:
+            due_date = created_at + timedelta(seconds=rng.uniform(due_low, due_high))
+        # finished somewhere between being created and now
+        completed_at = created_at + (now - created_at) * rng.random() if status == TaskStatus.COMPLETED else None
+        title = _words(rng, profile.title_words) or 'task'
+        yield (
+            f'{title} {i}',
+            _words(rng, profile.description_words),
+            next(priorities),
+            created_at,
+            due_date,
+            completed_at,
+            status.value,
+        )
+
+
+def note_rows(profile: SeedProfile, now: datetime) -> Iterator[tuple]:
+    """
+    `profile.notes` notes as tuples of NOTE_COLUMNS. The same profile, seed included, gives the same rows.
+    """
+    # a different stream from the tasks', so that changing the task count leaves the notes as they were
+    rng = random.Random(profile.seed + 1)
+    created_span = profile.created_days * 86400
+    for i in range(profile.notes):
+        title = _words(rng, profile.title_words) or 'note'
+        created_at = now - timedelta(seconds=rng.uniform(0, created_span))
+        yield f'{title} {i}', _words(rng, profile.content_words), created_at
+
+
+async def copy_rows(
+    connection: asyncpg.Connection, table: str, columns: tuple[str, ...], rows: Iterator[tuple], batch_size: int
+) -> int:
+    """
+    Load `rows` into `table` with one COPY per batch of `batch_size`, each committed on its own. The next batch is
+    generated on a worker thread while the database takes in the current one. Returns the number of rows loaded.
+    """
+    batches = batched(rows, batch_size)
+    loaded = 0
+    start = perf_counter()
+    pending = asyncio.create_task(asyncio.to_thread(next, batches, None))
+    while (batch := await pending) is not None:
+        pending = asyncio.create_task(asyncio.to_thread(next, batches, None))
+        await connection.copy_records_to_table(table, records=batch, columns=columns)
+        loaded += len(batch)
+        elapsed = perf_counter() - start
+        log.info('Copied batch', table=table, rows=loaded, rows_per_second=round(loaded / elapsed))
+    return loaded
+
+
+async def seed(profile: SeedProfile, analytics: bool = True) -> dict[str, int]:
+    """
+    Generate and load the rows `profile` describes, then, with `analytics`, bring the rollups and views, which COPY
+    bypasses, up to date.
+    """
+    now = now_ist()
+    loaded = {}
+    try:
+        async with container.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            for table, columns, rows, count in (
+                (TaskEntity.__tablename__, TASK_COLUMNS, task_rows(profile, now), profile.tasks),
+                (NoteEntity.__tablename__, NOTE_COLUMNS, note_rows(profile, now), profile.notes),
+            ):
+                if count:
+                    loaded[table] = await copy_rows(raw.driver_connection, table, columns, rows, profile.batch_size)
+        if analytics and loaded:
+            await reconcile_analytics()
+            for name in materialized_views:
+                await refresh_view(name)
+    finally:
+        await container.dispose()
+    return loaded
+
+
+def main() -> None:
+    defaults = SeedProfile()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=0, help='tasks to generate')
+    parser.add_argument('--notes', type=int, default=0, help='notes to generate')
+    parser.add_argument('--batch-size', type=int, default=defaults.batch_size, help='rows per COPY')
+    parser.add_argument(
+        '--status-mix',
+        type=lambda text: parse_mix(text, TaskStatus),
+        default=defaults.status_mix,
+        help='weights of the task statuses, e.g. NEW=40,PENDING=35,COMPLETED=20,CANCELLED=5',
+    )
+    parser.add_argument(
+        '--priority-mix',
+        type=lambda text: parse_mix(text, int),
+        default=defaults.priority_mix,
+        help='weights of the task priorities, none for no priority, e.g. 0=10,1=25,2=35,3=20,4=10,none=5',
+    )
+    parser.add_argument('--created-days', type=int, default=defaults.created_days, help='how far back tasks go')
+    parser.add_argument(
+        '--due-days', type=parse_range, default=defaults.due_days, help='due date in days after creation, LOW:HIGH'
+    )
+    parser.add_argument(
+        '--no-due-date', type=parse_share, default=defaults.no_due_date, help='share of tasks without one, 0 to 1'
+    )
+    parser.add_argument('--title-words', type=parse_range, default=defaults.title_words, help='LOW:HIGH')
+    parser.add_argument('--description-words', type=parse_range, default=defaults.description_words, help='LOW:HIGH')
+    parser.add_argument('--content-words', type=parse_range, default=defaults.content_words, help='LOW:HIGH')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='the same seed generates the same rows')
+    parser.add_argument('--skip-analytics', action='store_true', help='leave the rollups and views for their jobs')
+    args = parser.parse_args()
+
+    profile = SeedProfile(
+        tasks=args.tasks,
+        notes=args.notes,
+        batch_size=args.batch_size,
+        status_mix=args.status_mix,
+        priority_mix=args.priority_mix,
+        created_days=args.created_days,
+        due_days=args.due_days,
+        no_due_date=args.no_due_date,
+        title_words=args.title_words,
+        description_words=args.description_words,
+        content_words=args.content_words,
+        seed=args.seed,
+    )
+    configure_logging()
+    start = perf_counter()
+    loaded = asyncio.run(seed(profile, analytics=not args.skip_analytics))
+    log.info('Seeded', **loaded, seconds=round(perf_counter() - start, 1))
+
+
+if __name__ == '__main__':
+    main()
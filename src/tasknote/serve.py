@@ -0,0 +1,102 @@
+# src/tasknote/serve.py
+"""
+Production entry point: serves the app from several worker processes.
+
+    python -m src.tasknote.serve
+"""
+
+import math
+import os
+import shutil
+import tempfile
+
+from importlib.util import find_spec
+from pathlib import Path
+
+import uvicorn
+
+from .constants import metrics_dir_env, workers_env
+from .logger import configure_logging, log
+from .persistence.db import pool_limits
+from .settings import TaskNoteSettings, get_settings
+
+# the cgroup of this process as a container sees it, through its own cgroup namespace
+_cgroup = Path('/sys/fs/cgroup')
+
+
+def available_cpus(cgroup: Path = _cgroup) -> int:
+    """
+    The CPUs this process may run on, cut down to its cgroup's CPU quota rounded up: a container limited to 2 CPUs
+    on a 64-core host gets 2, where os.cpu_count() would say 64.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    quota = _cpu_quota(cgroup)
+    return cpus if quota is None else max(1, min(cpus, math.ceil(quota)))
+
+
+def _cpu_quota(cgroup: Path) -> float | None:
+    # cgroup v2 has "<quota> <period>" in cpu.max, v1 splits them over two files; no quota reads as max or -1
+    try:
+        if (cgroup / 'cpu.max').exists():
+            quota, period = (cgroup / 'cpu.max').read_text().split()
+        else:
+            quota = (cgroup / 'cpu' / 'cpu.cfs_quota_us').read_text().strip()
+            period = (cgroup / 'cpu' / 'cpu.cfs_period_us').read_text().strip()
+        if quota in ('max', '-1'):
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        return None
+
+
+def worker_count(settings: TaskNoteSettings) -> int:
+    workers = settings.server_workers or available_cpus()
+    # every worker needs a connection of its own, so more of them than db_max_connections would overrun it
+    if workers > settings.db_max_connections:
+        log.warning('Capping workers at db_max_connections', workers=workers, max=settings.db_max_connections)
+        workers = settings.db_max_connections
+    return workers
+
+
+def event_loop() -> str:
+    # uvloop and httptools come with uvicorn[standard], which the service depends on; where they do not install,
+    # e.g. uvloop on Windows, uvicorn's pure-Python defaults still work
+    return 'uvloop' if find_spec('uvloop') else 'asyncio'
+
+
+def http_protocol() -> str:
+    return 'httptools' if find_spec('httptools') else 'h11'
+
+
+def main() -> None:
+    configure_logging()
+    settings = get_settings()
+    workers = worker_count(settings)
+    # the workers are fresh interpreters that inherit the environment; each sizes its pool from this
+    os.environ[workers_env] = str(workers)
+    # and share their metrics through files here, one per worker, for /metrics to add up
+    metrics_dir = tempfile.mkdtemp(prefix='tasknote-metrics-') if workers > 1 else None
+    if metrics_dir is not None:
+        os.environ[metrics_dir_env] = metrics_dir
+    pool_size, max_overflow = pool_limits(settings, workers)
+    loop, http = event_loop(), http_protocol()
+    log.info('Starting server', workers=workers, loop=loop, http=http, pool_size=pool_size, max_overflow=max_overflow)
+    # on SIGTERM each worker stops accepting connections, lets in-flight requests finish for up to the graceful
+    # timeout, then runs the lifespan shutdown, which stops the jobs and closes the pool
+    try:
+        uvicorn.run(
+            'src.tasknote.main:app',
+            host=settings.server_host,
+            port=settings.server_port,
+            workers=workers,
+            loop=loop,
+            http=http,
+            timeout_graceful_shutdown=settings.server_graceful_timeout_seconds,
+        )
+    finally:
+        if metrics_dir is not None:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,77 @@
 # src/tasknote/settings.py
+from functools import cache
 from pathlib import Path
 
+from pydantic import Field, SecretStr
+
 from src.common.config_loader import load_config_for
 from src.common.settings import BaseServiceSettings
-from src.tasknote.constants import service_name
+from src.tasknote.constants import (
+    insert_fixed_parameters,
+    max_bind_parameters,
+    max_insert_columns,
+    service_name,
+)
+
+
+class TaskNoteSettings(BaseServiceSettings):
+    # rows per bulk request; capped so that the batch's INSERT stays within the bind parameter limit
+    bulk_max_batch_size: int = Field(
+        1000, ge=1, le=(max_bind_parameters - insert_fixed_parameters) // max_insert_columns
+    )
+
+    # read-through cache for single task/note lookups, per process; off when serving with several workers
+    cache_enabled: bool = True
+    cache_max_size: int = 10_000
+    cache_ttl_seconds: float = 30.0
+
+    # GET /tasks, /notes, /notes/search and /tasks/due-soon validate every row against the response schema, as
+    # response_model does; true renders the rows, which come from our own repositories, without that check
+    fast_list_responses: bool = False
+
+    # default look-ahead of GET /tasks/due-soon
+    due_soon_window_hours: int = 24
+
+    # how often the analytics rollups are rebuilt from the tables; 0 turns the job off
+    analytics_reconcile_interval_seconds: float = 3600.0
+    # how often the deltas task/note writes append are folded into the analytics rollups; the reconcile folds them
+    # too, so 0 leaves that to it
+    analytics_fold_interval_seconds: float = 5.0
+
+    # seconds between CONCURRENTLY refreshes of each analytics materialized view; 0 leaves a view unrefreshed
+    view_refresh_seconds: dict[str, float] = Field(
+        default_factory=lambda: {'mv_task_daily_stats': 300.0, 'mv_note_daily_stats': 300.0, 'mv_task_completion': 60.0}
+    )
+
+    # X-DB-Queries and X-DB-Time (ms) response headers with the statements each request ran; for debugging
+    db_stats_headers: bool = False
+
+    # ?profile=1 on any request and GET /debug/stacks, for callers sending this token in X-Profile-Token; unset
+    # (the default) turns both off. Stacks are sampled every interval for at most max seconds per call
+    profiling_token: SecretStr | None = None
+    profiling_sample_interval_ms: float = 5.0
+    profiling_max_seconds: float = 60.0
+
+    # with several workers, how often each shares its metrics with the others, so that a scrape, whichever
+    # worker answers it, covers them all
+    metrics_share_seconds: float = 5.0
+
+    # python -m src.tasknote.serve: worker processes, 0 for one per CPU, and how long SIGTERM waits for
+    # in-flight requests before closing them; keep it under the orchestrator's kill timeout
+    server_host: str = '0.0.0.0'
+    server_port: int = 8081
+    server_workers: int = 0
+    server_graceful_timeout_seconds: int = 25
+
 
 env_file = Path(__file__).parent / '.env'
-defaults = load_config_for(service_name, env_file=env_file)
 
-settings = BaseServiceSettings(**defaults)
+
+@cache
+def get_settings() -> TaskNoteSettings:
+    """
+    The service settings, read from `.env`, the YAML config and the environment on the first call rather than at
+    import, so that importing the app, a test module or a migration does not parse any config.
+    """
+    defaults = load_config_for(service_name, env_file=env_file)
+    return TaskNoteSettings(**defaults)
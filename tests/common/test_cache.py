@@ -0,0 +1,100 @@
+# tests/common/test_cache.py
+
+from src.common.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_get_miss_then_hit():
+    cache = LRUCache(max_size=2, ttl_seconds=10)
+
+    assert await cache.get('a') is None
+    await cache.set('a', 1)
+    assert await cache.get('a') == 1
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+
+
+async def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, ttl_seconds=10, clock=clock)
+    await cache.set('a', 1)
+
+    clock.now = 9.9
+    assert await cache.get('a') == 1
+    clock.now = 10.0
+    assert await cache.get('a') is None
+
+    stats = cache.stats()
+    assert stats.expirations == 1
+    assert stats.size == 0
+
+
+async def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_size=2, ttl_seconds=10)
+    await cache.set('a', 1)
+    await cache.set('b', 2)
+    await cache.get('a')  # 'b' is now the least recently used
+
+    await cache.set('c', 3)
+
+    assert await cache.get('b') is None
+    assert await cache.get('a') == 1
+    assert await cache.get('c') == 3
+    assert cache.stats().evictions == 1
+
+
+async def test_delete_removes_entries():
+    cache = LRUCache(max_size=3, ttl_seconds=10)
+    await cache.set('a', 1)
+    await cache.set('b', 2)
+
+    await cache.delete('a', 'b', 'missing')
+
+    assert await cache.get('a') is None
+    assert await cache.get('b') is None
+    assert cache.stats().size == 0
+
+
+async def test_set_is_dropped_when_the_key_was_deleted_since_the_stamp():
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, ttl_seconds=10, clock=clock)
+    since = cache.stamp()
+
+    clock.now = 1.0
+    await cache.delete('a')
+    await cache.set('a', 'stale', since)
+
+    assert await cache.get('a') is None
+
+
+async def test_set_is_kept_when_the_key_was_deleted_before_the_stamp():
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, ttl_seconds=10, clock=clock)
+    await cache.delete('a')
+
+    clock.now = 1.0
+    since = cache.stamp()
+    await cache.set('a', 'fresh', since)
+
+    assert await cache.get('a') == 'fresh'
+
+
+async def test_set_is_dropped_when_the_stamp_is_older_than_the_ttl():
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, ttl_seconds=10, clock=clock)
+    since = cache.stamp()
+
+    clock.now = 10.0
+    await cache.set('a', 'stale', since)
+
+    assert await cache.get('a') is None
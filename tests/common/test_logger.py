@@ -0,0 +1,143 @@
+# tests/common/test_logger.py
+import json
+import logging
+import queue
+
+from unittest.mock import patch
+
+import pytest
+import structlog
+
+from pydantic import ValidationError
+
+from src.common.logger import (
+    DroppingQueueHandler,
+    LogRenderer,
+    logging_stats,
+    record_query,
+    setup_logging,
+    shutdown_logging,
+    track_queries,
+)
+from src.common.settings import BaseServiceSettings
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers, root.level = handlers, level
+    structlog.reset_defaults()
+
+
+def test_queued_records_are_written_by_background_thread(capsys):
+    # Arrange
+    setup_logging(service_name='test', queue_size=100)
+
+    # Act
+    structlog.get_logger().info('Queued event', answer=42)
+    shutdown_logging()  # waits for the writer to drain the queue
+
+    # Assert
+    line = json.loads(capsys.readouterr().err)
+    assert line['event'] == 'Queued event'
+    assert line['answer'] == 42
+    assert line['service'] == 'test'
+
+
+def test_shutdown_drains_a_full_queue(capsys):
+    # Arrange
+    setup_logging(queue_size=2)
+    log = structlog.get_logger()
+
+    # Act
+    for i in range(50):
+        log.info('Burst', i=i)
+    stats = logging_stats()
+    shutdown_logging()
+
+    # Assert
+    written = capsys.readouterr().err.splitlines()
+    assert len(written) + stats.dropped == 50
+
+
+def test_full_queue_drops_and_counts():
+    # Arrange
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord('test', logging.INFO, __file__, 1, 'message', None, None)
+
+    # Act
+    handler.handle(record)
+    handler.handle(record)
+
+    # Assert
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_logging_stats():
+    setup_logging(queue_size=10)
+    assert logging_stats().queue_size == 10
+
+    setup_logging(queue_size=0)
+    assert logging_stats() is None
+
+
+def test_setup_keeps_handlers_it_did_not_add():
+    # Arrange
+    root = logging.getLogger()
+    host_handler = logging.NullHandler()
+    root.addHandler(host_handler)
+    before = root.handlers[:]
+
+    # Act
+    setup_logging(queue_size=10)
+    setup_logging(queue_size=0)
+
+    # Assert: the host's handler stays, the queue handler of the first call is replaced
+    added = [handler for handler in root.handlers if handler not in before]
+    assert all(handler in root.handlers for handler in before)
+    assert len(added) == 1
+    assert type(added[0]) is logging.StreamHandler
+
+
+def test_orjson_renderer(capsys):
+    pytest.importorskip('orjson')
+    # Arrange
+    setup_logging(service_name='test', renderer=LogRenderer.ORJSON)
+
+    # Act
+    structlog.get_logger().info('Rendered event', status={'NEW': 1})
+
+    # Assert
+    line = json.loads(capsys.readouterr().err)
+    assert line['event'] == 'Rendered event'
+    assert line['status'] == {'NEW': 1}
+
+
+def test_orjson_renderer_without_orjson_fails_clearly():
+    with patch('src.common.logger.find_spec', return_value=None), pytest.raises(ValueError, match='fast-json'):
+        setup_logging(renderer=LogRenderer.ORJSON)
+
+
+def test_settings_reject_orjson_without_orjson():
+    fields = {'log_level': 'INFO', 'db_username': 'u', 'db_password': 'p', 'db_host': 'h', 'db_port': 1, 'db_name': 'n'}
+    with patch('src.common.logger.find_spec', return_value=None), pytest.raises(ValidationError, match='fast-json'):
+        BaseServiceSettings(**fields, log_renderer='orjson')
+
+
+def test_queries_are_recorded_only_while_tracked():
+    # Arrange
+    record_query(1.0)  # nothing tracking: ignored
+
+    # Act
+    with track_queries() as stats:
+        record_query(0.25)
+        record_query(0.5)
+    record_query(1.0)
+
+    # Assert
+    assert stats.statements == 2
+    assert stats.seconds == 0.75
@@ -0,0 +1,91 @@
+# tests/common/test_metrics.py
+import json
+
+from src.common.metrics import Counter, Histogram, Registry
+
+
+def test_counter_and_gauge_render():
+    registry = Registry()
+    requests = registry.counter('requests_total', 'Requests.', ('method',))
+    in_flight = registry.gauge('in_flight', 'In flight.')
+
+    requests.inc('GET')
+    requests.inc('GET')
+    requests.inc('POST')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert registry.render() == (
+        '# HELP requests_total Requests.\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{method="GET"} 2\n'
+        'requests_total{method="POST"} 1\n'
+        '# HELP in_flight In flight.\n'
+        '# TYPE in_flight gauge\n'
+        'in_flight 1\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    registry = Registry()
+    latency = registry.histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0))
+
+    latency.observe(0.05, '/tasks')
+    latency.observe(0.1, '/tasks')  # on a bound: counted in that bound's bucket
+    latency.observe(3.0, '/tasks')
+
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'latency_seconds_bucket{route="/tasks",le="0.1"} 2',
+        'latency_seconds_bucket{route="/tasks",le="1"} 2',
+        'latency_seconds_bucket{route="/tasks",le="+Inf"} 3',
+        'latency_seconds_sum{route="/tasks"} 3.15',
+        'latency_seconds_count{route="/tasks"} 3',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.counter('paths_total', 'Paths.', ('path',))
+
+    counter.inc('a"b\\c\nd')
+
+    assert 'paths_total{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_render_adds_in_peer_dumps():
+    # Arrange: two processes with the same metrics
+    def process() -> tuple[Registry, Counter, Histogram]:
+        registry = Registry()
+        requests = registry.counter('requests_total', 'Requests.', ('method',))
+        latency = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1,))
+        return registry, requests, latency
+
+    own, own_requests, own_latency = process()
+    peer, peer_requests, peer_latency = process()
+    own_requests.inc('GET')
+    own_latency.observe(0.05)
+    peer_requests.inc('GET', amount=2)
+    peer_requests.inc('POST')
+    peer_latency.observe(0.5)
+
+    # Act
+    dumped = json.loads(json.dumps(peer.dump()))  # as it travels between processes
+    lines = own.render(peers=[dumped]).splitlines()
+
+    # Assert
+    assert 'requests_total{method="GET"} 3' in lines
+    assert 'requests_total{method="POST"} 1' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_count 2' in lines
+    assert 'latency_seconds_sum 0.55' in lines
+    assert own.render().splitlines().count('requests_total{method="GET"} 1') == 1  # its own values are unchanged
+
+
+def test_dump_without_gauges():
+    registry = Registry()
+    registry.counter('requests_total', 'Requests.').inc()
+    registry.gauge('in_flight', 'In flight.').inc()
+
+    assert registry.dump(gauges=False) == {'requests_total': [[[], 1]]}
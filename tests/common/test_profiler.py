@@ -0,0 +1,38 @@
+# tests/common/test_profiler.py
+import cProfile
+import threading
+import time
+
+from src.common.profiler import StackSampler, profile_report
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_collapses_the_sampled_thread_stacks():
+    # Act
+    with StackSampler(threading.get_ident(), interval_seconds=0.001) as sampler:
+        _spin(0.2)
+
+    # Assert
+    lines = sampler.collapsed().splitlines()
+    stack, count = lines[0].rsplit(' ', 1)
+    assert stack.endswith(f'{__name__}:test_sampler_collapses_the_sampled_thread_stacks;{__name__}:_spin')
+    assert 0 < int(count) <= sampler.samples
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == sampler.samples
+
+
+def test_profile_report():
+    # Arrange
+    profiler = cProfile.Profile()
+
+    # Act
+    profiler.runcall(_spin, 0.01)
+    report = profile_report(profiler, limit=5)
+
+    # Assert
+    assert 'cumulative' in report
+    assert '(_spin)' in report
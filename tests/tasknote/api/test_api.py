@@ -1,4 +1,6 @@
 # tests/tasknote/api/test_api.py
+import json
+
 from datetime import timedelta
 
 import pytest
@@ -254,6 +256,58 @@ async def test_get_tasks_e2e(app: FastAPI, session: AsyncSession, client: AsyncC
             assert 'status' in task
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_e2e(app: FastAPI, session: AsyncSession, client: AsyncClient):
+    async with override_db_session(app, session):
+        response = await client.post(
+            '/tasks:bulk',
+            json=[{'title': 'Bulk E2E Task 1', 'priority': 1}, {'title': 'Bulk E2E Task 2', 'description': 'Second'}],
+        )
+
+        assert response.status_code == codes.OK
+        body = response.json()
+        assert [task['title'] for task in body] == ['Bulk E2E Task 1', 'Bulk E2E Task 2']
+        assert body[0]['priority'] == 1
+        assert body[1]['description'] == 'Second'
+        assert all(task['status'] == 'NEW' for task in body)
+
+        get_response = await client.get(f'/tasks/{body[1]["id"]}')
+        assert get_response.status_code == codes.OK
+        assert get_response.json()['title'] == 'Bulk E2E Task 2'
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_tasks_e2e_paginated_and_streamed(app: FastAPI, session: AsyncSession, client: AsyncClient):
+    async with override_db_session(app, session):
+        for i in range(3):
+            await client.post('/tasks', json={'title': f'Paged Task {i}'})
+
+        # Walk the listing one row at a time following the cursor header
+        paged_ids = []
+        params = {'limit': 1}
+        while True:
+            response = await client.get('/tasks', params=params)
+            assert response.status_code == codes.OK
+            page = response.json()
+            assert len(page) <= 1
+            paged_ids.extend(task['id'] for task in page)
+            if 'X-Next-Cursor' not in response.headers:
+                break
+            params = {'limit': 1, 'after': response.headers['X-Next-Cursor']}
+
+        assert paged_ids == sorted(set(paged_ids))
+
+        # The NDJSON stream yields the same rows in the same order
+        response = await client.get('/tasks', headers={'Accept': 'application/x-ndjson'})
+
+        assert response.status_code == codes.OK
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+        assert [task['id'] for task in streamed] == paged_ids
+        assert {'Paged Task 0', 'Paged Task 1', 'Paged Task 2'} <= {task['title'] for task in streamed}
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_get_task_e2e_success(app: FastAPI, session: AsyncSession, client: AsyncClient):
@@ -344,3 +398,65 @@ async def test_delete_task_e2e_not_found(app: FastAPI, session: AsyncSession, cl
         error = response.json()
         assert 'Task not found' in error['detail']
         assert str(non_existent_id) in error['detail']
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_delete_tasks_e2e(app: FastAPI, session: AsyncSession, client: AsyncClient):
+    async with override_db_session(app, session):
+        # First create a few tasks
+        create_response = await client.post(
+            '/tasks:bulk', json=[{'title': 'Bulk Delete E2E 1'}, {'title': 'Bulk Delete E2E 2'}]
+        )
+        ids = [task['id'] for task in create_response.json()]
+
+        # Then delete them along with an id that does not exist
+        delete_response = await client.delete('/tasks', params={'ids': [*ids, 9999]})
+
+        assert delete_response.status_code == codes.OK
+        assert sorted(delete_response.json()['deleted']) == ids
+        for task_id in ids:
+            get_response = await client.get(f'/tasks/{task_id}')
+            assert get_response.status_code == codes.NOT_FOUND
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_notes_e2e_conditional(app: FastAPI, session: AsyncSession, client: AsyncClient):
+    async with override_db_session(app, session):
+        await client.post('/notes', json={'title': 'Conditional Note'})
+
+        first = await client.get('/notes', params={'limit': 5})
+        etag = first.headers['ETag']
+
+        # Nothing changed: the poll is answered without a body
+        unchanged = await client.get('/notes', params={'limit': 5}, headers={'If-None-Match': etag})
+        assert unchanged.status_code == codes.NOT_MODIFIED
+        assert unchanged.content == b''
+
+        # A write to a note on the page changes its ETag
+        await client.patch(f'/notes/{first.json()[0]["id"]}', json={'title': 'Edited Conditional Note'})
+        changed = await client.get('/notes', params={'limit': 5}, headers={'If-None-Match': etag})
+        assert changed.status_code == codes.OK
+        assert changed.headers['ETag'] != etag
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_tag_task_e2e(app: FastAPI, session: AsyncSession, client: AsyncClient):
+    async with override_db_session(app, session):
+        tag_name = f'e2e-{now_ist().timestamp()}'
+        tag = (await client.post('/tags', json={'name': tag_name})).json()
+        task = (await client.post('/tasks', json={'title': 'E2E Tagged Task'})).json()
+        before = await client.get(f'/tasks/{task["id"]}')
+
+        tagged = await client.put(f'/tasks/{task["id"]}/tag/{tag["id"]}')
+        after = await client.get(f'/tasks/{task["id"]}')
+        listed = await client.get('/tasks', params={'tag': tag_name})
+
+        assert before.json()['tags'] == []
+        assert tagged.status_code == codes.OK
+        assert tagged.json()['tags'] == [tag_name]
+        assert after.json()['tags'] == [tag_name]  # the cached task was invalidated
+        assert after.headers['ETag'] != before.headers['ETag']
+        assert [item['id'] for item in listed.json()] == [task['id']]
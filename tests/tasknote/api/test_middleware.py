@@ -0,0 +1,152 @@
+# tests/tasknote/api/test_middleware.py
+from unittest.mock import AsyncMock
+
+import pytest
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient, codes
+from pydantic import SecretStr
+
+from src.common.logger import record_query
+from src.tasknote.api.middleware import MetricsMiddleware, ProfilingMiddleware, QueryStatsMiddleware
+from src.tasknote.api.router import router
+from src.tasknote.metrics import http_request_duration, http_requests, http_requests_in_flight
+from src.tasknote.settings import get_settings
+from tests.tasknote.conftest import override_tasks_service
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def _count(*labels: str) -> float:
+    return http_requests.values.get(labels, 0)
+
+
+@pytest.mark.asyncio
+async def test_requests_are_counted_by_route_template(app: FastAPI, client: AsyncClient):
+    # Arrange
+    mock_service = AsyncMock()
+    mock_service.delete_task.return_value = None
+    deleted_before = _count('DELETE', '/tasks/{task_id}', '204')
+    unmatched_before = _count('GET', 'unmatched', '404')
+    observed_before = http_request_duration.values.get(('DELETE', '/tasks/{task_id}'), ([0], [0.0]))[1][0]
+
+    # Act
+    async with override_tasks_service(app, mock_service):
+        await client.delete('/tasks/1')
+        await client.delete('/tasks/2')
+        await client.get('/no-such-route')
+
+    # Assert
+    assert _count('DELETE', '/tasks/{task_id}', '204') == deleted_before + 2
+    assert _count('GET', 'unmatched', '404') == unmatched_before + 1
+    assert http_request_duration.values[('DELETE', '/tasks/{task_id}')][1][0] > observed_before
+    assert http_requests_in_flight.values[()] == 0
+
+
+@pytest.mark.asyncio
+async def test_unhandled_error_counts_as_500(app: FastAPI):
+    # Arrange
+    mock_service = AsyncMock()
+    mock_service.delete_task.side_effect = RuntimeError('boom')
+    before = _count('DELETE', '/tasks/{task_id}', '500')
+
+    # Act
+    async with (
+        override_tasks_service(app, mock_service),
+        AsyncClient(transport=ASGITransport(app=app, raise_app_exceptions=False), base_url='http://test') as client,
+    ):
+        response = await client.delete('/tasks/1')
+
+    # Assert
+    assert response.status_code == codes.INTERNAL_SERVER_ERROR
+    assert _count('DELETE', '/tasks/{task_id}', '500') == before + 1
+
+
+@pytest.mark.parametrize('headers', [True, False])
+@pytest.mark.asyncio
+async def test_query_stats_headers(headers: bool):
+    # Arrange: the mock service stands in for two statements
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(QueryStatsMiddleware, headers=headers)
+
+    def run_two_statements(_task_id: int) -> None:
+        record_query(0.002)
+        record_query(0.001)
+
+    mock_service = AsyncMock()
+    mock_service.delete_task.side_effect = run_two_statements
+
+    # Act
+    async with (
+        override_tasks_service(app, mock_service),
+        AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client,
+    ):
+        response = await client.delete('/tasks/1')
+
+    # Assert
+    assert response.status_code == codes.NO_CONTENT
+    if headers:
+        assert response.headers['X-DB-Queries'] == '2'
+        assert response.headers['X-DB-Time'] == '3.000'
+    else:
+        assert 'X-DB-Queries' not in response.headers
+
+
+@pytest.fixture
+def profiled_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ProfilingMiddleware)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_profiled_request_returns_the_profile(profiled_app: FastAPI, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(get_settings(), 'profiling_token', SecretStr('secret'))
+    mock_service = AsyncMock()
+    mock_service.delete_task.return_value = None
+
+    # Act
+    async with (
+        override_tasks_service(profiled_app, mock_service),
+        AsyncClient(transport=ASGITransport(app=profiled_app), base_url='http://test') as client,
+    ):
+        response = await client.delete('/tasks/1?profile=1', headers={'X-Profile-Token': 'secret'})
+
+    # Assert
+    assert response.status_code == codes.OK
+    assert response.headers['X-Profiled-Status'] == '204'
+    assert response.text.startswith('DELETE /tasks/1 -> 204 in ')
+    assert 'cumulative' in response.text
+    mock_service.delete_task.assert_awaited_once_with(1)
+
+
+@pytest.mark.parametrize(
+    ('token', 'sent', 'status'),
+    [(None, 'secret', codes.NOT_FOUND), ('secret', None, codes.FORBIDDEN), ('secret', 'wrong', codes.FORBIDDEN)],
+)
+@pytest.mark.asyncio
+async def test_profiling_needs_the_token(profiled_app: FastAPI, monkeypatch, token, sent, status):
+    # Arrange
+    monkeypatch.setattr(get_settings(), 'profiling_token', SecretStr(token) if token else None)
+    mock_service = AsyncMock()
+    headers = {'X-Profile-Token': sent} if sent else {}
+
+    # Act
+    async with (
+        override_tasks_service(profiled_app, mock_service),
+        AsyncClient(transport=ASGITransport(app=profiled_app), base_url='http://test') as client,
+    ):
+        response = await client.delete('/tasks/1?profile=1', headers=headers)
+
+    # Assert
+    assert response.status_code == status
+    mock_service.delete_task.assert_not_awaited()
@@ -0,0 +1,67 @@
+# tests/tasknote/api/test_responses.py
+from datetime import UTC, datetime
+
+import pytest
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.common.timeutils import now_ist
+from src.tasknote.api.responses import RowsJSONResponse, RowsSerializer
+from src.tasknote.api.schemas import NoteRead, TaskRead
+from src.tasknote.domain.models import Note, Task, TaskStatus
+
+
+def test_task_rows_match_response_model():
+    tasks = [
+        Task(
+            id=1,
+            title='Task 1',
+            created_at=now_ist(),
+            description='first',
+            priority=3,
+            due_date=datetime(2025, 5, 2, 10, 0, tzinfo=UTC),
+            completed_at=None,
+            status=TaskStatus.PENDING,
+        ),
+        Task(
+            id=2,
+            title='Task "2"',
+            created_at=now_ist(),
+            description=None,
+            priority=None,
+            due_date=None,
+            completed_at=None,
+        ),
+    ]
+
+    expected = TypeAdapter(list[TaskRead]).dump_json(
+        TypeAdapter(list[TaskRead]).validate_python(tasks, from_attributes=True)
+    )
+
+    assert RowsSerializer(TaskRead).dump_json(tasks) == expected
+    assert RowsSerializer(TaskRead).dump_json(tasks, validate=False) == expected
+
+
+def test_note_rows_response():
+    notes = [Note(id=1, title='Note 1', content=None, created_at=datetime(2025, 5, 2, tzinfo=UTC))]
+
+    response = RowsJSONResponse(notes, RowsSerializer(NoteRead), headers={'ETag': 'W/"notes-1"'})
+
+    assert (
+        response.body
+        == b'[{"id":1,"title":"Note 1","content":null,"created_at":"2025-05-02T00:00:00Z","tags":[],"version":1}]'
+    )
+    assert response.headers['content-type'] == 'application/json'
+    assert response.headers['ETag'] == 'W/"notes-1"'
+
+
+def test_empty_rows():
+    assert RowsSerializer(NoteRead).dump_json([]) == b'[]'
+
+
+def test_validated_rows_reject_a_mismatch():
+    notes = [Note(id=1, title='Note 1', content=None, created_at=datetime(2025, 5, 2, tzinfo=UTC))]
+    notes[0].id = None
+
+    with pytest.raises(ValidationError):
+        RowsSerializer(NoteRead).dump_json(notes)
@@ -1,16 +1,51 @@
-from datetime import timedelta
-from unittest.mock import AsyncMock
+import asyncio
+import json
+
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 import pytest
 
 from fastapi import FastAPI
 from httpx import AsyncClient, codes
+from pydantic import SecretStr, ValidationError
 
+from src.common.cache import CacheStats
+from src.common.logger import LoggingStats
 from src.common.timeutils import now_ist
-from src.tasknote.api.schemas import NoteCreate, TaskCreate
-from src.tasknote.domain.exceptions import NoteNotFoundError, TaskNotFoundError
-from src.tasknote.domain.models import TaskStatus
-from tests.tasknote.conftest import override_note_service, override_tasks_service
+from src.tasknote.api.dependencies import get_cache_stats, get_logging_stats, get_pool_stats, get_settings
+from src.tasknote.api.schemas import NoteCreate, NotePatch, NoteUpdate, TagCreate, TaskCreate, TaskUpdate
+from src.tasknote.domain.exceptions import (
+    BatchTooLargeError,
+    InvalidCursorError,
+    InvalidDateRangeError,
+    NoteNotFoundError,
+    TagAlreadyExistsError,
+    TagNotFoundError,
+    TaskNotFoundError,
+    VersionConflictError,
+)
+from src.tasknote.domain.models import (
+    AnalyticsSummary,
+    Note,
+    NoteDay,
+    Page,
+    Snapshot,
+    Tag,
+    Task,
+    TaskCompletion,
+    TaskDay,
+    TaskFilter,
+    TaskSort,
+    TaskStatus,
+)
+from src.tasknote.persistence.pool import PoolStats
+from tests.tasknote.conftest import (
+    override_analytics_service,
+    override_note_service,
+    override_tags_service,
+    override_tasks_service,
+)
 
 
 @pytest.mark.asyncio
@@ -27,6 +62,132 @@ async def test_health(client: AsyncClient):
     assert response.json() == {'status': 'OK'}
 
 
+@pytest.mark.asyncio
+async def test_pool_health(app: FastAPI, client: AsyncClient):
+    stats = PoolStats(
+        size=5,
+        checked_in=3,
+        checked_out=2,
+        overflow=0,
+        max_overflow=10,
+        checkouts=42,
+        timeouts=0,
+        checkout_time_total_ms=12.5,
+        checkout_time_max_ms=1.25,
+    )
+    app.dependency_overrides[get_pool_stats] = lambda: stats
+    try:
+        response = await client.get('/health/pool')
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == codes.OK
+    assert response.json() == {
+        'size': 5,
+        'checked_in': 3,
+        'checked_out': 2,
+        'overflow': 0,
+        'max_overflow': 10,
+        'checkouts': 42,
+        'timeouts': 0,
+        'checkout_time_total_ms': 12.5,
+        'checkout_time_max_ms': 1.25,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cache_health(app: FastAPI, client: AsyncClient):
+    stats = {'tasks': CacheStats(size=1, max_size=10, hits=4, misses=1, evictions=0, expirations=0)}
+    app.dependency_overrides[get_cache_stats] = lambda: stats
+    try:
+        response = await client.get('/health/cache')
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == codes.OK
+    assert response.json() == {
+        'tasks': {'size': 1, 'max_size': 10, 'hits': 4, 'misses': 1, 'evictions': 0, 'expirations': 0}
+    }
+
+
+@pytest.mark.asyncio
+async def test_logging_health(app: FastAPI, client: AsyncClient):
+    app.dependency_overrides[get_logging_stats] = lambda: LoggingStats(queue_size=100, queued=3, dropped=7)
+    try:
+        response = await client.get('/health/logging')
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == codes.OK
+    assert response.json() == {'queue_size': 100, 'queued': 3, 'dropped': 7}
+
+
+@pytest.mark.asyncio
+async def test_metrics(app: FastAPI, client: AsyncClient):
+    stats = PoolStats(
+        size=5,
+        checked_in=3,
+        checked_out=2,
+        overflow=0,
+        max_overflow=10,
+        checkouts=42,
+        timeouts=1,
+        checkout_time_total_ms=1500.0,
+        checkout_time_max_ms=3.0,
+    )
+    app.dependency_overrides[get_pool_stats] = lambda: stats
+    try:
+        response = await client.get('/metrics')
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == codes.OK
+    assert response.headers['content-type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    lines = response.text.splitlines()
+    assert '# TYPE tasknote_http_request_duration_seconds histogram' in lines
+    assert 'tasknote_db_pool_checked_out 2' in lines
+    assert 'tasknote_db_pool_checkouts_total 42' in lines
+    assert 'tasknote_db_pool_checkout_seconds_total 1.5' in lines
+
+
+@pytest.mark.asyncio
+async def test_sample_stacks(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(get_settings(), 'profiling_token', SecretStr('secret'))
+    monkeypatch.setattr(get_settings(), 'profiling_sample_interval_ms', 1.0)
+
+    response = await client.get('/debug/stacks?seconds=0.05', headers={'X-Profile-Token': 'secret'})
+    too_long = await client.get('/debug/stacks?seconds=3600', headers={'X-Profile-Token': 'secret'})
+    unauthorized = await client.get('/debug/stacks?seconds=0.05')
+
+    assert response.status_code == codes.OK
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in response.text.splitlines())
+    assert 'asyncio' in response.text  # the idle loop, at least
+    assert too_long.status_code == codes.BAD_REQUEST
+    assert unauthorized.status_code == codes.FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_sample_stacks_one_at_a_time(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(get_settings(), 'profiling_token', SecretStr('secret'))
+    headers = {'X-Profile-Token': 'secret'}
+
+    first, second = await asyncio.gather(
+        client.get('/debug/stacks?seconds=0.2', headers=headers),
+        client.get('/debug/stacks?seconds=0.2', headers=headers),
+    )
+    after = await client.get('/debug/stacks?seconds=0.01', headers=headers)
+
+    assert sorted([first.status_code, second.status_code]) == [codes.OK, codes.CONFLICT]
+    assert after.status_code == codes.OK
+
+
+@pytest.mark.asyncio
+async def test_sample_stacks_off_by_default(client: AsyncClient):
+    response = await client.get('/debug/stacks', headers={'X-Profile-Token': 'secret'})
+
+    assert response.status_code == codes.NOT_FOUND
+
+
 @pytest.mark.asyncio
 async def test_create_note(app: FastAPI, client: AsyncClient):
     mock_note = {
@@ -34,6 +195,8 @@ async def test_create_note(app: FastAPI, client: AsyncClient):
         'title': 'Test Note',
         'content': 'This is a test note from api.',
         'created_at': '2023-10-01T00:00:00',
+        'tags': [],
+        'version': 1,
     }
 
     mock_service = AsyncMock()
@@ -57,10 +220,12 @@ async def test_get_note(app: FastAPI, client: AsyncClient):
         'title': 'Test Note',
         'content': 'This is a test note from api.',
         'created_at': '2023-10-01T00:00:00',
+        'tags': [],
+        'version': 1,
     }
 
     mock_service = AsyncMock()
-    mock_service.get_note.return_value = mock_note
+    mock_service.get_note.return_value = Note(**{**mock_note, 'created_at': datetime(2023, 10, 1)})
 
     async with override_note_service(app, mock_service):
         response = await client.get('/notes/1')
@@ -86,6 +251,54 @@ async def test_get_note_not_found(app: FastAPI, client: AsyncClient):
         mock_service.get_note.assert_called_once_with(note_id)
 
 
+@pytest.mark.asyncio
+async def test_create_notes_bulk(app: FastAPI, client: AsyncClient):
+    mock_notes = [
+        {
+            'id': 1,
+            'title': 'Bulk Note 1',
+            'content': 'First',
+            'created_at': '2023-10-01T00:00:00',
+            'tags': [],
+            'version': 1,
+        },
+        {
+            'id': 2,
+            'title': 'Bulk Note 2',
+            'content': None,
+            'created_at': '2023-10-01T00:00:00',
+            'tags': [],
+            'version': 1,
+        },
+    ]
+
+    mock_service = AsyncMock()
+    mock_service.create_notes.return_value = mock_notes
+
+    async with override_note_service(app, mock_service):
+        response = await client.post(
+            '/notes:bulk', json=[{'title': 'Bulk Note 1', 'content': 'First'}, {'title': 'Bulk Note 2'}]
+        )
+
+        assert response.status_code == codes.OK
+        assert response.json() == mock_notes
+        mock_service.create_notes.assert_called_once_with(
+            [NoteCreate(title='Bulk Note 1', content='First'), NoteCreate(title='Bulk Note 2')]
+        )
+
+
+@pytest.mark.asyncio
+async def test_create_notes_bulk_too_large(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.create_notes.side_effect = BatchTooLargeError(2, 1)
+
+    async with override_note_service(app, mock_service):
+        response = await client.post('/notes:bulk', json=[{'title': 'One'}, {'title': 'Two'}])
+
+        assert response.status_code == codes.REQUEST_ENTITY_TOO_LARGE
+        assert response.json() == {'detail': 'Batch too large: 2 > 1'}
+
+
 @pytest.mark.asyncio
 async def test_get_notes(app: FastAPI, client: AsyncClient):
     mock_notes = [
@@ -94,17 +307,26 @@ async def test_get_notes(app: FastAPI, client: AsyncClient):
             'title': 'Test Note 1',
             'content': 'This is test note 1.',
             'created_at': '2023-10-01T00:00:00',
+            'tags': [],
+            'version': 1,
         },
         {
             'id': 2,
             'title': 'Test Note 2',
             'content': 'This is test note 2.',
             'created_at': '2023-10-02T00:00:00',
+            'tags': [],
+            'version': 1,
         },
     ]
 
     mock_service = AsyncMock()
-    mock_service.get_all_notes.return_value = mock_notes
+    mock_service.get_notes_page.return_value = Page(
+        [
+            Note(id=1, title='Test Note 1', content='This is test note 1.', created_at=datetime(2023, 10, 1)),
+            Note(id=2, title='Test Note 2', content='This is test note 2.', created_at=datetime(2023, 10, 2)),
+        ]
+    )
 
     async with override_note_service(app, mock_service):
         response = await client.get('/notes')
@@ -112,7 +334,169 @@ async def test_get_notes(app: FastAPI, client: AsyncClient):
         assert response.status_code == codes.OK
         data = response.json()
         assert data == mock_notes
-        mock_service.get_all_notes.assert_called_once()
+        assert 'X-Next-Cursor' not in response.headers
+        mock_service.get_notes_page.assert_called_once_with(limit=100, after=None)
+
+
+@pytest.mark.asyncio
+async def test_get_notes_validated(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    # a row that does not match the schema is caught instead of being sent
+    mock_service.get_notes_page.return_value = Page([MagicMock(id='one', title='Test Note 1', tags=[], version=1)])
+
+    async with override_note_service(app, mock_service):
+        with pytest.raises(ValidationError):
+            await client.get('/notes')
+
+
+@pytest.mark.asyncio
+async def test_get_notes_fast(app: FastAPI, client: AsyncClient):
+    settings = get_settings().model_copy(update={'fast_list_responses': True})
+    app.dependency_overrides[get_settings] = lambda: settings
+    mock_service = AsyncMock()
+    mock_service.get_notes_page.return_value = Page(
+        [Note(id=1, title='Test Note 1', content=None, created_at=datetime(2023, 10, 1))]
+    )
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes')
+
+        assert response.status_code == codes.OK
+        assert response.json() == [
+            {
+                'id': 1,
+                'title': 'Test Note 1',
+                'content': None,
+                'created_at': '2023-10-01T00:00:00',
+                'tags': [],
+                'version': 1,
+            }
+        ]
+
+
+@pytest.mark.asyncio
+async def test_get_notes_next_cursor(app: FastAPI, client: AsyncClient):
+    mock_notes = [
+        {
+            'id': 3,
+            'title': 'Test Note 3',
+            'content': None,
+            'created_at': '2023-10-03T00:00:00',
+            'tags': [],
+            'version': 1,
+        },
+    ]
+
+    mock_service = AsyncMock()
+    mock_service.get_notes_page.return_value = Page(
+        [Note(id=3, title='Test Note 3', content=None, created_at=datetime(2023, 10, 3))],
+        next_cursor='next',
+    )
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes', params={'limit': 1, 'after': 'previous'})
+
+        assert response.status_code == codes.OK
+        assert response.json() == mock_notes
+        assert response.headers['X-Next-Cursor'] == 'next'
+        mock_service.get_notes_page.assert_called_once_with(limit=1, after='previous')
+
+
+@pytest.mark.asyncio
+async def test_get_notes_invalid_cursor(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_notes_page.side_effect = InvalidCursorError('bogus')
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes', params={'after': 'bogus'})
+
+        assert response.status_code == codes.BAD_REQUEST
+        assert response.json() == {'detail': 'Invalid cursor: bogus'}
+
+
+@pytest.mark.asyncio
+async def test_get_notes_limit_out_of_range(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes', params={'limit': 0})
+
+        assert response.status_code == codes.UNPROCESSABLE_ENTITY
+        mock_service.get_notes_page.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_notes_ndjson_stream(app: FastAPI, client: AsyncClient):
+    mock_notes = [
+        Note(id=1, title='Test Note 1', content='This is test note 1.', created_at=datetime(2023, 10, 1, tzinfo=UTC)),
+        Note(id=2, title='Test Note 2', content=None, created_at=datetime(2023, 10, 2, tzinfo=UTC)),
+    ]
+
+    async def stream():
+        for note in mock_notes:
+            yield note
+
+    mock_service = AsyncMock()
+    mock_service.stream_notes = MagicMock(return_value=stream())
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes', headers={'Accept': 'application/x-ndjson'})
+
+        assert response.status_code == codes.OK
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line['id'] for line in lines] == [1, 2]
+        assert lines[1]['content'] is None
+        mock_service.stream_notes.assert_called_once_with(None)
+        mock_service.get_notes_page.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_notes(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.search_notes.return_value = Page(
+        [Note(id=4, title='Kayak trip', content=None, created_at=datetime(2023, 10, 4))], next_cursor='next'
+    )
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes/search', params={'text': 'kayak', 'limit': 1})
+
+        assert response.status_code == codes.OK
+        assert response.json() == [
+            {
+                'id': 4,
+                'title': 'Kayak trip',
+                'content': None,
+                'created_at': '2023-10-04T00:00:00',
+                'tags': [],
+                'version': 1,
+            }
+        ]
+        assert response.headers['X-Next-Cursor'] == 'next'
+        mock_service.search_notes.assert_called_once_with('kayak', limit=1, after=None, tag=None)
+
+
+@pytest.mark.asyncio
+async def test_search_notes_requires_text(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes/search', params={'text': ''})
+
+        assert response.status_code == codes.UNPROCESSABLE_ENTITY
+        mock_service.search_notes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_notes_invalid_cursor(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.search_notes.side_effect = InvalidCursorError('bogus')
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes/search', params={'text': 'kayak', 'after': 'bogus'})
+
+        assert response.status_code == codes.BAD_REQUEST
+        assert response.json() == {'detail': 'Invalid cursor: bogus'}
 
 
 @pytest.mark.asyncio
@@ -155,6 +539,8 @@ async def test_create_task(app: FastAPI, client: AsyncClient):
         'due_date': (created_at + timedelta(days=7)).isoformat(),
         'completed_at': None,
         'status': TaskStatus.NEW,
+        'tags': [],
+        'version': 1,
     }
 
     mock_service = AsyncMock()
@@ -196,6 +582,8 @@ async def test_create_task_minimal(app: FastAPI, client: AsyncClient):
         'due_date': None,
         'completed_at': None,
         'status': TaskStatus.NEW,
+        'tags': [],
+        'version': 1,
     }
 
     mock_service = AsyncMock()
@@ -210,6 +598,46 @@ async def test_create_task_minimal(app: FastAPI, client: AsyncClient):
         mock_service.create_task.assert_called_once_with(TaskCreate(title='Minimal Task'))
 
 
+@pytest.mark.asyncio
+async def test_create_tasks_bulk(app: FastAPI, client: AsyncClient):
+    mock_tasks = [
+        {
+            'id': 1,
+            'title': 'Bulk Task 1',
+            'description': None,
+            'priority': 1,
+            'created_at': '2023-10-01T00:00:00',
+            'due_date': None,
+            'completed_at': None,
+            'status': TaskStatus.NEW,
+            'tags': [],
+            'version': 1,
+        },
+    ]
+
+    mock_service = AsyncMock()
+    mock_service.create_tasks.return_value = mock_tasks
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.post('/tasks:bulk', json=[{'title': 'Bulk Task 1', 'priority': 1}])
+
+        assert response.status_code == codes.OK
+        assert response.json() == mock_tasks
+        mock_service.create_tasks.assert_called_once_with([TaskCreate(title='Bulk Task 1', priority=1)])
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_too_large(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.create_tasks.side_effect = BatchTooLargeError(3, 2)
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.post('/tasks:bulk', json=[{'title': 'One'}, {'title': 'Two'}, {'title': 'Three'}])
+
+        assert response.status_code == codes.REQUEST_ENTITY_TOO_LARGE
+        assert response.json() == {'detail': 'Batch too large: 3 > 2'}
+
+
 @pytest.mark.asyncio
 async def test_get_tasks(app: FastAPI, client: AsyncClient):
     mock_tasks = [
@@ -222,6 +650,8 @@ async def test_get_tasks(app: FastAPI, client: AsyncClient):
             'due_date': '2023-10-08T00:00:00',
             'completed_at': None,
             'status': TaskStatus.NEW,
+            'tags': [],
+            'version': 1,
         },
         {
             'id': 2,
@@ -232,19 +662,58 @@ async def test_get_tasks(app: FastAPI, client: AsyncClient):
             'due_date': '2023-10-09T00:00:00',
             'completed_at': None,
             'status': TaskStatus.PENDING,
+            'tags': [],
+            'version': 1,
         },
     ]
 
     mock_service = AsyncMock()
-    mock_service.get_all_tasks.return_value = mock_tasks
+    mock_service.get_tasks_page.return_value = Page(
+        [
+            Task(
+                id=1,
+                title='Test Task 1',
+                description='This is test task 1.',
+                priority=1,
+                created_at=datetime(2023, 10, 1),
+                due_date=datetime(2023, 10, 8),
+                completed_at=None,
+                status=TaskStatus.NEW,
+            ),
+            Task(
+                id=2,
+                title='Test Task 2',
+                description='This is test task 2.',
+                priority=2,
+                created_at=datetime(2023, 10, 2),
+                due_date=datetime(2023, 10, 9),
+                completed_at=None,
+                status=TaskStatus.PENDING,
+            ),
+        ],
+        next_cursor='next',
+    )
 
     async with override_tasks_service(app, mock_service):
-        response = await client.get('/tasks')
+        response = await client.get('/tasks', params={'limit': 2})
 
         assert response.status_code == codes.OK
         data = response.json()
         assert data == mock_tasks
-        mock_service.get_all_tasks.assert_called_once()
+        assert response.headers['X-Next-Cursor'] == 'next'
+        mock_service.get_tasks_page.assert_called_once_with(limit=2, after=None, filters=TaskFilter(), sort=TaskSort.ID)
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_ndjson_stream_invalid_cursor(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.stream_tasks = MagicMock(side_effect=InvalidCursorError('bogus'))
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.get('/tasks', params={'after': 'bogus'}, headers={'Accept': 'application/x-ndjson'})
+
+        assert response.status_code == codes.BAD_REQUEST
+        assert response.json() == {'detail': 'Invalid cursor: bogus'}
 
 
 @pytest.mark.asyncio
@@ -258,10 +727,14 @@ async def test_get_task(app: FastAPI, client: AsyncClient):
         'due_date': '2023-10-08T00:00:00',
         'completed_at': None,
         'status': TaskStatus.NEW,
+        'tags': [],
+        'version': 1,
     }
 
     mock_service = AsyncMock()
-    mock_service.get_task.return_value = mock_task
+    mock_service.get_task.return_value = Task(
+        **{**mock_task, 'created_at': datetime(2023, 10, 1), 'due_date': datetime(2023, 10, 8)}
+    )
 
     async with override_tasks_service(app, mock_service):
         response = await client.get('/tasks/1')
@@ -313,3 +786,585 @@ async def test_delete_task_not_found(app: FastAPI, client: AsyncClient):
         data = response.json()
         assert data == {'detail': f'Task not found: {task_id}'}
         mock_service.delete_task.assert_called_once_with(task_id)
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.delete_tasks.return_value = [1, 3]
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.delete('/tasks', params={'ids': [1, 2, 3]})
+
+        assert response.status_code == codes.OK
+        assert response.json() == {'deleted': [1, 3]}
+        mock_service.delete_tasks.assert_called_once_with([1, 2, 3])
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_requires_ids(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.delete('/tasks')
+
+        assert response.status_code == codes.UNPROCESSABLE_ENTITY
+        mock_service.delete_tasks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_task(app: FastAPI, client: AsyncClient):
+    mock_task = {
+        'id': 1,
+        'title': 'Replaced Task',
+        'description': None,
+        'priority': None,
+        'created_at': '2023-10-01T00:00:00',
+        'due_date': None,
+        'completed_at': None,
+        'status': TaskStatus.PENDING,
+        'tags': [],
+        'version': 3,
+    }
+    mock_service = AsyncMock()
+    mock_service.update_task.return_value = mock_task
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.put('/tasks/1', json={'title': 'Replaced Task', 'status': 'PENDING', 'version': 2})
+
+        assert response.status_code == codes.OK
+        assert response.json() == mock_task
+        mock_service.update_task.assert_called_once_with(
+            1, TaskUpdate(title='Replaced Task', status=TaskStatus.PENDING, version=2)
+        )
+
+
+@pytest.mark.asyncio
+async def test_patch_task(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.update_task.return_value = Task(
+        id=1,
+        title='Task',
+        created_at=datetime(2023, 10, 1, tzinfo=UTC),
+        description=None,
+        priority=5,
+        due_date=None,
+        completed_at=None,
+        version=2,
+    )
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.patch('/tasks/1', json={'priority': 5})
+
+        assert response.status_code == codes.OK
+        assert response.json()['priority'] == 5
+        (_, task_patch), _ = mock_service.update_task.call_args
+        assert task_patch.model_fields_set == {'priority'}
+
+
+@pytest.mark.asyncio
+async def test_patch_task_rejects_null_title(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.patch('/tasks/1', json={'title': None})
+
+        assert response.status_code == codes.UNPROCESSABLE_ENTITY
+        mock_service.update_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_task_errors(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.update_task.side_effect = [TaskNotFoundError(999), VersionConflictError(1, 1, 2)]
+
+    async with override_tasks_service(app, mock_service):
+        missing = await client.patch('/tasks/999', json={'priority': 1})
+        conflict = await client.patch('/tasks/1', json={'priority': 1, 'version': 1})
+
+        assert missing.status_code == codes.NOT_FOUND
+        assert conflict.status_code == codes.CONFLICT
+        assert conflict.json() == {'detail': 'Version conflict: 1 is at version 2, not 1'}
+
+
+@pytest.mark.asyncio
+async def test_complete_task(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.complete_task.side_effect = [
+        Task(
+            id=1,
+            title='Task',
+            created_at=datetime(2023, 10, 1, tzinfo=UTC),
+            description=None,
+            priority=None,
+            due_date=None,
+            completed_at=datetime(2023, 10, 2, tzinfo=UTC),
+            status=TaskStatus.COMPLETED,
+            version=2,
+        ),
+        VersionConflictError(1, 1, 2),
+    ]
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.post('/tasks/complete/1', params={'version': 1})
+        conflict = await client.post('/tasks/complete/1', params={'version': 1})
+
+        assert response.status_code == codes.OK
+        assert response.json()['status'] == TaskStatus.COMPLETED
+        assert conflict.status_code == codes.CONFLICT
+        mock_service.complete_task.assert_called_with(1, 1)
+
+
+@pytest.mark.asyncio
+async def test_complete_tasks(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.complete_tasks.side_effect = [[1, 3], BatchTooLargeError(3, 2)]
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.post('/tasks/complete', json={'ids': [1, 2, 3]})
+        too_large = await client.post('/tasks/complete', json={'ids': [1, 2, 3]})
+        empty = await client.post('/tasks/complete', json={'ids': []})
+
+        assert response.status_code == codes.OK
+        assert response.json() == {'completed': [1, 3]}
+        assert too_large.status_code == codes.REQUEST_ENTITY_TOO_LARGE
+        assert empty.status_code == codes.UNPROCESSABLE_ENTITY
+        assert mock_service.complete_tasks.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_note(app: FastAPI, client: AsyncClient):
+    note = Note(id=1, title='Edited', content=None, created_at=datetime(2025, 5, 2, tzinfo=UTC), version=2)
+    mock_service = AsyncMock()
+    mock_service.update_note.side_effect = [note, note, NoteNotFoundError(999), VersionConflictError(1, 1, 2)]
+
+    async with override_note_service(app, mock_service):
+        put = await client.put('/notes/1', json={'title': 'Edited'})
+        patch = await client.patch('/notes/1', json={'title': 'Edited'})
+        missing = await client.patch('/notes/999', json={'title': 'Edited'})
+        conflict = await client.put('/notes/1', json={'title': 'Edited', 'version': 1})
+
+        assert put.status_code == patch.status_code == codes.OK
+        assert put.json()['version'] == 2
+        assert missing.status_code == codes.NOT_FOUND
+        assert conflict.status_code == codes.CONFLICT
+        assert mock_service.update_note.call_args_list[0].args == (1, NoteUpdate(title='Edited'))
+        assert mock_service.update_note.call_args_list[1].args == (1, NotePatch(title='Edited'))
+
+
+def _task(task_id: int, version: int = 1) -> Task:
+    return Task(
+        id=task_id,
+        title=f'Task {task_id}',
+        created_at=datetime(2025, 5, 2, tzinfo=UTC),
+        description=None,
+        priority=None,
+        due_date=None,
+        completed_at=None,
+        version=version,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_etag_follows_the_page(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_tasks_page.side_effect = [
+        Page([_task(1), _task(2)]),
+        Page([_task(1), _task(2)]),
+        Page([_task(1), _task(2, version=2)]),
+        Page([_task(1), _task(2)], next_cursor='abc'),
+    ]
+
+    async with override_tasks_service(app, mock_service):
+        first = await client.get('/tasks')
+        same = await client.get('/tasks')
+        updated = await client.get('/tasks')
+        more = await client.get('/tasks')
+
+        assert first.headers['ETag'].startswith('W/"tasks-')
+        assert same.headers['ETag'] == first.headers['ETag']
+        assert updated.headers['ETag'] != first.headers['ETag']
+        assert more.headers['ETag'] not in (first.headers['ETag'], updated.headers['ETag'])
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_not_modified(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_tasks_page.return_value = Page([_task(1)])
+    mock_service.get_tasks_page_versions.return_value = Page([_task(1)])
+
+    async with override_tasks_service(app, mock_service):
+        first = await client.get('/tasks')
+        etag = first.headers['ETag']
+        response = await client.get('/tasks', headers={'If-None-Match': f'"other", {etag}'})
+
+        assert response.status_code == codes.NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['ETag'] == etag
+        mock_service.get_tasks_page.assert_called_once()
+        mock_service.get_tasks_page_versions.assert_called_once_with(limit=100, after=None, filters=ANY, sort=ANY)
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_stale_etag(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_tasks_page.side_effect = [Page([_task(1)]), Page([_task(1, version=2)])]
+    mock_service.get_tasks_page_versions.return_value = Page([_task(1, version=2)])
+
+    async with override_tasks_service(app, mock_service):
+        first = await client.get('/tasks')
+        response = await client.get('/tasks', headers={'If-None-Match': first.headers['ETag']})
+
+        assert response.status_code == codes.OK
+        assert response.headers['ETag'] != first.headers['ETag']
+        assert response.json()[0]['version'] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_note_etag_is_the_notes_version(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_note.return_value = Note(
+        id=1, title='Test Note 1', content=None, created_at=datetime(2023, 10, 1, tzinfo=UTC), version=3
+    )
+
+    async with override_note_service(app, mock_service):
+        not_modified = await client.get('/notes/1', headers={'If-None-Match': 'W/"note-1-3"'})
+        modified = await client.get('/notes/1', headers={'If-None-Match': 'W/"note-1-2"'})
+
+        assert not_modified.status_code == codes.NOT_MODIFIED
+        assert not_modified.headers['ETag'] == 'W/"note-1-3"'
+        assert modified.status_code == codes.OK
+        assert modified.headers['ETag'] == 'W/"note-1-3"'
+
+
+@pytest.mark.asyncio
+async def test_get_missing_task_with_any_etag_is_not_found(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_task.side_effect = TaskNotFoundError(999)
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.get('/tasks/999', headers={'If-None-Match': '*'})
+
+        assert response.status_code == codes.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_search_notes_by_tag(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.search_notes.return_value = Page([])
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes/search', params={'tag': 'work'})
+
+        assert response.status_code == codes.OK
+        assert response.json() == []
+        mock_service.search_notes.assert_called_once_with(None, limit=100, after=None, tag='work')
+
+
+@pytest.mark.asyncio
+async def test_search_notes_requires_text_or_tag(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+
+    async with override_note_service(app, mock_service):
+        response = await client.get('/notes/search')
+
+        assert response.status_code == codes.BAD_REQUEST
+        assert response.json() == {'detail': 'text or tag is required'}
+        mock_service.search_notes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_by_tag(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_tasks_page.return_value = Page(
+        [
+            Task(
+                id=1,
+                title='Tagged Task',
+                created_at=datetime(2023, 10, 1),
+                description=None,
+                priority=None,
+                due_date=None,
+                completed_at=None,
+                tags=['work'],
+            )
+        ]
+    )
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.get('/tasks', params={'tag': 'work'})
+
+        assert response.status_code == codes.OK
+        assert response.json()[0]['tags'] == ['work']
+        mock_service.get_tasks_page.assert_called_once_with(
+            limit=100, after=None, filters=TaskFilter(tag='work'), sort=TaskSort.ID
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_filtered_and_sorted(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_tasks_page.return_value = Page([])
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.get(
+            '/tasks',
+            params={
+                'status': 'PENDING',
+                'priority_min': 2,
+                'priority_max': 4,
+                'due_after': '2023-10-01T00:00:00Z',
+                'due_before': '2023-11-01T00:00:00Z',
+                'sort': '-due_date',
+            },
+        )
+
+        assert response.status_code == codes.OK
+        mock_service.get_tasks_page.assert_called_once_with(
+            limit=100,
+            after=None,
+            filters=TaskFilter(
+                status=TaskStatus.PENDING,
+                priority_min=2,
+                priority_max=4,
+                due_after=datetime(2023, 10, 1, tzinfo=UTC),
+                due_before=datetime(2023, 11, 1, tzinfo=UTC),
+            ),
+            sort=TaskSort.DUE_DATE_DESC,
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_invalid_sort(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.get('/tasks', params={'sort': 'title'})
+
+        assert response.status_code == codes.UNPROCESSABLE_ENTITY
+        mock_service.get_tasks_page.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_tag_task(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.tag_task.return_value = Task(
+        id=1,
+        title='Tagged Task',
+        created_at=datetime(2023, 10, 1),
+        description=None,
+        priority=None,
+        due_date=None,
+        completed_at=None,
+        tags=['work'],
+    )
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.put('/tasks/1/tag/7')
+
+        assert response.status_code == codes.OK
+        assert response.json()['tags'] == ['work']
+        mock_service.tag_task.assert_called_once_with(1, 7)
+
+
+@pytest.mark.asyncio
+async def test_tag_note_tag_not_found(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.tag_note.side_effect = TagNotFoundError(7)
+
+    async with override_note_service(app, mock_service):
+        response = await client.put('/notes/1/tag/7')
+
+        assert response.status_code == codes.NOT_FOUND
+        assert response.json() == {'detail': 'Tag not found: 7'}
+
+
+@pytest.mark.asyncio
+async def test_tag_note_note_not_found(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.tag_note.side_effect = NoteNotFoundError(1)
+
+    async with override_note_service(app, mock_service):
+        response = await client.put('/notes/1/tag/7')
+
+        assert response.status_code == codes.NOT_FOUND
+        assert response.json() == {'detail': 'Note not found: 1'}
+
+
+@pytest.mark.asyncio
+async def test_create_tag(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.create_tag.return_value = Tag(id=1, name='work', created_at=datetime(2023, 10, 1))
+
+    async with override_tags_service(app, mock_service):
+        response = await client.post('/tags', json={'name': 'work'})
+
+        assert response.status_code == codes.OK
+        assert response.json() == {'id': 1, 'name': 'work', 'created_at': '2023-10-01T00:00:00'}
+        mock_service.create_tag.assert_called_once_with(TagCreate(name='work'))
+
+
+@pytest.mark.asyncio
+async def test_create_tag_conflict(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.create_tag.side_effect = TagAlreadyExistsError('work')
+
+    async with override_tags_service(app, mock_service):
+        response = await client.post('/tags', json={'name': 'work'})
+
+        assert response.status_code == codes.CONFLICT
+        assert response.json() == {'detail': 'Tag already exists: work'}
+
+
+@pytest.mark.asyncio
+async def test_get_tags(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_tags.return_value = [
+        Tag(id=2, name='home', created_at=datetime(2023, 10, 2)),
+        Tag(id=1, name='work', created_at=datetime(2023, 10, 1)),
+    ]
+
+    async with override_tags_service(app, mock_service):
+        response = await client.get('/tags')
+
+        assert response.status_code == codes.OK
+        assert [tag['name'] for tag in response.json()] == ['home', 'work']
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_due_soon(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_tasks_due_soon.return_value = [
+        Task(
+            id=1,
+            title='Due Task',
+            created_at=datetime(2023, 10, 1),
+            description=None,
+            priority=None,
+            due_date=datetime(2023, 10, 2),
+            completed_at=None,
+        )
+    ]
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.get('/tasks/due-soon', params={'hours': 48})
+
+        assert response.status_code == codes.OK
+        assert [task['title'] for task in response.json()] == ['Due Task']
+        mock_service.get_tasks_due_soon.assert_called_once_with(limit=100, hours=48)
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_due_soon_window_out_of_range(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+
+    async with override_tasks_service(app, mock_service):
+        response = await client.get('/tasks/due-soon', params={'hours': 0})
+
+        assert response.status_code == codes.UNPROCESSABLE_ENTITY
+        mock_service.get_tasks_due_soon.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_analytics_summary(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_summary.return_value = AnalyticsSummary(
+        total_tasks=8,
+        total_notes=12,
+        completed_tasks=3,
+        completion_rate=0.375,
+        tasks_per_day=0.8,
+        notes_per_day=1.2,
+        tasks_by_status={TaskStatus.NEW: 5, TaskStatus.COMPLETED: 3},
+        since=date(2025, 5, 1),
+    )
+
+    async with override_analytics_service(app, mock_service):
+        response = await client.get('/analytics/summary')
+
+        assert response.status_code == codes.OK
+        assert response.json() == {
+            'total_tasks': 8,
+            'total_notes': 12,
+            'completed_tasks': 3,
+            'completion_rate': 0.375,
+            'tasks_per_day': 0.8,
+            'notes_per_day': 1.2,
+            'tasks_by_status': {'NEW': 5, 'COMPLETED': 3},
+            'since': '2025-05-01',
+        }
+
+
+@pytest.mark.asyncio
+async def test_get_task_days(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_task_days.return_value = [TaskDay(date(2025, 5, 1), created=4, completed=1)]
+
+    async with override_analytics_service(app, mock_service):
+        response = await client.get('/analytics/tasks/daily', params={'start': '2025-05-01', 'end': '2025-05-01'})
+
+        assert response.status_code == codes.OK
+        assert response.json() == [{'day': '2025-05-01', 'created': 4, 'completed': 1}]
+        mock_service.get_task_days.assert_called_once_with(date(2025, 5, 1), date(2025, 5, 1))
+
+
+@pytest.mark.asyncio
+async def test_get_note_days(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_note_days.return_value = [NoteDay(date(2025, 5, 1), created=2)]
+
+    async with override_analytics_service(app, mock_service):
+        response = await client.get('/analytics/notes/daily')
+
+        assert response.status_code == codes.OK
+        assert response.json() == [{'day': '2025-05-01', 'created': 2}]
+        mock_service.get_note_days.assert_called_once_with(None, None)
+
+
+@pytest.mark.asyncio
+async def test_get_task_days_invalid_range(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_task_days.side_effect = InvalidDateRangeError(date(2025, 5, 2), date(2025, 5, 1), 366)
+
+    async with override_analytics_service(app, mock_service):
+        response = await client.get('/analytics/tasks/daily', params={'start': '2025-05-02', 'end': '2025-05-01'})
+
+        assert response.status_code == codes.BAD_REQUEST
+        assert response.json() == {'detail': 'Invalid date range: 2025-05-02 to 2025-05-01, at most 366 days'}
+
+
+@pytest.mark.asyncio
+async def test_get_view_completion(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_view_completion.return_value = Snapshot(
+        TaskCompletion(total_tasks=4, completed_tasks=1, completion_rate=0.25),
+        refreshed_at=datetime(2025, 5, 1, 10, 0, tzinfo=UTC),
+        staleness_seconds=42.5,
+    )
+
+    async with override_analytics_service(app, mock_service):
+        response = await client.get('/analytics/views/completion')
+
+        assert response.status_code == codes.OK
+        assert response.json() == {
+            'refreshed_at': '2025-05-01T10:00:00Z',
+            'staleness_seconds': 42.5,
+            'data': {'total_tasks': 4, 'completed_tasks': 1, 'completion_rate': 0.25},
+        }
+
+
+@pytest.mark.asyncio
+async def test_get_view_task_days(app: FastAPI, client: AsyncClient):
+    mock_service = AsyncMock()
+    mock_service.get_view_task_days.return_value = Snapshot([TaskDay(date(2025, 5, 1), created=3)])
+
+    async with override_analytics_service(app, mock_service):
+        response = await client.get('/analytics/views/tasks/daily', params={'start': '2025-05-01', 'end': '2025-05-01'})
+
+        assert response.status_code == codes.OK
+        assert response.json() == {
+            'refreshed_at': None,
+            'staleness_seconds': None,
+            'data': [{'day': '2025-05-01', 'created': 3, 'completed': 0}],
+        }
+        mock_service.get_view_task_days.assert_called_once_with(date(2025, 5, 1), date(2025, 5, 1))
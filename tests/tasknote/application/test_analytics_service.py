@@ -0,0 +1,134 @@
+# tests/tasknote/application/test_analytics_service.py
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.common.timeutils import now_ist
+from src.tasknote.application.analytics_service import AnalyticsService
+from src.tasknote.constants import default_analytics_days
+from src.tasknote.domain.exceptions import InvalidDateRangeError
+from src.tasknote.domain.models import AnalyticsTotals, NoteDay, Snapshot, TaskCompletion, TaskDay, TaskStatus
+
+
+@pytest.mark.asyncio
+async def test_get_summary():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_totals.return_value = AnalyticsTotals(
+        tasks_by_status={TaskStatus.NEW: 5, TaskStatus.COMPLETED: 3, TaskStatus.CANCELLED: 0},
+        notes=12,
+        first_day=now_ist().date() - timedelta(days=9),
+    )
+    analytics_service = AnalyticsService(repository=mock_repository)
+
+    # Act
+    summary = await analytics_service.get_summary()
+
+    # Assert
+    assert summary.total_tasks == 8
+    assert summary.total_notes == 12
+    assert summary.completed_tasks == 3
+    assert summary.completion_rate == 0.375
+    assert summary.tasks_per_day == 0.8
+    assert summary.notes_per_day == 1.2
+
+
+@pytest.mark.asyncio
+async def test_get_summary_without_activity():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_totals.return_value = AnalyticsTotals(tasks_by_status={}, notes=0)
+    analytics_service = AnalyticsService(repository=mock_repository)
+
+    # Act
+    summary = await analytics_service.get_summary()
+
+    # Assert
+    assert summary.total_tasks == 0
+    assert summary.completion_rate == 0.0
+    assert summary.tasks_per_day == 0.0
+    assert summary.since is None
+
+
+@pytest.mark.asyncio
+async def test_get_task_days_fills_idle_days():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_task_days.return_value = [TaskDay(date(2025, 5, 2), created=4, completed=1)]
+    analytics_service = AnalyticsService(repository=mock_repository)
+
+    # Act
+    days = await analytics_service.get_task_days(date(2025, 5, 1), date(2025, 5, 3))
+
+    # Assert
+    assert days == [
+        TaskDay(date(2025, 5, 1)),
+        TaskDay(date(2025, 5, 2), created=4, completed=1),
+        TaskDay(date(2025, 5, 3)),
+    ]
+    mock_repository.get_task_days.assert_called_once_with(date(2025, 5, 1), date(2025, 5, 3))
+
+
+@pytest.mark.asyncio
+async def test_get_note_days_defaults_to_recent_days():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_note_days.return_value = [NoteDay(now_ist().date(), created=2)]
+    analytics_service = AnalyticsService(repository=mock_repository)
+
+    # Act
+    days = await analytics_service.get_note_days()
+
+    # Assert
+    assert len(days) == default_analytics_days
+    assert days[-1] == NoteDay(now_ist().date(), created=2)
+    assert all(day.created == 0 for day in days[:-1])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ('start', 'end'),
+    [(date(2025, 5, 2), date(2025, 5, 1)), (date(2024, 1, 1), date(2025, 1, 1))],
+)
+async def test_get_task_days_invalid_range(start, end):
+    # Arrange
+    mock_repository = AsyncMock()
+    analytics_service = AnalyticsService(repository=mock_repository)
+
+    # Act & Assert
+    with pytest.raises(InvalidDateRangeError):
+        await analytics_service.get_task_days(start, end)
+    mock_repository.get_task_days.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_view_completion_reports_staleness():
+    # Arrange
+    mock_repository = AsyncMock()
+    completion = TaskCompletion(total_tasks=4, completed_tasks=1, completion_rate=0.25)
+    mock_repository.get_view_completion.return_value = Snapshot(completion, now_ist() - timedelta(minutes=5))
+    analytics_service = AnalyticsService(repository=mock_repository)
+
+    # Act
+    snapshot = await analytics_service.get_view_completion()
+
+    # Assert
+    assert snapshot.data == completion
+    assert 300 <= snapshot.staleness_seconds < 310
+
+
+@pytest.mark.asyncio
+async def test_get_view_task_days_fills_idle_days():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_view_task_days.return_value = Snapshot([TaskDay(date(2025, 5, 2), created=1)])
+    analytics_service = AnalyticsService(repository=mock_repository)
+
+    # Act
+    snapshot = await analytics_service.get_view_task_days(date(2025, 5, 1), date(2025, 5, 2))
+
+    # Assert
+    assert snapshot.data == [TaskDay(date(2025, 5, 1)), TaskDay(date(2025, 5, 2), created=1)]
+    assert snapshot.refreshed_at is None
+    assert snapshot.staleness_seconds is None
@@ -0,0 +1,28 @@
+# tests/tasknote/application/test_jobs.py
+import asyncio
+
+import pytest
+
+from src.tasknote.application.jobs import run_every
+
+
+@pytest.mark.asyncio
+async def test_run_every_survives_failing_runs():
+    # Arrange
+    runs = []
+
+    async def job():
+        runs.append(len(runs))
+        if len(runs) == 1:
+            raise RuntimeError('boom')
+
+    # Act
+    scheduled = asyncio.create_task(run_every(0.01, job, 'test'))
+    while len(runs) < 3:
+        await asyncio.sleep(0.01)
+    scheduled.cancel()
+
+    # Assert
+    with pytest.raises(asyncio.CancelledError):
+        await scheduled
+    assert len(runs) >= 3
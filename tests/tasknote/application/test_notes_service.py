@@ -5,10 +5,11 @@ from unittest.mock import AsyncMock
 import pytest
 
 from src.common.timeutils import now_ist
-from src.tasknote.api.schemas import NoteCreate
+from src.tasknote.api.schemas import NoteCreate, NotePatch, NoteUpdate
 from src.tasknote.application.note_service import NoteService
-from src.tasknote.domain.exceptions import NoteNotFoundError
-from src.tasknote.domain.models import Note
+from src.tasknote.domain.exceptions import BatchTooLargeError, NoteNotFoundError, VersionConflictError
+from src.tasknote.domain.models import Note, Page
+from src.tasknote.settings import get_settings
 
 
 @pytest.mark.asyncio
@@ -51,6 +52,39 @@ async def test_create_note_without_content():
     assert isinstance(note.created_at, datetime)
 
 
+@pytest.mark.asyncio
+async def test_create_notes_calls_add_notes():
+    # Arrange
+    mock_repository = AsyncMock()
+    note_service = NoteService(repository=mock_repository)
+    note_creates = [NoteCreate(title='Bulk Note 1', content='First'), NoteCreate(title='Bulk Note 2')]
+
+    # Act
+    await note_service.create_notes(note_creates)
+
+    # Assert
+    mock_repository.add_notes.assert_called_once()
+    args, _ = mock_repository.add_notes.call_args
+    assert len(args) == 1
+    notes = args[0]
+    assert [note.title for note in notes] == ['Bulk Note 1', 'Bulk Note 2']
+    assert [note.content for note in notes] == ['First', None]
+
+
+@pytest.mark.asyncio
+async def test_create_notes_rejects_oversized_batch(monkeypatch):
+    # Arrange
+    mock_repository = AsyncMock()
+    note_service = NoteService(repository=mock_repository)
+    monkeypatch.setattr(get_settings(), 'bulk_max_batch_size', 1)
+
+    # Act & Assert
+    with pytest.raises(BatchTooLargeError):
+        await note_service.create_notes([NoteCreate(title='One'), NoteCreate(title='Two')])
+
+    mock_repository.add_notes.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_note_returns_note():
     # Arrange
@@ -83,22 +117,23 @@ async def test_get_note_propagates_not_found_error():
 
 
 @pytest.mark.asyncio
-async def test_get_all_notes():
+async def test_get_notes_page():
     # Arrange
     mock_repository = AsyncMock()
     mock_notes = [
         Note(id=1, title='Test Note 1', content='This is test note 1.', created_at=now_ist()),
         Note(id=2, title='Test Note 2', content='This is test note 2.', created_at=now_ist()),
     ]
-    mock_repository.get_all.return_value = mock_notes
+    mock_repository.get_page.return_value = Page(mock_notes, next_cursor='cursor')
     note_service = NoteService(repository=mock_repository)
 
     # Act
-    result = await note_service.get_all_notes()
+    result = await note_service.get_notes_page(limit=2, after='previous')
 
     # Assert
-    assert result == mock_notes
-    mock_repository.get_all.assert_called_once()
+    assert result.items == mock_notes
+    assert result.next_cursor == 'cursor'
+    mock_repository.get_page.assert_called_once_with(limit=2, after='previous')
 
 
 @pytest.mark.asyncio
@@ -128,3 +163,70 @@ async def test_delete_note_propagates_not_found_error():
 
     mock_repository.delete_note.assert_called_once_with(1)
     assert 'Note not found: 1' in str(excinfo.value)
+
+
+@pytest.mark.asyncio
+async def test_update_note():
+    # Arrange
+    mock_repository = AsyncMock()
+    note_service = NoteService(repository=mock_repository)
+
+    # Act
+    await note_service.update_note(1, NoteUpdate(title='Replaced', version=2))
+    await note_service.update_note(1, NotePatch(content='Patched'))
+
+    # Assert
+    assert mock_repository.update_note.call_args_list[0].args == (1, {'title': 'Replaced', 'content': None}, 2)
+    assert mock_repository.update_note.call_args_list[1].args == (1, {'content': 'Patched'}, None)
+
+
+@pytest.mark.asyncio
+async def test_empty_patch_checks_note_version():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_note.return_value = Note(id=1, title='Note', content=None, created_at=now_ist(), version=3)
+    note_service = NoteService(repository=mock_repository)
+
+    # Act
+    current = await note_service.update_note(1, NotePatch(version=3))
+    with pytest.raises(VersionConflictError) as conflict:
+        await note_service.update_note(1, NotePatch(version=2))
+
+    # Assert
+    assert current.version == 3
+    assert (conflict.value.expected, conflict.value.actual) == (2, 3)
+    mock_repository.update_note.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_notes():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_notes = [Note(id=1, title='Kayak trip', content=None, created_at=now_ist())]
+    mock_repository.search.return_value = Page(mock_notes, next_cursor='cursor')
+    note_service = NoteService(repository=mock_repository)
+
+    # Act
+    result = await note_service.search_notes('kayak', limit=1, after='previous')
+
+    # Assert
+    assert result.items == mock_notes
+    assert result.next_cursor == 'cursor'
+    mock_repository.search.assert_called_once_with('kayak', limit=1, after='previous', tag=None)
+
+
+@pytest.mark.asyncio
+async def test_tag_note():
+    # Arrange
+    mock_repository = AsyncMock()
+    tagged_note = Note(id=1, title='Tagged Note', content=None, created_at=now_ist(), tags=['work'])
+    mock_repository.get_note.return_value = tagged_note
+    note_service = NoteService(repository=mock_repository)
+
+    # Act
+    result = await note_service.tag_note(1, 7)
+
+    # Assert
+    assert result == tagged_note
+    mock_repository.add_tag.assert_called_once_with(1, 7)
+    mock_repository.get_note.assert_called_once_with(1)
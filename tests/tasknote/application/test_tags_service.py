@@ -0,0 +1,55 @@
+# tests/tasknote/application/test_tags_service.py
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.common.timeutils import now_ist
+from src.tasknote.api.schemas import TagCreate
+from src.tasknote.application.tags_service import TagsService
+from src.tasknote.domain.exceptions import TagAlreadyExistsError
+from src.tasknote.domain.models import Tag
+
+
+@pytest.mark.asyncio
+async def test_create_tag_calls_add_tag():
+    # Arrange
+    mock_repository = AsyncMock()
+    tags_service = TagsService(repository=mock_repository)
+
+    # Act
+    await tags_service.create_tag(TagCreate(name='work'))
+
+    # Assert
+    mock_repository.add_tag.assert_called_once()
+    (tag,) = mock_repository.add_tag.call_args.args
+    assert tag.name == 'work'
+    assert tag.id is None
+    assert tag.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_create_tag_already_exists():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.add_tag.side_effect = TagAlreadyExistsError('work')
+    tags_service = TagsService(repository=mock_repository)
+
+    # Act & Assert
+    with pytest.raises(TagAlreadyExistsError):
+        await tags_service.create_tag(TagCreate(name='work'))
+
+
+@pytest.mark.asyncio
+async def test_get_tags():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_tags = [Tag(id=1, name='home', created_at=now_ist()), Tag(id=2, name='work', created_at=now_ist())]
+    mock_repository.get_tags.return_value = mock_tags
+    tags_service = TagsService(repository=mock_repository)
+
+    # Act
+    result = await tags_service.get_tags()
+
+    # Assert
+    assert result == mock_tags
+    mock_repository.get_tags.assert_called_once()
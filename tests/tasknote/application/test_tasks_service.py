@@ -5,10 +5,11 @@ from unittest.mock import AsyncMock
 import pytest
 
 from src.common.timeutils import now_ist
-from src.tasknote.api.schemas import TaskCreate
+from src.tasknote.api.schemas import TaskCreate, TaskPatch, TaskUpdate
 from src.tasknote.application.tasks_service import TasksService
-from src.tasknote.domain.exceptions import TaskNotFoundError
-from src.tasknote.domain.models import Task, TaskStatus
+from src.tasknote.domain.exceptions import BatchTooLargeError, TaskNotFoundError, VersionConflictError
+from src.tasknote.domain.models import Page, Task, TaskFilter, TaskSort, TaskStatus
+from src.tasknote.settings import get_settings
 
 
 @pytest.mark.asyncio
@@ -64,6 +65,44 @@ async def test_create_task_minimal():
     assert isinstance(task.created_at, datetime)
 
 
+@pytest.mark.asyncio
+async def test_create_tasks_calls_add_tasks():
+    # Arrange
+    mock_repository = AsyncMock()
+    tasks_service = TasksService(repository=mock_repository)
+    task_creates = [TaskCreate(title='Bulk Task 1', priority=1), TaskCreate(title='Bulk Task 2')]
+
+    # Act
+    await tasks_service.create_tasks(task_creates)
+
+    # Assert
+    mock_repository.add_tasks.assert_called_once()
+    args, _ = mock_repository.add_tasks.call_args
+    assert len(args) == 1
+    tasks = args[0]
+    assert [task.title for task in tasks] == ['Bulk Task 1', 'Bulk Task 2']
+    assert tasks[0].priority == 1
+    assert all(task.status == TaskStatus.NEW for task in tasks)
+    assert all(task.id is None for task in tasks)
+    assert tasks[0].created_at == tasks[1].created_at
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_rejects_oversized_batch(monkeypatch):
+    # Arrange
+    mock_repository = AsyncMock()
+    tasks_service = TasksService(repository=mock_repository)
+    monkeypatch.setattr(get_settings(), 'bulk_max_batch_size', 2)
+    task_creates = [TaskCreate(title=f'Bulk Task {i}') for i in range(3)]
+
+    # Act & Assert
+    with pytest.raises(BatchTooLargeError) as excinfo:
+        await tasks_service.create_tasks(task_creates)
+
+    assert excinfo.value.message == 'Batch too large: 3 > 2'
+    mock_repository.add_tasks.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_task_returns_task():
     # Arrange
@@ -105,7 +144,7 @@ async def test_get_task_propagates_not_found_error():
 
 
 @pytest.mark.asyncio
-async def test_get_all_tasks():
+async def test_get_tasks_page():
     # Arrange
     mock_repository = AsyncMock()
     mock_tasks = [
@@ -130,15 +169,17 @@ async def test_get_all_tasks():
             status=TaskStatus.PENDING,
         ),
     ]
-    mock_repository.get_all.return_value = mock_tasks
+    mock_repository.get_page.return_value = Page(mock_tasks, next_cursor='cursor')
     tasks_service = TasksService(repository=mock_repository)
 
     # Act
-    result = await tasks_service.get_all_tasks()
+    filters = TaskFilter(status=TaskStatus.NEW)
+    result = await tasks_service.get_tasks_page(limit=2, after='previous', filters=filters, sort=TaskSort.PRIORITY)
 
     # Assert
-    assert result == mock_tasks
-    mock_repository.get_all.assert_called_once()
+    assert result.items == mock_tasks
+    assert result.next_cursor == 'cursor'
+    mock_repository.get_page.assert_called_once_with(limit=2, after='previous', filters=filters, sort=TaskSort.PRIORITY)
 
 
 @pytest.mark.asyncio
@@ -168,3 +209,190 @@ async def test_delete_task_propagates_not_found_error():
 
     mock_repository.delete_task.assert_called_once_with(1)
     assert 'Task not found: 1' in str(excinfo.value)
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.delete_tasks.return_value = [1, 3]
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    result = await tasks_service.delete_tasks([1, 2, 3])
+
+    # Assert
+    assert result == [1, 3]
+    mock_repository.delete_tasks.assert_called_once_with([1, 2, 3])
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_rejects_oversized_batch(monkeypatch):
+    # Arrange
+    mock_repository = AsyncMock()
+    tasks_service = TasksService(repository=mock_repository)
+    monkeypatch.setattr(get_settings(), 'bulk_max_batch_size', 2)
+
+    # Act & Assert
+    with pytest.raises(BatchTooLargeError):
+        await tasks_service.delete_tasks([1, 2, 3])
+
+    mock_repository.delete_tasks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_patch_task_writes_only_set_fields():
+    # Arrange
+    mock_repository = AsyncMock()
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    await tasks_service.update_task(1, TaskPatch(priority=2, version=3))
+
+    # Assert
+    mock_repository.update_task.assert_called_once_with(1, {'priority': 2}, 3)
+
+
+@pytest.mark.asyncio
+async def test_put_task_writes_every_field():
+    # Arrange
+    mock_repository = AsyncMock()
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    await tasks_service.update_task(1, TaskUpdate(title='Replaced', status=TaskStatus.COMPLETED))
+
+    # Assert
+    args, _ = mock_repository.update_task.call_args
+    task_id, changes, version = args
+    assert (task_id, version) == (1, None)
+    assert changes.keys() == {'title', 'description', 'priority', 'due_date', 'status', 'completed_at'}
+    assert isinstance(changes['completed_at'], datetime)
+
+
+@pytest.mark.asyncio
+async def test_empty_patch_reads_task():
+    # Arrange
+    mock_repository = AsyncMock()
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    await tasks_service.update_task(1, TaskPatch())
+
+    # Assert
+    mock_repository.get_task.assert_called_once_with(1)
+    mock_repository.update_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_empty_patch_checks_version():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_task.return_value = Task(
+        id=1,
+        title='Task',
+        created_at=now_ist(),
+        description=None,
+        priority=None,
+        due_date=None,
+        completed_at=None,
+        version=3,
+    )
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    current = await tasks_service.update_task(1, TaskPatch(version=3))
+    with pytest.raises(VersionConflictError) as conflict:
+        await tasks_service.update_task(1, TaskPatch(version=2))
+
+    # Assert
+    assert current.version == 3
+    assert (conflict.value.expected, conflict.value.actual) == (2, 3)
+    mock_repository.update_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_complete_tasks():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.complete_tasks.return_value = [1]
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    result = await tasks_service.complete_tasks([1, 2])
+
+    # Assert
+    assert result == [1]
+    args, _ = mock_repository.complete_tasks.call_args
+    assert args[0] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_complete_tasks_rejects_oversized_batch(monkeypatch):
+    # Arrange
+    mock_repository = AsyncMock()
+    tasks_service = TasksService(repository=mock_repository)
+    monkeypatch.setattr(get_settings(), 'bulk_max_batch_size', 2)
+
+    # Act & Assert
+    with pytest.raises(BatchTooLargeError):
+        await tasks_service.complete_tasks([1, 2, 3])
+
+    mock_repository.complete_tasks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_tag_task():
+    # Arrange
+    mock_repository = AsyncMock()
+    tagged_task = Task(
+        id=1,
+        title='Tagged Task',
+        created_at=now_ist(),
+        description=None,
+        priority=None,
+        due_date=None,
+        completed_at=None,
+        tags=['work'],
+    )
+    mock_repository.get_task.return_value = tagged_task
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    result = await tasks_service.tag_task(1, 7)
+
+    # Assert
+    assert result == tagged_task
+    mock_repository.add_tag.assert_called_once_with(1, 7)
+    mock_repository.get_task.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_due_soon_default_window():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_due_between.return_value = []
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    await tasks_service.get_tasks_due_soon(limit=10)
+
+    # Assert
+    start, end = mock_repository.get_due_between.call_args.args
+    assert end - start == timedelta(hours=get_settings().due_soon_window_hours)
+    assert mock_repository.get_due_between.call_args.kwargs == {'limit': 10}
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_due_soon_custom_window():
+    # Arrange
+    mock_repository = AsyncMock()
+    mock_repository.get_due_between.return_value = []
+    tasks_service = TasksService(repository=mock_repository)
+
+    # Act
+    await tasks_service.get_tasks_due_soon(limit=10, hours=2)
+
+    # Assert
+    start, end = mock_repository.get_due_between.call_args.args
+    assert end - start == timedelta(hours=2)
@@ -11,12 +11,19 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import NullPool
 from testcontainers.postgres import PostgresContainer
 
-from src.tasknote.api.dependencies import get_note_service, get_tasks_service
+from src.tasknote.api.dependencies import (
+    get_analytics_service,
+    get_db_session,
+    get_note_service,
+    get_tags_service,
+    get_tasks_service,
+)
 from src.tasknote.api.router import router
 from src.tasknote.logger import log
-from src.tasknote.persistence.db import get_db_session
+from src.tasknote.persistence.analytics_repository import AnalyticsRepository
 from src.tasknote.persistence.entities import Base
 from src.tasknote.persistence.note_repository import NotesRepository
+from src.tasknote.persistence.tags_repository import TagsRepository
 from src.tasknote.persistence.tasks_repository import TasksRepository
 
 
@@ -80,6 +87,22 @@ async def tasks_repository(session):
     return TasksRepository(session)
 
 
+@pytest.fixture
+async def tags_repository(session):
+    """
+    Create a TagsRepository instance for testing.
+    """
+    return TagsRepository(session)
+
+
+@pytest.fixture
+async def analytics_repository(session):
+    """
+    Create an AnalyticsRepository instance for testing.
+    """
+    return AnalyticsRepository(session)
+
+
 @pytest.fixture
 def app() -> FastAPI:
     """
@@ -137,3 +160,27 @@ async def override_tasks_service(app: FastAPI, mock_service):
         yield
     finally:
         app.dependency_overrides.clear()
+
+
+@asynccontextmanager
+async def override_tags_service(app: FastAPI, mock_service):
+    """
+    Context manager to override the tags service for tests.
+    """
+    app.dependency_overrides[get_tags_service] = lambda: mock_service
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+
+
+@asynccontextmanager
+async def override_analytics_service(app: FastAPI, mock_service):
+    """
+    Context manager to override the analytics service for tests.
+    """
+    app.dependency_overrides[get_analytics_service] = lambda: mock_service
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,237 @@
+# tests/tasknote/persistence/test_analytics_repository.py
+import asyncio
+import random
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.common.timeutils import IST
+from src.tasknote.domain.models import Note, NoteDay, Task, TaskDay, TaskStatus
+from src.tasknote.persistence.entities import TaskDailyCountEntity, TaskEntity
+from src.tasknote.persistence.mappers import tasks
+from src.tasknote.persistence.rollups import count_tasks, task_delta
+from src.tasknote.persistence.views import materialized_views
+
+
+def _quiet_day() -> datetime:
+    # a day in the distant past that no other test writes to, at 23:30 IST so UTC still sees the day before
+    return datetime(1900 + random.randrange(100), 1, 1, 23, 30, tzinfo=IST) + timedelta(days=random.randrange(300))
+
+
+def _task(created_at: datetime, status: TaskStatus = TaskStatus.NEW, completed_at: datetime | None = None) -> Task:
+    return Task(
+        title='Counted Task',
+        created_at=created_at,
+        description=None,
+        priority=None,
+        due_date=None,
+        completed_at=completed_at,
+        status=status,
+    )
+
+
+async def _add_task_uncommitted(conn: AsyncConnection, task: Task) -> None:
+    # what TasksRepository.add_task does, short of committing
+    inserted = insert(TaskEntity).values(tasks.to_values(task)).returning(*TaskEntity.__table__.c).cte('inserted')
+    counts = count_tasks(task_delta(1, inserted.c.created_at, inserted.c.completed_at, inserted.c.status))
+    await conn.execute(select(inserted.c.id).add_cte(counts))
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_writes_keep_rollups_current(analytics_repository, tasks_repository, notes_repository):
+    # Arrange
+    day = _quiet_day()
+    before = await analytics_repository.get_totals()
+
+    # Act
+    added = await tasks_repository.add_tasks(
+        [_task(day), _task(day), _task(day, TaskStatus.COMPLETED, completed_at=day + timedelta(days=1))]
+    )
+    extra = await tasks_repository.add_task(_task(day))
+    await tasks_repository.delete_task(extra.id)
+    await tasks_repository.delete_tasks([added[0].id])
+    note = await notes_repository.add_note(Note(title='Counted Note', content=None, created_at=day))
+    await notes_repository.add_notes([Note(title='Counted Note', content=None, created_at=day)])
+    await notes_repository.delete_note(note.id)
+    after = await analytics_repository.get_totals()
+
+    # Assert
+    assert await analytics_repository.get_task_days(day.date(), day.date() + timedelta(days=1)) == [
+        TaskDay(day.date(), created=2, completed=0),
+        TaskDay(day.date() + timedelta(days=1), created=0, completed=1),
+    ]
+    assert await analytics_repository.get_note_days(day.date(), day.date()) == [NoteDay(day.date(), created=1)]
+    assert after.tasks_by_status[TaskStatus.NEW] == before.tasks_by_status.get(TaskStatus.NEW, 0) + 1
+    assert after.tasks_by_status[TaskStatus.COMPLETED] == before.tasks_by_status.get(TaskStatus.COMPLETED, 0) + 1
+    assert after.notes == before.notes + 1
+    assert after.first_day <= day.date()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_updates_move_rollup_counts(analytics_repository, tasks_repository):
+    # Arrange
+    day = _quiet_day()
+    done = day + timedelta(days=2)
+    added = await tasks_repository.add_tasks([_task(day), _task(day), _task(day, TaskStatus.PENDING)])
+    before = await analytics_repository.get_totals()
+
+    # Act
+    await tasks_repository.complete_tasks([task.id for task in added], done)
+    await tasks_repository.complete_tasks([added[0].id], done + timedelta(days=1))
+    await tasks_repository.update_task(added[1].id, {'status': TaskStatus.NEW, 'completed_at': None})
+    after = await analytics_repository.get_totals()
+
+    # Assert
+    assert await analytics_repository.get_task_days(day.date(), done.date() + timedelta(days=1)) == [
+        TaskDay(day.date(), created=3, completed=0),
+        TaskDay(done.date(), created=0, completed=2),
+    ]
+    assert after.tasks_by_status[TaskStatus.COMPLETED] == before.tasks_by_status.get(TaskStatus.COMPLETED, 0) + 2
+    assert after.tasks_by_status.get(TaskStatus.PENDING, 0) == before.tasks_by_status[TaskStatus.PENDING] - 1
+    assert after.tasks_by_status.get(TaskStatus.NEW, 0) == before.tasks_by_status[TaskStatus.NEW] - 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_fold_moves_deltas_into_rollups(analytics_repository, tasks_repository, session):
+    # Arrange
+    day = _quiet_day()
+    added = await tasks_repository.add_tasks([_task(day), _task(day)])
+    await tasks_repository.complete_tasks([added[0].id], day)
+    unfolded = await analytics_repository.get_task_days(day.date(), day.date())
+
+    # Act
+    folded = await analytics_repository.fold()
+
+    # Assert
+    assert folded
+    assert unfolded == [TaskDay(day.date(), created=2, completed=1)]
+    assert await analytics_repository.get_task_days(day.date(), day.date()) == unfolded
+    rollup = await session.get(TaskDailyCountEntity, day.date())
+    assert (rollup.created, rollup.completed) == (2, 1)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_writers_do_not_wait_on_each_other(tasks_repository, db_engine):
+    # Arrange: another writer has added a task on the same day but not yet committed
+    day = _quiet_day()
+    async with db_engine.connect() as conn:
+        await _add_task_uncommitted(conn, _task(day))
+
+        # Act: a writer counting into the same rollups goes ahead rather than wait for it
+        added = await asyncio.wait_for(tasks_repository.add_task(_task(day)), timeout=1)
+        await conn.commit()
+
+    # Assert
+    assert added.id is not None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift(analytics_repository, tasks_repository, session):
+    # Arrange
+    day = _quiet_day()
+    await tasks_repository.add_tasks([_task(day), _task(day)])
+    await analytics_repository.fold()
+    totals = await analytics_repository.get_totals()
+    await session.execute(
+        update(TaskDailyCountEntity).where(TaskDailyCountEntity.day == day.date()).values(created=999)
+    )
+    await session.commit()
+
+    # Act
+    reconciled = await analytics_repository.reconcile()
+
+    # Assert
+    assert reconciled
+    assert await analytics_repository.get_task_days(day.date(), day.date()) == [TaskDay(day.date(), created=2)]
+    assert await analytics_repository.get_totals() == totals  # the incremental counts agree with a full recount
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_reconcile_keeps_concurrent_writes(analytics_repository, tasks_repository, session, db_engine):
+    # Arrange: the day's count has drifted, and a writer has added a task and its delta but not yet committed
+    day = _quiet_day()
+    await tasks_repository.add_tasks([_task(day)])
+    await analytics_repository.fold()
+    await session.execute(
+        update(TaskDailyCountEntity).where(TaskDailyCountEntity.day == day.date()).values(created=999)
+    )
+    await session.commit()
+    async with db_engine.connect() as conn:
+        await _add_task_uncommitted(conn, _task(day))
+
+        # Act: the reconcile sees neither the task nor its delta, and leaves the delta to the next fold
+        reconciled = await analytics_repository.reconcile()
+        await conn.commit()
+
+    # Assert
+    assert reconciled
+    assert await analytics_repository.get_task_days(day.date(), day.date()) == [TaskDay(day.date(), created=2)]
+    await analytics_repository.fold()
+    assert await analytics_repository.get_task_days(day.date(), day.date()) == [TaskDay(day.date(), created=2)]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_reconcile_skips_when_already_running(analytics_repository, db_engine):
+    async with db_engine.connect() as conn:
+        # Arrange: another process holds the reconcile lock
+        await conn.execute(select(func.pg_advisory_xact_lock(func.hashtext('reconcile_analytics'))))
+
+        # Act
+        reconciled = await analytics_repository.reconcile()
+        folded = await analytics_repository.fold()
+
+    # Assert
+    assert not reconciled
+    assert not folded
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_views_show_data_as_of_refresh(analytics_repository, tasks_repository, notes_repository):
+    # Arrange
+    day = _quiet_day()
+    await tasks_repository.add_tasks([_task(day), _task(day, TaskStatus.COMPLETED, completed_at=day)])
+    await notes_repository.add_note(Note(title='Viewed Note', content=None, created_at=day))
+
+    # Act
+    stale = await analytics_repository.get_view_task_days(day.date(), day.date())
+    for name in materialized_views:
+        assert await analytics_repository.refresh_view(name)
+    task_days = await analytics_repository.get_view_task_days(day.date(), day.date())
+    note_days = await analytics_repository.get_view_note_days(day.date(), day.date())
+    completion = await analytics_repository.get_view_completion()
+
+    # Assert
+    assert stale.data == []
+    assert task_days.data == [TaskDay(day.date(), created=2, completed=1)]
+    assert task_days.refreshed_at is not None
+    assert note_days.data == [NoteDay(day.date(), created=1)]
+    assert completion.data.completed_tasks >= 1
+    assert completion.data.completion_rate == round(completion.data.completed_tasks / completion.data.total_tasks, 4)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_refresh_view_skips_when_already_refreshing(analytics_repository, db_engine):
+    async with db_engine.connect() as conn:
+        # Arrange: another process holds the view's refresh lock
+        await conn.execute(select(func.pg_advisory_xact_lock(func.hashtext('mv_task_completion'))))
+
+        # Act
+        refreshed = await analytics_repository.refresh_view('mv_task_completion')
+
+    # Assert
+    assert not refreshed
+    with pytest.raises(ValueError, match='Unknown materialized view'):
+        await analytics_repository.refresh_view('mv_missing')
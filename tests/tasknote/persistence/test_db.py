@@ -0,0 +1,74 @@
+# tests/tasknote/persistence/test_db.py
+import pytest
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import create_async_engine
+from structlog.testing import capture_logs
+
+from src.common.logger import track_queries
+from src.tasknote.metrics import db_query_duration
+from src.tasknote.persistence.db import instrument, normalize_sql
+
+
+def _observed(statement: str) -> int:
+    counts, _ = db_query_duration.values.get((statement,), ([0], [0.0]))
+    return sum(counts)
+
+
+@pytest.fixture
+async def instrumented_engine(db_engine, setup_db):
+    engine = create_async_engine(db_engine.url)
+    # every statement counts as slow
+    instrument(engine, slow_query_seconds=1e-9)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_statements_are_timed_by_type(instrumented_engine):
+    # Arrange
+    selects, others = _observed('SELECT'), _observed('OTHER')
+
+    # Act
+    async with instrumented_engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+        await conn.execute(text('  select 2'))
+        await conn.execute(text('SHOW server_version'))
+        with pytest.raises(ProgrammingError):
+            await conn.execute(text('SELECT * FROM no_such_table'))
+
+    # Assert: the failed statement is timed too
+    assert _observed('SELECT') == selects + 3
+    assert _observed('OTHER') >= others + 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_statements_are_counted_and_slow_ones_logged(instrumented_engine):
+    # Act
+    with capture_logs() as logs, track_queries() as stats:
+        async with instrumented_engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+            await conn.execute(text("SELECT  'x'"))
+
+    # Assert
+    assert stats.statements == 2
+    assert stats.seconds > 0
+    slow = [entry['statement'] for entry in logs if entry['event'] == 'Slow query']
+    assert slow == ['SELECT ?', 'SELECT ?']
+
+
+def test_normalize_sql():
+    # Arrange
+    statement = """
+        SELECT tasks.id FROM tasks
+        WHERE tasks.id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER) AND tasks.title != 'it''s' LIMIT 10
+    """
+
+    # Act
+    normalized = normalize_sql(statement)
+
+    # Assert
+    assert normalized == 'SELECT tasks.id FROM tasks WHERE tasks.id IN (?) AND tasks.title != ? LIMIT ?'
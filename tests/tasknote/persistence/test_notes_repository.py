@@ -1,11 +1,16 @@
 # tests/tasknote/persistence/test_notes_repository.py
 import asyncio
+import uuid
 
 import pytest
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.cache import LRUCache
 from src.common.timeutils import now_ist
-from src.tasknote.domain.exceptions import NoteNotFoundError
-from src.tasknote.domain.models import Note
+from src.tasknote.domain.exceptions import InvalidCursorError, NoteNotFoundError, VersionConflictError
+from src.tasknote.domain.models import Note, Tag
+from src.tasknote.persistence.note_repository import NotesRepository
 
 
 @pytest.fixture(scope='session')
@@ -28,22 +33,75 @@ async def test_add_note(notes_repository):
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_get_all_notes(notes_repository):
+async def test_add_notes(notes_repository):
+    created_at = now_ist()
+    new_notes = [
+        Note(title='Bulk Note 1', content='First', created_at=created_at),
+        Note(title='Bulk Note 2', content=None, created_at=created_at),
+    ]
+
+    added_notes = await notes_repository.add_notes(new_notes)
+
+    assert [note.title for note in added_notes] == ['Bulk Note 1', 'Bulk Note 2']
+    assert [note.content for note in added_notes] == ['First', None]
+    assert all(note.id is not None for note in added_notes)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_page_walks_all_notes(notes_repository):
     note1 = Note(title='Note 1', content='Content 1', created_at=now_ist())
     note2 = Note(title='Note 2', content='Content 2', created_at=now_ist())
+    note3 = Note(title='Note 3', content='Content 3', created_at=now_ist())
     await notes_repository.add_note(note1)
     await notes_repository.add_note(note2)
+    await notes_repository.add_note(note3)
 
-    notes = await notes_repository.get_all()
+    notes = []
+    after = None
+    while True:
+        page = await notes_repository.get_page(limit=2, after=after)
+        versions = await notes_repository.get_page_versions(limit=2, after=after)
+        assert [(row.id, row.version) for row in versions.items] == [(note.id, note.version) for note in page.items]
+        assert versions.next_cursor == page.next_cursor
+        assert len(page.items) <= 2
+        notes.extend(page.items)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
 
-    assert len(notes) >= 2  # More robust check
+    ids = [note.id for note in notes]
+    assert ids == sorted(set(ids))  # keyset order, no duplicates across pages
     titles = [note.title for note in notes]
     contents = [note.content for note in notes]
 
     assert 'Note 1' in titles
     assert 'Note 2' in titles
+    assert 'Note 3' in titles
     assert 'Content 1' in contents
     assert 'Content 2' in contents
+    assert 'Content 3' in contents
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_page_invalid_cursor(notes_repository):
+    with pytest.raises(InvalidCursorError):
+        await notes_repository.get_page(limit=2, after='not-a-cursor')
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_stream_notes(notes_repository):
+    added_note = await notes_repository.add_note(Note(title='Streamed Note', content=None, created_at=now_ist()))
+    first_page = await notes_repository.get_page(limit=1)
+
+    notes = [note async for note in notes_repository.stream()]
+    remaining = [note async for note in notes_repository.stream(after=first_page.next_cursor)]
+
+    assert [note.id for note in notes] == sorted(note.id for note in notes)
+    assert added_note.id in [note.id for note in notes]
+    assert [note.id for note in remaining] == [note.id for note in notes[1:]]
 
 
 @pytest.mark.integration
@@ -104,3 +162,156 @@ async def test_delete_note_not_found(notes_repository):
 
     assert str(non_existent_id) in str(excinfo.value)
     assert 'Note not found' in str(excinfo.value)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_note_does_not_cache_a_row_deleted_while_it_was_read(session, db_engine):
+    # Arrange
+    class DeletedBeforeSet(LRUCache):
+        async def set(self, key, value, since=None):
+            # another request's delete commits between this miss's read and its set
+            await writer.delete_note(value.id)
+            await super().set(key, value, since)
+
+    cache = DeletedBeforeSet(max_size=10, ttl_seconds=60)
+    writer_session = AsyncSession(db_engine, expire_on_commit=False)
+    writer = NotesRepository(writer_session, cache=cache)
+    notes_repository = NotesRepository(session, cache=cache)
+    added_note = await notes_repository.add_note(Note(title='Racing Note', content=None, created_at=now_ist()))
+
+    # Act
+    await notes_repository.get_note(added_note.id)
+    await writer_session.close()
+
+    # Assert
+    assert await cache.get(f'note:{added_note.id}') is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_note_read_through_cache(session):
+    # Arrange
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    notes_repository = NotesRepository(session, cache=cache)
+    added_note = await notes_repository.add_note(Note(title='Cached Note', content=None, created_at=now_ist()))
+
+    # Act
+    await notes_repository.get_note(added_note.id)
+    cached_note = await notes_repository.get_note(added_note.id)
+
+    # Assert
+    assert cached_note.title == 'Cached Note'
+    assert cache.stats().hits == 1
+
+    # Deleting invalidates the cached entry
+    await notes_repository.delete_note(added_note.id)
+    with pytest.raises(NoteNotFoundError):
+        await notes_repository.get_note(added_note.id)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_update_note(notes_repository):
+    # Arrange
+    added_note = await notes_repository.add_note(Note(title='Draft', content='body', created_at=now_ist()))
+
+    # Act
+    updated = await notes_repository.update_note(added_note.id, {'title': 'Final'}, expected_version=1)
+
+    # Assert
+    assert updated.title == 'Final'
+    assert updated.content == 'body'
+    assert updated.version == 2
+    with pytest.raises(VersionConflictError):
+        await notes_repository.update_note(added_note.id, {'title': 'Stale'}, expected_version=1)
+    with pytest.raises(NoteNotFoundError):
+        await notes_repository.update_note(-1, {'title': 'Missing'})
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_search_ranks_and_pages(notes_repository):
+    created_at = now_ist()
+    await notes_repository.add_notes(
+        [
+            Note(title='Kayak trip', content='Pack the paddles', created_at=created_at),
+            Note(title='Groceries', content='Buy a kayak strap and kayaking gloves', created_at=created_at),
+            Note(title='Groceries', content='Buy milk', created_at=created_at),
+            Note(title='Kayak repair', content=None, created_at=created_at),
+        ]
+    )
+
+    found = []
+    after = None
+    while True:
+        page = await notes_repository.search('kayak', limit=1, after=after)
+        versions = await notes_repository.search_versions('kayak', limit=1, after=after)
+        assert [(row.id, row.version) for row in versions.items] == [(note.id, note.version) for note in page.items]
+        assert versions.next_cursor == page.next_cursor
+        assert len(page.items) <= 1
+        found.extend(page.items)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+
+    # stemming matches 'kayaking', title matches outrank content matches, 'Buy milk' is left out
+    assert len(found) == 3
+    assert len({note.id for note in found}) == 3
+    assert {note.title for note in found[:2]} == {'Kayak trip', 'Kayak repair'}
+    assert found[2].content == 'Buy a kayak strap and kayaking gloves'
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_search_web_syntax(notes_repository):
+    created_at = now_ist()
+    await notes_repository.add_notes(
+        [
+            Note(title='Standup meeting', content='Daily sync', created_at=created_at),
+            Note(title='Meeting notes', content='Quarterly planning', created_at=created_at),
+        ]
+    )
+
+    page = await notes_repository.search('meeting -quarterly', limit=10)
+
+    assert [note.title for note in page.items] == ['Standup meeting']
+    assert page.next_cursor is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_search_invalid_cursor(notes_repository):
+    with pytest.raises(InvalidCursorError):
+        await notes_repository.search('kayak', limit=2, after='not-a-cursor')
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_search_by_tag(notes_repository, tags_repository):
+    created_at = now_ist()
+    trip, shopping, _ = await notes_repository.add_notes(
+        [
+            Note(title='Canoe trip', content='Pack the paddles', created_at=created_at),
+            Note(title='Canoe shopping', content='Buy a canoe strap', created_at=created_at),
+            Note(title='Canoe repair', content=None, created_at=created_at),
+        ]
+    )
+    outdoors = await tags_repository.add_tag(Tag(name=f'outdoors-{uuid.uuid4().hex[:8]}', created_at=created_at))
+    await notes_repository.add_tag(trip.id, outdoors.id)
+    await notes_repository.add_tag(shopping.id, outdoors.id)
+
+    by_tag = []
+    after = None
+    while True:
+        page = await notes_repository.search(None, limit=1, after=after, tag=outdoors.name)
+        by_tag.extend(page.items)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+    by_text_and_tag = await notes_repository.search('paddles', limit=10, tag=outdoors.name)
+
+    assert [note.id for note in by_tag] == [shopping.id, trip.id]
+    assert all(note.tags == [outdoors.name] for note in by_tag)
+    assert [note.id for note in by_text_and_tag.items] == [trip.id]
+    assert (await notes_repository.get_note(trip.id)).tags == [outdoors.name]
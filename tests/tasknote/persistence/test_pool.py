@@ -0,0 +1,55 @@
+# tests/tasknote/persistence/test_pool.py
+import pytest
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.tasknote.persistence.pool import InstrumentedAsyncQueuePool
+
+
+@pytest.fixture
+async def pooled_engine(db_engine, setup_db):
+    engine = create_async_engine(
+        db_engine.url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts(pooled_engine):
+    async with pooled_engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+        stats = pooled_engine.pool.stats()
+        assert stats.checked_out == 1
+        assert stats.checkouts == 1
+
+    stats = pooled_engine.pool.stats()
+    assert stats.size == 1
+    assert stats.checked_out == 0
+    assert stats.checked_in == 1
+    assert stats.overflow == 0
+    assert stats.max_overflow == 0
+    assert stats.timeouts == 0
+    assert stats.checkout_time_max_ms >= 0
+    assert stats.checkout_time_total_ms >= stats.checkout_time_max_ms
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_pool_stats_count_timeouts(pooled_engine):
+    async with pooled_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            async with pooled_engine.connect():
+                pass
+
+    stats = pooled_engine.pool.stats()
+    assert stats.timeouts == 1
+    assert stats.checkouts == 1  # the one that timed out handed out no connection
+    assert stats.checkout_time_max_ms < 100  # nor is its 100 ms wait in the checkout time
@@ -0,0 +1,55 @@
+# tests/tasknote/persistence/test_tags_repository.py
+import asyncio
+import uuid
+
+import pytest
+
+from src.common.timeutils import now_ist
+from src.tasknote.domain.exceptions import TagAlreadyExistsError
+from src.tasknote.domain.models import Tag
+
+
+@pytest.fixture(scope='session')
+async def event_loop():
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+def _unique(name: str) -> str:
+    # tag names are unique across the whole test database
+    return f'{name}-{uuid.uuid4().hex[:8]}'
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_add_tag(tags_repository):
+    name = _unique('work')
+
+    added_tag = await tags_repository.add_tag(Tag(name=name, created_at=now_ist()))
+
+    assert added_tag.id is not None
+    assert added_tag.name == name
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_add_tag_duplicate(tags_repository):
+    name = _unique('home')
+    await tags_repository.add_tag(Tag(name=name, created_at=now_ist()))
+
+    with pytest.raises(TagAlreadyExistsError):
+        await tags_repository.add_tag(Tag(name=name, created_at=now_ist()))
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_tags_sorted_by_name(tags_repository):
+    second = await tags_repository.add_tag(Tag(name=_unique('zz'), created_at=now_ist()))
+    first = await tags_repository.add_tag(Tag(name=_unique('aa'), created_at=now_ist()))
+
+    names = [tag.name for tag in await tags_repository.get_tags()]
+
+    assert names == sorted(names)
+    assert first.name in names
+    assert second.name in names
@@ -1,13 +1,28 @@
 # tests/tasknote/persistence/test_tasks_repository.py
 import asyncio
+import uuid
 
 from datetime import timedelta
 
 import pytest
 
+from annotated_types import Le
+from sqlalchemy import delete, event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.cache import LRUCache
 from src.common.timeutils import now_ist
-from src.tasknote.domain.exceptions import TaskNotFoundError
-from src.tasknote.domain.models import Task, TaskStatus
+from src.tasknote.domain.exceptions import (
+    InvalidCursorError,
+    TagNotFoundError,
+    TaskNotFoundError,
+    VersionConflictError,
+)
+from src.tasknote.domain.models import Tag, Task, TaskFilter, TaskSort, TaskStatus
+from src.tasknote.persistence.entities import TaskEntity
+from src.tasknote.persistence.rollups import count_tasks, task_delta
+from src.tasknote.persistence.tasks_repository import TasksRepository
+from src.tasknote.settings import TaskNoteSettings
 
 
 @pytest.fixture(scope='session')
@@ -19,7 +34,7 @@ async def event_loop():
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_add_task(tasks_repository):
+async def test_add_task(tasks_repository, session):
     created_at = now_ist()
     task = Task(
         title='Test Task',
@@ -30,8 +45,18 @@ async def test_add_task(tasks_repository):
         completed_at=None,
         status=TaskStatus.NEW,
     )
-    added_task = await tasks_repository.add_task(task)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
 
+    event.listen(session.bind.sync_engine, 'before_cursor_execute', record)
+    try:
+        added_task = await tasks_repository.add_task(task)
+    finally:
+        event.remove(session.bind.sync_engine, 'before_cursor_execute', record)
+
+    assert len(statements) == 1  # the insert, its rollup deltas and RETURNING in one round trip
     assert added_task.id is not None
     assert added_task.title == 'Test Task'
     assert added_task.description == 'This is a test task from tasks_repository.'
@@ -67,7 +92,58 @@ async def test_add_task_minimal(tasks_repository):
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_get_all_tasks(tasks_repository):
+async def test_add_tasks(tasks_repository):
+    created_at = now_ist()
+    new_tasks = [
+        Task(
+            title=f'Bulk Task {i}',
+            created_at=created_at,
+            description=None,
+            priority=i,
+            due_date=None,
+            completed_at=None,
+        )
+        for i in range(3)
+    ]
+
+    added_tasks = await tasks_repository.add_tasks(new_tasks)
+
+    assert [task.title for task in added_tasks] == ['Bulk Task 0', 'Bulk Task 1', 'Bulk Task 2']
+    assert [task.priority for task in added_tasks] == [0, 1, 2]
+    assert all(task.status == TaskStatus.NEW for task in added_tasks)
+    ids = [task.id for task in added_tasks]
+    assert None not in ids
+    assert ids == sorted(ids)
+    retrieved = await tasks_repository.get_task(ids[1])
+    assert retrieved.title == 'Bulk Task 1'
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_add_tasks_largest_allowed_batch(tasks_repository):
+    # Arrange: as many tasks as bulk_max_batch_size may ever allow, in one INSERT within the bind parameter limit
+    field = TaskNoteSettings.model_fields['bulk_max_batch_size']
+    (largest,) = [constraint.le for constraint in field.metadata if isinstance(constraint, Le)]
+    new_tasks = [_new_task(f'Largest Batch Task {i}') for i in range(largest)]
+
+    # Act
+    added = await tasks_repository.add_tasks(new_tasks)
+
+    # Assert
+    assert len(added) == largest
+    ids = [task.id for task in added]
+    assert sorted(await tasks_repository.delete_tasks(ids)) == ids
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_add_tasks_empty(tasks_repository):
+    assert await tasks_repository.add_tasks([]) == []
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_page_walks_all_tasks(tasks_repository):
     created_at = now_ist()
     task1 = Task(
         title='Task 1',
@@ -90,9 +166,18 @@ async def test_get_all_tasks(tasks_repository):
     await tasks_repository.add_task(task1)
     await tasks_repository.add_task(task2)
 
-    tasks = await tasks_repository.get_all()
-
-    assert len(tasks) >= 2  # More robust check
+    tasks = []
+    after = None
+    while True:
+        page = await tasks_repository.get_page(limit=1, after=after)
+        assert len(page.items) <= 1
+        tasks.extend(page.items)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+
+    ids = [task.id for task in tasks]
+    assert ids == sorted(set(ids))  # keyset order, no duplicates across pages
     titles = [task.title for task in tasks]
     descriptions = [task.description for task in tasks]
 
@@ -102,6 +187,29 @@ async def test_get_all_tasks(tasks_repository):
     assert 'Content 2' in descriptions
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_stream_tasks(tasks_repository):
+    created_at = now_ist()
+    task = Task(
+        title='Streamed Task',
+        created_at=created_at,
+        description=None,
+        priority=None,
+        due_date=None,
+        completed_at=None,
+        status=TaskStatus.PENDING,
+    )
+    added_task = await tasks_repository.add_task(task)
+
+    tasks = [task async for task in tasks_repository.stream()]
+
+    assert [task.id for task in tasks] == sorted(task.id for task in tasks)
+    streamed = next(task for task in tasks if task.id == added_task.id)
+    assert streamed.title == 'Streamed Task'
+    assert streamed.status == TaskStatus.PENDING
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_get_task(tasks_repository):
@@ -181,3 +289,449 @@ async def test_delete_task_not_found(tasks_repository):
 
     assert str(non_existent_id) in str(excinfo.value)
     assert 'Task not found' in str(excinfo.value)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_delete_tasks(tasks_repository):
+    # Arrange
+    created_at = now_ist()
+    added_tasks = await tasks_repository.add_tasks(
+        [
+            Task(
+                title=f'Bulk Delete Task {i}',
+                created_at=created_at,
+                description=None,
+                priority=None,
+                due_date=None,
+                completed_at=None,
+            )
+            for i in range(3)
+        ]
+    )
+    ids = [task.id for task in added_tasks]
+    non_existent_id = 9999  # Assuming this ID doesn't exist
+
+    # Act
+    deleted_ids = await tasks_repository.delete_tasks([ids[0], ids[2], non_existent_id])
+
+    # Assert
+    assert sorted(deleted_ids) == [ids[0], ids[2]]
+    with pytest.raises(TaskNotFoundError):
+        await tasks_repository.get_task(ids[0])
+    remaining = await tasks_repository.get_task(ids[1])
+    assert remaining.title == 'Bulk Delete Task 1'
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_task_read_through_cache(session):
+    # Arrange
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    tasks_repository = TasksRepository(session, cache=cache)
+    created_at = now_ist()
+    added_task = await tasks_repository.add_task(
+        Task(
+            title='Cached Task',
+            created_at=created_at,
+            description=None,
+            priority=None,
+            due_date=None,
+            completed_at=None,
+        )
+    )
+
+    # Act
+    first = await tasks_repository.get_task(added_task.id)
+    second = await tasks_repository.get_task(added_task.id)
+
+    # Assert
+    assert first.title == second.title == 'Cached Task'
+    stats = cache.stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+
+    # Deleting invalidates the cached entry
+    await tasks_repository.delete_task(added_task.id)
+    with pytest.raises(TaskNotFoundError):
+        await tasks_repository.get_task(added_task.id)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_task_does_not_cache_a_row_updated_while_it_was_read(session, db_engine):
+    # Arrange
+    class UpdatedBeforeSet(LRUCache):
+        async def set(self, key, value, since=None):
+            # another request's update commits between this miss's read and its set
+            await writer.update_task(value.id, {'title': 'Updated Task'})
+            await super().set(key, value, since)
+
+    cache = UpdatedBeforeSet(max_size=10, ttl_seconds=60)
+    writer_session = AsyncSession(db_engine, expire_on_commit=False)
+    writer = TasksRepository(writer_session, cache=cache)
+    tasks_repository = TasksRepository(session, cache=cache)
+    added_task = await tasks_repository.add_task(_new_task('Racing Task'))
+
+    # Act
+    stale = await tasks_repository.get_task(added_task.id)
+    await writer_session.close()
+
+    # Assert
+    assert stale.version == 1
+    assert await cache.get(f'task:{added_task.id}') is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_tagging_bumps_the_task_version(tasks_repository, tags_repository):
+    # Arrange
+    task = await tasks_repository.add_task(_new_task('Versioned Task'))
+    tag = await tags_repository.add_tag(Tag(name=f'versioned-{uuid.uuid4().hex[:8]}', created_at=now_ist()))
+
+    # Act
+    await tasks_repository.add_tag(task.id, tag.id)
+    tagged = await tasks_repository.get_task(task.id)
+
+    # Assert
+    assert task.version == 1
+    assert tagged.version == 2
+    assert tagged.tags == [tag.name]
+
+
+def _new_task(title: str) -> Task:
+    return Task(title=title, created_at=now_ist(), description=None, priority=None, due_date=None, completed_at=None)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_update_task_writes_given_columns(tasks_repository):
+    # Arrange
+    added_task = await tasks_repository.add_task(_new_task('Updated Task'))
+
+    # Act
+    updated = await tasks_repository.update_task(added_task.id, {'priority': 4}, expected_version=1)
+
+    # Assert
+    assert updated.priority == 4
+    assert updated.title == 'Updated Task'
+    assert updated.version == 2
+    assert await tasks_repository.get_task(added_task.id) == updated
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_update_task_conflict_and_not_found(tasks_repository):
+    # Arrange
+    added_task = await tasks_repository.add_task(_new_task('Contended Task'))
+    await tasks_repository.update_task(added_task.id, {'priority': 1})
+
+    # Act / Assert
+    with pytest.raises(VersionConflictError) as conflict:
+        await tasks_repository.update_task(added_task.id, {'priority': 2}, expected_version=1)
+    assert conflict.value.actual == 2
+    with pytest.raises(TaskNotFoundError):
+        await tasks_repository.update_task(-1, {'priority': 2})
+    assert (await tasks_repository.get_task(added_task.id)).priority == 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_complete_tasks(tasks_repository):
+    # Arrange
+    added = await tasks_repository.add_tasks([_new_task('Open Task'), _new_task('Open Task')])
+    ids = [task.id for task in added]
+    first_completed_at = now_ist() - timedelta(hours=1)
+
+    # Act
+    completed = await tasks_repository.complete_tasks([*ids, -1], first_completed_at)
+    repeated = await tasks_repository.complete_tasks(ids, now_ist())
+    again = await tasks_repository.update_task(ids[0], {'status': TaskStatus.COMPLETED, 'completed_at': now_ist()})
+
+    # Assert
+    assert sorted(completed) == sorted(ids)
+    assert repeated == []
+    assert again.status == TaskStatus.COMPLETED
+    assert again.completed_at == first_completed_at  # completing again keeps the first completion time
+    assert again.version == 3
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_reads_do_not_hydrate_entities(session):
+    # Arrange
+    tasks_repository = TasksRepository(session)
+    added_task = await tasks_repository.add_task(
+        Task(
+            title='Row Task',
+            created_at=now_ist(),
+            description=None,
+            priority=2,
+            due_date=None,
+            completed_at=None,
+            status=TaskStatus.PENDING,
+        )
+    )
+
+    # Act
+    fetched = await tasks_repository.get_task(added_task.id)
+    page = await tasks_repository.get_page(limit=1000)
+
+    # Assert
+    assert isinstance(fetched, Task)
+    assert fetched.status == TaskStatus.PENDING
+    assert added_task.id in [task.id for task in page.items]
+    assert len(session.identity_map) == 0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_tag_filter_and_batched_tag_loading(session, tasks_repository, tags_repository):
+    # Arrange
+    created_at = now_ist()
+    new_tasks = [
+        Task(
+            title=f'Tagged Task {i}',
+            created_at=created_at,
+            description=None,
+            priority=None,
+            due_date=None,
+            completed_at=None,
+        )
+        for i in range(3)
+    ]
+    added_tasks = await tasks_repository.add_tasks(new_tasks)
+    work = await tags_repository.add_tag(Tag(name=f'work-{uuid.uuid4().hex[:8]}', created_at=created_at))
+    urgent = await tags_repository.add_tag(Tag(name=f'urgent-{uuid.uuid4().hex[:8]}', created_at=created_at))
+    for task in added_tasks[:2]:
+        await tasks_repository.add_tag(task.id, work.id)
+    await tasks_repository.add_tag(added_tasks[0].id, urgent.id)
+    await tasks_repository.add_tag(added_tasks[0].id, urgent.id)  # tagging twice is a no-op
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # Act
+    event.listen(session.bind.sync_engine, 'before_cursor_execute', record)
+    try:
+        page = await tasks_repository.get_page(limit=1000, filters=TaskFilter(tag=work.name))
+    finally:
+        event.remove(session.bind.sync_engine, 'before_cursor_execute', record)
+
+    # Assert
+    assert [task.id for task in page.items] == [task.id for task in added_tasks[:2]]
+    assert page.items[0].tags == sorted([work.name, urgent.name])
+    assert page.items[1].tags == [work.name]
+    assert len(statements) == 2  # the page, then the tags of every task on it in one query
+    streamed = [task async for task in tasks_repository.stream(filters=TaskFilter(tag=urgent.name))]
+    assert [task.id for task in streamed] == [added_tasks[0].id]
+    assert (await tasks_repository.get_task(added_tasks[2].id)).tags == []
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_add_tag_not_found(tasks_repository, tags_repository):
+    tag = await tags_repository.add_tag(Tag(name=f'missing-{uuid.uuid4().hex[:8]}', created_at=now_ist()))
+    task = await tasks_repository.add_task(
+        Task(
+            title='Lonely Task', created_at=now_ist(), description=None, priority=None, due_date=None, completed_at=None
+        )
+    )
+
+    with pytest.raises(TaskNotFoundError):
+        await tasks_repository.add_tag(999999, tag.id)
+    with pytest.raises(TagNotFoundError):
+        await tasks_repository.add_tag(task.id, 999999)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_add_tag_racing_a_delete(tasks_repository, tags_repository, db_engine):
+    # Arrange: another transaction has deleted the task but not yet committed
+    tag = await tags_repository.add_tag(Tag(name=f'raced-{uuid.uuid4().hex[:8]}', created_at=now_ist()))
+    task = await tasks_repository.add_task(_new_task('Raced Task'))
+    async with AsyncSession(db_engine) as other:
+        stmt = delete(TaskEntity).where(TaskEntity.id == task.id)
+        deleted = stmt.returning(TaskEntity.created_at, TaskEntity.completed_at, TaskEntity.status).cte('deleted')
+        counts = count_tasks(task_delta(-1, deleted.c.created_at, deleted.c.completed_at, deleted.c.status))
+        await other.execute(select(deleted.c.status).add_cte(counts))
+
+        # Act: tagging waits for the delete, then finds the task gone
+        tagging = asyncio.create_task(tasks_repository.add_tag(task.id, tag.id))
+        await asyncio.sleep(0.2)
+        await other.commit()
+
+        # Assert
+        with pytest.raises(TaskNotFoundError):
+            await tagging
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_due_between(tasks_repository):
+    # Arrange
+    now = now_ist()
+    start, end = now + timedelta(days=300), now + timedelta(days=301)
+
+    def task(title: str, due_date, status: TaskStatus = TaskStatus.NEW) -> Task:
+        return Task(
+            title=title,
+            created_at=now,
+            description=None,
+            priority=None,
+            due_date=due_date,
+            completed_at=None,
+            status=status,
+        )
+
+    await tasks_repository.add_tasks(
+        [
+            task('Later', start + timedelta(hours=5), TaskStatus.PENDING),
+            task('Sooner', start + timedelta(hours=1)),
+            task('Done', start + timedelta(hours=2), TaskStatus.COMPLETED),
+            task('Dropped', start + timedelta(hours=3), TaskStatus.CANCELLED),
+            task('Outside', end + timedelta(hours=1)),
+            task('Undated', None),
+        ]
+    )
+
+    # Act
+    due = await tasks_repository.get_due_between(start, end, limit=10)
+    first = await tasks_repository.get_due_between(start, end, limit=1)
+
+    # Assert
+    assert [task.title for task in due] == ['Sooner', 'Later']
+    assert [task.title for task in first] == ['Sooner']
+
+
+async def _tagged_tasks(tasks_repository, tags_repository, specs) -> tuple[str, list[Task]]:
+    # the test database is shared, so each test scopes its listing to tasks carrying a fresh tag
+    now = now_ist()
+    tag = await tags_repository.add_tag(Tag(name=f'listing-{uuid.uuid4().hex[:8]}', created_at=now))
+    added = await tasks_repository.add_tasks(
+        [
+            Task(
+                title=f'Listed {i}',
+                created_at=now,
+                description=None,
+                priority=priority,
+                due_date=None if days is None else now + timedelta(days=days),
+                completed_at=None,
+                status=status,
+            )
+            for i, (priority, days, status) in enumerate(specs)
+        ]
+    )
+    for task in added:
+        await tasks_repository.add_tag(task.id, tag.id)
+    return tag.name, added
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_page_filters(tasks_repository, tags_repository):
+    # Arrange
+    tag, added = await _tagged_tasks(
+        tasks_repository,
+        tags_repository,
+        [
+            (1, 1, TaskStatus.NEW),
+            (3, 2, TaskStatus.PENDING),
+            (5, 3, TaskStatus.PENDING),
+            (None, None, TaskStatus.PENDING),
+        ],
+    )
+    now = now_ist()
+
+    async def titles(**criteria) -> list[str]:
+        page = await tasks_repository.get_page(limit=100, filters=TaskFilter(tag=tag, **criteria))
+        return [task.title for task in page.items]
+
+    # Act / Assert
+    assert await titles() == [task.title for task in added]
+    assert await titles(status=TaskStatus.PENDING) == ['Listed 1', 'Listed 2', 'Listed 3']
+    assert await titles(priority_min=2) == ['Listed 1', 'Listed 2']
+    assert await titles(priority_max=3) == ['Listed 0', 'Listed 1']
+    assert await titles(due_after=added[1].due_date) == ['Listed 1', 'Listed 2']
+    assert await titles(due_before=added[1].due_date) == ['Listed 0']
+    assert await titles(status=TaskStatus.PENDING, priority_min=2, due_before=now + timedelta(days=10)) == [
+        'Listed 1',
+        'Listed 2',
+    ]
+    streamed = [task.title async for task in tasks_repository.stream(filters=TaskFilter(tag=tag, priority_min=4))]
+    assert streamed == ['Listed 2']
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize('sort', list(TaskSort))
+async def test_get_page_walks_every_sort(tasks_repository, tags_repository, sort):
+    # Arrange: ties and NULLs in both keys, so pages must split inside runs of equal values
+    tag, added = await _tagged_tasks(
+        tasks_repository,
+        tags_repository,
+        [
+            (2, 5, TaskStatus.NEW),
+            (None, 1, TaskStatus.NEW),
+            (2, None, TaskStatus.NEW),
+            (1, 5, TaskStatus.NEW),
+            (None, None, TaskStatus.NEW),
+            (3, 2, TaskStatus.NEW),
+            (2, None, TaskStatus.NEW),
+        ],
+    )
+    column = sort.value.lstrip('-')
+
+    def ascending(task: Task):
+        # PostgreSQL's ascending order: NULLs last, ties broken by id
+        value = getattr(task, column)
+        return value is None, value if value is not None else 0, task.id
+
+    expected = sorted(added, key=ascending, reverse=sort.value.startswith('-'))
+    filters = TaskFilter(tag=tag)
+
+    # Act
+    walked = []
+    after = None
+    while True:
+        page = await tasks_repository.get_page(limit=2, after=after, filters=filters, sort=sort)
+        versions = await tasks_repository.get_page_versions(limit=2, after=after, filters=filters, sort=sort)
+        assert [(row.id, row.version) for row in versions.items] == [(task.id, task.version) for task in page.items]
+        assert versions.next_cursor == page.next_cursor
+        walked.extend(page.items)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+    streamed = [task async for task in tasks_repository.stream(filters=filters, sort=sort)]
+
+    # Assert
+    assert [task.id for task in walked] == [task.id for task in expected]
+    assert [task.id for task in streamed] == [task.id for task in expected]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_page_rejects_cursor_of_another_sort(tasks_repository, tags_repository):
+    # Arrange
+    tag, _ = await _tagged_tasks(tasks_repository, tags_repository, [(1, 1, TaskStatus.NEW), (2, 2, TaskStatus.NEW)])
+    filters = TaskFilter(tag=tag)
+    page = await tasks_repository.get_page(limit=1, filters=filters, sort=TaskSort.PRIORITY)
+
+    # Act / Assert
+    with pytest.raises(InvalidCursorError):
+        await tasks_repository.get_page(limit=1, after=page.next_cursor, filters=filters, sort=TaskSort.DUE_DATE)
+    with pytest.raises(InvalidCursorError):
+        await tasks_repository.get_page(limit=1, after=page.next_cursor, filters=filters)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_sorted_page_uses_index(session):
+    # Act
+    await session.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = await session.execute(text('EXPLAIN SELECT * FROM tasks ORDER BY priority DESC, id DESC LIMIT 10'))
+
+    # Assert
+    assert 'ix_tasks_priority_id' in '\n'.join(row[0] for row in plan)
@@ -0,0 +1,43 @@
+# tests/tasknote/test_container.py
+import pytest
+
+from src.tasknote.constants import workers_env
+from src.tasknote.container import Container
+
+
+@pytest.mark.asyncio
+async def test_engine_built_on_first_use_and_disposed():
+    # Arrange
+    container = Container()
+    assert 'engine' not in vars(container)
+
+    # Act
+    engine = container.engine
+    same_engine = container.engine
+    await container.dispose()
+
+    # Assert
+    assert same_engine is engine
+    assert 'engine' not in vars(container)
+    assert 'session_factory' not in vars(container)
+    assert container.engine is not engine  # the next use builds a fresh one
+    await container.dispose()
+
+
+@pytest.mark.asyncio
+async def test_dispose_without_engine():
+    container = Container()
+
+    await container.dispose()
+
+    assert 'engine' not in vars(container)
+
+
+@pytest.mark.parametrize(('workers', 'cached'), [('1', True), ('4', False)])
+def test_caches_only_with_one_worker(monkeypatch, workers, cached):
+    # a worker's cache cannot see the writes of the others
+    monkeypatch.setenv(workers_env, workers)
+    container = Container()
+
+    assert (container.task_cache is not None) is cached
+    assert (container.note_cache is not None) is cached
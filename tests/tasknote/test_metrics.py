@@ -0,0 +1,86 @@
+# tests/tasknote/test_metrics.py
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.tasknote.constants import metrics_dir_env
+from src.tasknote.metrics import http_requests, render_metrics, share_metrics
+from src.tasknote.persistence.pool import PoolStats
+
+
+def _pool_stats(checkouts: int) -> PoolStats:
+    return PoolStats(
+        size=5,
+        checked_in=4,
+        checked_out=1,
+        overflow=0,
+        max_overflow=10,
+        checkouts=checkouts,
+        timeouts=0,
+        checkout_time_total_ms=0.0,
+        checkout_time_max_ms=0.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_render_metrics_adds_in_the_other_workers(tmp_path, monkeypatch):
+    # Arrange: another worker, still running, has shared its metrics
+    monkeypatch.setenv(metrics_dir_env, str(tmp_path))
+    http_requests.inc('GET', '/peer-test', '200')
+    share_metrics(tmp_path, _pool_stats(checkouts=7))
+    (tmp_path / f'{os.getpid()}.json').rename(tmp_path / f'{os.getppid()}.json')
+    (tmp_path / '2.json').write_text('{"tasknote_db_pool_checkouts_total": [[[], 1')  # half written
+
+    # Act
+    lines = (await render_metrics(_pool_stats(checkouts=3), share_seconds=5.0)).splitlines()
+
+    # Assert
+    assert 'tasknote_http_requests_total{method="GET",route="/peer-test",status="200"} 2' in lines
+    assert 'tasknote_db_pool_checkouts_total 10' in lines
+    assert 'tasknote_db_pool_checked_out 2' in lines
+
+
+@pytest.mark.asyncio
+async def test_render_metrics_drops_the_gauges_of_a_crashed_worker(tmp_path, monkeypatch):
+    # Arrange: a worker shared its metrics, then died without its final share
+    monkeypatch.setenv(metrics_dir_env, str(tmp_path))
+    share_metrics(tmp_path, _pool_stats(checkouts=7))
+    dead = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True, check=True)
+    (tmp_path / f'{os.getpid()}.json').rename(tmp_path / f'{int(dead.stdout)}.json')
+
+    # Act
+    lines = (await render_metrics(_pool_stats(checkouts=3), share_seconds=5.0)).splitlines()
+
+    # Assert: its counters still count, its gauges no longer do
+    assert 'tasknote_db_pool_checkouts_total 10' in lines
+    assert 'tasknote_db_pool_checked_out 1' in lines
+
+
+@pytest.mark.asyncio
+async def test_render_metrics_drops_the_gauges_of_a_worker_that_stopped_sharing(tmp_path, monkeypatch):
+    # Arrange: the file's pid is a running process, but nothing has shared to it for a while: a reused pid
+    monkeypatch.setenv(metrics_dir_env, str(tmp_path))
+    share_metrics(tmp_path, _pool_stats(checkouts=7))
+    path = (tmp_path / f'{os.getpid()}.json').rename(tmp_path / f'{os.getppid()}.json')
+    shared_at = time.time() - 16
+    os.utime(path, (shared_at, shared_at))
+
+    # Act
+    lines = (await render_metrics(_pool_stats(checkouts=3), share_seconds=5.0)).splitlines()
+
+    # Assert
+    assert 'tasknote_db_pool_checkouts_total 10' in lines
+    assert 'tasknote_db_pool_checked_out 1' in lines
+
+
+def test_final_share_leaves_out_gauges(tmp_path):
+    share_metrics(tmp_path, _pool_stats(checkouts=7), final=True)
+
+    dumped = json.loads((tmp_path / f'{os.getpid()}.json').read_text())
+    assert dumped['tasknote_db_pool_checkouts_total'] == [[[], 7]]
+    assert 'tasknote_db_pool_checked_out' not in dumped
+    assert 'tasknote_http_requests_in_flight' not in dumped
@@ -0,0 +1,112 @@
+# tests/tasknote/test_seed.py
+from collections import Counter
+
+import pytest
+
+from sqlalchemy import delete, func, select
+
+from src.common.timeutils import now_ist
+from src.tasknote.domain.models import TaskStatus
+from src.tasknote.persistence.entities import TaskEntity
+from src.tasknote.seed import (
+    TASK_COLUMNS,
+    SeedProfile,
+    copy_rows,
+    note_rows,
+    parse_mix,
+    parse_range,
+    parse_share,
+    task_rows,
+)
+
+
+def test_parse_mix():
+    assert parse_mix('NEW=40, COMPLETED=60', TaskStatus) == {TaskStatus.NEW: 40, TaskStatus.COMPLETED: 60}
+    assert parse_mix('0=1,4=3,none=1', int) == {0: 1, 4: 3, None: 1}
+    with pytest.raises(ValueError):
+        parse_mix('NEW=0', TaskStatus)
+    with pytest.raises(ValueError):
+        parse_mix('DONE=1', TaskStatus)
+
+
+def test_parse_range():
+    assert parse_range('-7:60') == (-7, 60)
+    assert parse_range('5') == (5, 5)
+    with pytest.raises(ValueError):
+        parse_range('9:3')
+
+
+def test_parse_share():
+    assert parse_share('0.2') == 0.2
+    assert parse_share('1') == 1.0
+    with pytest.raises(ValueError):
+        parse_share('-0.1')
+    with pytest.raises(ValueError):
+        parse_share('1.5')
+
+
+def test_task_rows_follow_the_profile():
+    # Arrange
+    profile = SeedProfile(
+        tasks=5000,
+        status_mix={TaskStatus.NEW: 1, TaskStatus.COMPLETED: 3},
+        priority_mix={2: 1, None: 1},
+        due_days=(1, 10),
+        no_due_date=0.5,
+        description_words=(0, 0),
+        seed=7,
+    )
+    now = now_ist()
+
+    # Act
+    rows = [dict(zip(TASK_COLUMNS, row, strict=True)) for row in task_rows(profile, now)]
+
+    # Assert
+    assert len(rows) == profile.tasks
+    statuses = Counter(row['status'] for row in rows)
+    assert set(statuses) == {'NEW', 'COMPLETED'}
+    assert 0.7 < statuses['COMPLETED'] / len(rows) < 0.8
+    assert {row['priority'] for row in rows} == {2, None}
+    assert 0.45 < sum(row['due_date'] is None for row in rows) / len(rows) < 0.55
+    for row in rows:
+        assert row['description'] is None
+        assert (row['completed_at'] is not None) == (row['status'] == 'COMPLETED')
+        assert row['created_at'] <= now
+        if row['due_date'] is not None:
+            assert 1 <= (row['due_date'] - row['created_at']).days < 10
+    assert list(task_rows(profile, now)) == [tuple(row.values()) for row in rows]  # the seed pins the rows
+
+
+def test_note_rows_word_counts():
+    profile = SeedProfile(notes=100, title_words=(3, 3), content_words=(5, 10))
+
+    rows = list(note_rows(profile, now_ist()))
+
+    assert len(rows) == profile.notes
+    assert all(len(title.split()) == 4 for title, _, _ in rows)  # the words, then the row number
+    assert all(5 <= len(content.split()) <= 10 for _, content, _ in rows)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_copy_rows_loads_every_batch(db_engine, setup_db):
+    # Arrange
+    profile = SeedProfile(tasks=2500)
+
+    async with db_engine.connect() as conn:
+        last_id = (await conn.execute(select(func.coalesce(func.max(TaskEntity.id), 0)))).scalar_one()
+        copied = TaskEntity.id > last_id
+        await conn.rollback()  # each COPY commits on its own, outside this transaction
+        try:
+            # Act
+            raw = await conn.get_raw_connection()
+            loaded = await copy_rows(raw.driver_connection, 'tasks', TASK_COLUMNS, task_rows(profile, now_ist()), 1000)
+            count = (await conn.execute(select(func.count()).where(copied))).scalar_one()
+        finally:
+            # COPY bypasses the rollups, so the rows must not outlive the test
+            await conn.rollback()
+            await conn.execute(delete(TaskEntity).where(copied))
+            await conn.commit()
+
+    # Assert
+    assert loaded == count == profile.tasks
@@ -0,0 +1,74 @@
+# tests/tasknote/test_serve.py
+from unittest.mock import patch
+
+from src.tasknote.persistence.db import pool_limits
+from src.tasknote.serve import available_cpus, event_loop, worker_count
+from src.tasknote.settings import get_settings
+
+
+def test_worker_count_defaults_to_cpus(monkeypatch):
+    # Arrange
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'server_workers', 0)
+
+    # Act
+    with patch('src.tasknote.serve.available_cpus', return_value=6):
+        workers = worker_count(settings)
+
+    # Assert
+    assert workers == 6
+    monkeypatch.setattr(settings, 'server_workers', 3)
+    assert worker_count(settings) == 3
+
+
+def test_available_cpus_follow_cgroup_quota(tmp_path):
+    # Arrange: pinned to 8 CPUs, with a quota of 2.5 CPUs under cgroup v2 and of 3 under cgroup v1
+    v2, v1 = tmp_path / 'v2', tmp_path / 'v1'
+    v2.mkdir()
+    (v2 / 'cpu.max').write_text('250000 100000\n')
+    (v1 / 'cpu').mkdir(parents=True)
+    (v1 / 'cpu' / 'cpu.cfs_quota_us').write_text('300000\n')
+    (v1 / 'cpu' / 'cpu.cfs_period_us').write_text('100000\n')
+    unlimited = tmp_path / 'unlimited'
+    unlimited.mkdir()
+    (unlimited / 'cpu.max').write_text('max 100000\n')
+
+    # Act & Assert
+    with patch('os.sched_getaffinity', return_value=set(range(8))):
+        assert available_cpus(v2) == 3
+        assert available_cpus(v1) == 3
+        assert available_cpus(unlimited) == 8
+        assert available_cpus(tmp_path / 'missing') == 8
+
+
+def test_worker_count_stays_within_connection_budget(monkeypatch):
+    # Arrange
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'db_max_connections', 4)
+    monkeypatch.setattr(settings, 'server_workers', 16)
+
+    # Act
+    workers = worker_count(settings)
+
+    # Assert: one connection per worker keeps them all within the budget
+    assert workers == 4
+    assert pool_limits(settings, workers)[0] * workers <= settings.db_max_connections
+
+
+def test_pool_limits_share_connection_budget(monkeypatch):
+    # Arrange
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'db_pool_size', 5)
+    monkeypatch.setattr(settings, 'db_max_overflow', 10)
+    monkeypatch.setattr(settings, 'db_max_connections', 40)
+
+    # Act & Assert
+    assert pool_limits(settings, 1) == (5, 10)  # within budget, as configured
+    assert pool_limits(settings, 4) == (5, 5)  # 10 connections per worker
+    assert pool_limits(settings, 16) == (2, 0)
+    assert pool_limits(settings, 40) == (1, 0)
+
+
+def test_event_loop_falls_back_to_asyncio():
+    with patch('src.tasknote.serve.find_spec', return_value=None):
+        assert event_loop() == 'asyncio'